@@ -0,0 +1,3 @@
+from .runner import PartResult, load_day, run, solve, solve_day
+
+__all__ = ["PartResult", "load_day", "run", "solve", "solve_day"]
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+from .batch import expand_inputs, read_manifest, run_batch
+from .bench import SCALES, UNITS, format_benchmarks, run_benchmarks
+from .cache import clear_cache
+from .daemon import SOCKET_PATH, request, resolve_paths, serve
+from .days import DAYS, PARTS
+from .generators import generate
+from .history import HISTORY_FILE, compare_history, format_comparisons, save_history
+from .memory import MemoryBudgetError, parse_size
+from .runner import (
+    check_budgets,
+    format_imports,
+    format_results,
+    measure_imports,
+    run,
+    write_profile,
+)
+
+
+def _parse_days(value: str) -> list[int]:
+    """Parse a day or a range of days, e.g. '5' or '1-6'."""
+    try:
+        if "-" in value:
+            start, stop = map(int, value.split("-"))
+            return list(range(start, stop + 1))
+        return [int(value)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid day or range of days '{value}'.")
+
+
+def _parse_budget(value: str) -> tuple[int, int]:
+    """Parse the memory budget of a day, e.g. '9=512M'."""
+    try:
+        day, size = value.split("=")
+        return int(day), parse_size(size)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid memory budget '{value}'.")
+
+
+def main() -> None:
+    """Entry point of the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc", description="Advent-of-code 2024 solvers."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_run = subparsers.add_parser("run", help="Solve days and parts in parallel.")
+    parser_run.add_argument(
+        "-d",
+        "--days",
+        type=_parse_days,
+        nargs="+",
+        help="Days or ranges of days to solve, e.g. '1 5-7'. Defaults to all days.",
+    )
+    parser_run.add_argument(
+        "-p",
+        "--parts",
+        type=int,
+        nargs="+",
+        choices=PARTS,
+        default=list(PARTS),
+        help="Parts to solve.",
+    )
+    parser_run.add_argument(
+        "-i",
+        "--input",
+        default="input.txt",
+        help="Input file name within each day folder, or path to an input file.",
+    )
+    parser_run.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+    parser_run.add_argument(
+        "--cache",
+        action="store_true",
+        help="Load the parsed inputs from the cache of memory-mapped .npy files.",
+    )
+    parser_run.add_argument(
+        "--imports",
+        action="store_true",
+        help="Report the import time of each day, measured in a fresh interpreter.",
+    )
+    parser_run.add_argument(
+        "--profile",
+        metavar="FILE",
+        default=None,
+        help="Enable the solver instrumentation and write the profile to a JSON file.",
+    )
+    parser_run.add_argument(
+        "--memory",
+        action="store_true",
+        help="Measure the peak memory of each part (traced allocations and RSS).",
+    )
+    parser_run.add_argument(
+        "--budget",
+        type=_parse_budget,
+        nargs="+",
+        default=[],
+        metavar="DAY=SIZE",
+        help="Memory budgets failing the run when exceeded, e.g. '9=512M'. "
+        "Implies --memory.",
+    )
+
+    parser_batch = subparsers.add_parser(
+        "batch", help="Solve many input files in a pool of warm workers."
+    )
+    group = parser_batch.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "-m",
+        "--manifest",
+        help="Manifest with one '<day> <input file or glob pattern>' entry per line.",
+    )
+    group.add_argument(
+        "-g",
+        "--glob",
+        nargs="+",
+        help="Input files or glob patterns of the day selected with --day.",
+    )
+    parser_batch.add_argument(
+        "-d",
+        "--day",
+        type=int,
+        choices=DAYS,
+        help="Day of the inputs given with --glob.",
+    )
+    parser_batch.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="JSON Lines file on which the records are written. Defaults to stdout.",
+    )
+    parser_batch.add_argument(
+        "-p",
+        "--parts",
+        type=int,
+        nargs="+",
+        choices=PARTS,
+        default=list(PARTS),
+        help="Parts to solve.",
+    )
+    parser_batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+    parser_batch.add_argument(
+        "--cache",
+        action="store_true",
+        help="Load the parsed inputs from the cache of memory-mapped .npy files.",
+    )
+
+    parser_bench = subparsers.add_parser(
+        "bench", help="Benchmark the parsing and the parts at several input scales."
+    )
+    parser_bench.add_argument(
+        "-d",
+        "--days",
+        type=_parse_days,
+        nargs="+",
+        help="Days or ranges of days to benchmark. Defaults to all days.",
+    )
+    parser_bench.add_argument(
+        "-s",
+        "--scales",
+        nargs="+",
+        default=["example", "input"],
+        help=f"Input scales among {SCALES}, or any integer scaling factor.",
+    )
+    parser_bench.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of repetitions of each stage.",
+    )
+    parser_bench.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes.",
+    )
+    parser_bench.add_argument(
+        "--save",
+        action="store_true",
+        help="Append the results to the history, tagged with the git commit.",
+    )
+    parser_bench.add_argument(
+        "--history", default=HISTORY_FILE, help="Path to the history file."
+    )
+
+    parser_compare = subparsers.add_parser(
+        "compare", help="Compare the benchmarks of 2 commits stored in the history."
+    )
+    parser_compare.add_argument(
+        "baseline", help="Baseline git revision, e.g. HEAD or main, or hash prefix."
+    )
+    parser_compare.add_argument(
+        "candidate",
+        nargs="?",
+        default=None,
+        help="Candidate git revision, or hash prefix. Defaults to the most recent "
+        "record.",
+    )
+    parser_compare.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change of the median below which a difference is ignored.",
+    )
+    parser_compare.add_argument(
+        "-a",
+        "--alpha",
+        type=float,
+        default=0.05,
+        help="Significance level of the test against the noise of the repetitions.",
+    )
+    parser_compare.add_argument(
+        "--history", default=HISTORY_FILE, help="Path to the history file."
+    )
+
+    parser_generate = subparsers.add_parser(
+        "generate", help="Generate a random input file for a day."
+    )
+    parser_generate.add_argument(
+        "day", type=int, choices=DAYS, help="Day of the input."
+    )
+    parser_generate.add_argument("output", help="Path to the input file to write.")
+    parser_generate.add_argument(
+        "-n",
+        "--size",
+        type=int,
+        required=True,
+        help=f"Size of the input, in the unit of the day: {UNITS}.",
+    )
+    parser_generate.add_argument(
+        "--seed", type=int, default=None, help="Seed of the random number generator."
+    )
+
+    parser_daemon = subparsers.add_parser(
+        "daemon",
+        help="Run a resident solver answering requests over a Unix domain socket.",
+    )
+    parser_daemon.add_argument(
+        "--socket", default=SOCKET_PATH, help="Path to the Unix domain socket."
+    )
+    parser_daemon.add_argument(
+        "--max-inputs",
+        type=int,
+        default=32,
+        help="Maximum number of parsed inputs kept in memory.",
+    )
+    parser_daemon.add_argument(
+        "--max-results",
+        type=int,
+        default=4096,
+        help="Maximum number of answers kept in memory.",
+    )
+
+    parser_query = subparsers.add_parser(
+        "query", help="Send a request to the resident solver."
+    )
+    parser_query.add_argument(
+        "request",
+        nargs="+",
+        help="Request, e.g. 'solve day=6 part=1 input=input.txt', 'stats' or "
+        "'shutdown'.",
+    )
+    parser_query.add_argument(
+        "--socket", default=SOCKET_PATH, help="Path to the Unix domain socket."
+    )
+
+    subparsers.add_parser("clear-cache", help="Remove the cached parsed inputs.")
+    args = parser.parse_args()
+
+    if args.command == "clear-cache":
+        clear_cache()
+        return
+    elif args.command == "generate":
+        generate(args.day, args.output, args.size, args.seed)
+        return
+    elif args.command == "compare":
+        try:
+            comparisons = compare_history(
+                args.baseline, args.candidate, args.threshold, args.alpha, args.history
+            )
+        except ValueError as error:
+            parser_compare.error(str(error))
+        print(format_comparisons(comparisons))
+        slower = [comp for comp in comparisons if comp.status == "slower"]
+        if len(slower) != 0:
+            parser.exit(1, f"{len(slower)} stage(s) slowed down.\n")
+        return
+    elif args.command == "daemon":
+        serve(args.socket, args.max_inputs, args.max_results)
+        return
+    elif args.command == "query":
+        response = request(resolve_paths(" ".join(args.request)), args.socket)
+        print(json.dumps(response))
+        if "error" in response:
+            sys.exit(1)
+        return
+    elif args.command == "batch":
+        if args.glob is not None and args.day is None:
+            parser_batch.error("--day is required with --glob.")
+        try:
+            if args.manifest is not None:
+                inputs = read_manifest(args.manifest)
+            else:
+                inputs = expand_inputs(args.day, args.glob)
+        except (OSError, ValueError) as error:
+            parser_batch.error(str(error))
+        output = sys.stdout if args.output == "-" else args.output
+        n_errors = run_batch(inputs, output, args.parts, args.jobs, args.cache)
+        if n_errors != 0:
+            parser.exit(1, f"{n_errors} part(s) failed, see the 'error' records.\n")
+        return
+    days = DAYS if args.days is None else sorted({d for r in args.days for d in r})
+    if args.command == "run":
+        start = time.perf_counter()
+        results = run(
+            days,
+            args.parts,
+            args.input,
+            args.jobs,
+            args.cache,
+            profile=args.profile is not None,
+            memory=args.memory or len(args.budget) != 0,
+        )
+        print(format_results(results))
+        print(f"Total wall time: {time.perf_counter() - start:.4f} s.")
+        if args.profile is not None:
+            write_profile(results, args.profile)
+        if args.imports:
+            print(format_imports(measure_imports(days)))
+        try:
+            check_budgets(results, dict(args.budget))
+        except MemoryBudgetError as error:
+            parser.exit(1, f"{error}\n")
+    elif args.command == "bench":
+        results = run_benchmarks(days, args.scales, args.repeat, args.jobs)
+        print(format_benchmarks(results))
+        if args.save:
+            commit = save_history(results, fname=args.history)
+            print(f"Results saved to '{args.history}' for commit {commit}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import functools
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+
+def artifact(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Cache the artifact computed from a parsed input for as long as the input lives.
+
+    The decorated function is called once per parsed input object, identified by its
+    ``id``, such that part 1 and part 2 solved on the same parsed input share the
+    artifact, e.g. a graph built from a grid. The entry is evicted when the parsed input
+    is garbage collected, thus the parsed input must support weak references, e.g. a
+    :class:`~aoc.grid.Grid` or a numpy array, and the artifact must not hold a
+    reference to it.
+
+    The artifacts are shared between callers and must not be modified in place.
+
+    Parameters
+    ----------
+    func : callable
+        The function computing the artifact from the parsed input, its only argument.
+
+    Returns
+    -------
+    wrapper : callable
+        The cached function, with a ``cache_clear()`` method.
+    """
+    results: dict[int, Any] = {}
+
+    @functools.wraps(func)
+    def wrapper(data: Any) -> Any:
+        key = id(data)
+        if key not in results:
+            try:
+                weakref.finalize(data, results.pop, key, None)
+            except TypeError:
+                raise TypeError(
+                    f"The artifacts of a {type(data).__name__} can not be cached, the "
+                    "parsed input must support weak references."
+                )
+            results[key] = func(data)
+        return results[key]
+
+    wrapper.cache_clear = results.clear
+    return wrapper
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import cached_parse
+from .days import PARTS, input_file, load_day
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Any, TextIO
+
+
+def expand_inputs(day: int, patterns: Sequence[str | Path]) -> list[tuple[int, Path]]:
+    """Expand glob patterns into the input files of a day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    patterns : sequence of str | Path
+        The input files or glob patterns, e.g. ``"inputs/day6/*.txt"``. A pattern
+        matching no file raises.
+
+    Returns
+    -------
+    inputs : list of tuple
+        The pairs ``(day, fname)``, sorted by file name within each pattern.
+    """
+    load_day(day)  # validate the day
+    inputs = []
+    for pattern in patterns:
+        fnames = sorted(glob.glob(str(pattern), recursive=True))
+        if len(fnames) == 0:
+            raise FileNotFoundError(f"No input file matches '{pattern}'.")
+        inputs.extend((day, Path(fname)) for fname in fnames)
+    return inputs
+
+
+def read_manifest(fname: str | Path) -> list[tuple[int, Path]]:
+    """Read the input files listed in a manifest.
+
+    The manifest is a text file with one ``<day> <input file or glob pattern>`` entry
+    per line, e.g. ``6 inputs/day6/*.txt``. Relative paths are resolved from the folder
+    of the manifest. Empty lines and lines starting with ``#`` are ignored.
+
+    Parameters
+    ----------
+    fname : str | Path
+        The manifest.
+
+    Returns
+    -------
+    inputs : list of tuple
+        The pairs ``(day, fname)``, in the order of the manifest.
+    """
+    fname = Path(fname)
+    inputs = []
+    with open(fname) as fid:
+        for k, line in enumerate(fid, start=1):
+            line = line.strip()
+            if len(line) == 0 or line.startswith("#"):
+                continue
+            try:
+                day, pattern = line.split(maxsplit=1)
+                day = int(day)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid entry on line {k} of the manifest '{fname}': '{line}'. "
+                    "Expected '<day> <input file or glob pattern>'."
+                )
+            inputs.extend(expand_inputs(day, [fname.parent / pattern]))
+    return inputs
+
+
+def solve_input(
+    day: int, fname: Path, parts: Sequence[int] = PARTS, cache: bool = False
+) -> list[dict[str, Any]]:
+    """Parse an input file once and solve the parts of a day on it.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    fname : Path
+        The input file.
+    parts : sequence of int
+        The parts to solve.
+    cache : bool
+        If True, the parsed input is loaded from the cache, see
+        :func:`~aoc.cache.cached_parse`.
+
+    Returns
+    -------
+    records : list of dict
+        One JSON-serializable record per part with the answer and the timings. If the
+        input can not be solved, the records hold the error instead of the answer.
+    """
+    records = []
+    try:
+        module = load_day(day)
+        fname = input_file(day, fname)
+        start = time.perf_counter()
+        data = cached_parse(day, fname) if cache else module.parse(fname)
+        parse_time = time.perf_counter() - start
+    except Exception as error:
+        return [_error_record(day, part, fname, error) for part in parts]
+    for part in parts:
+        solver = getattr(module, f"part{part}", None)
+        if solver is None:
+            continue
+        try:
+            start = time.perf_counter()
+            answer = solver(data)
+            solve_time = time.perf_counter() - start
+        except Exception as error:
+            records.append(_error_record(day, part, fname, error))
+            continue
+        records.append(
+            {
+                "day": day,
+                "part": part,
+                "input": str(fname),
+                "answer": answer,
+                "parse_time": parse_time,
+                "solve_time": solve_time,
+            }
+        )
+    return records
+
+
+def _error_record(day: int, part: int, fname: Path, error: Exception) -> dict:
+    """Record of a part which failed, such that the rest of the batch goes on."""
+    return {
+        "day": day,
+        "part": part,
+        "input": str(fname),
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def _warm_up(days: Sequence[int]) -> None:
+    """Import the solver modules once per worker, before the first input."""
+    for day in days:
+        load_day(day)
+
+
+def run_batch(
+    inputs: Sequence[tuple[int, Path]],
+    output: str | Path | TextIO,
+    parts: Sequence[int] = PARTS,
+    n_jobs: int | None = None,
+    cache: bool = False,
+) -> int:
+    """Solve many input files in a pool of warm workers.
+
+    The workers import the solver modules of the batch once, when they start, and then
+    solve the inputs one after the other. Each input file is parsed once for all parts.
+
+    Parameters
+    ----------
+    inputs : sequence of tuple
+        The pairs ``(day, fname)`` to solve, see :func:`expand_inputs` and
+        :func:`read_manifest`.
+    output : str | Path | TextIO
+        The JSON Lines file, or stream, on which one record per part and input is
+        written as soon as the input is solved, see :func:`solve_input`.
+    parts : sequence of int
+        The parts to solve.
+    n_jobs : int | None
+        The number of worker processes. If None, one worker per CPU is used. If 1, the
+        inputs are solved sequentially in the current process.
+    cache : bool
+        If True, the parsed inputs are loaded from the cache, see
+        :func:`~aoc.cache.cached_parse`.
+
+    Returns
+    -------
+    n_errors : int
+        The number of records holding an error.
+    """
+    for part in parts:
+        if part not in PARTS:
+            raise ValueError(f"Part {part} is not available, choose among {PARTS}.")
+    if isinstance(output, str | Path):
+        with open(output, "w") as fid:
+            return run_batch(inputs, fid, parts, n_jobs, cache)
+    days = sorted({day for day, _ in inputs})
+    n_jobs = min(os.cpu_count() if n_jobs is None else n_jobs, len(inputs))
+    n_errors = 0
+    if n_jobs <= 1:
+        batches = (solve_input(day, fname, parts, cache) for day, fname in inputs)
+        for records in batches:
+            n_errors += _write_records(records, output)
+        return n_errors
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_warm_up, initargs=(days,)
+    ) as executor:
+        futures = [
+            executor.submit(solve_input, day, fname, parts, cache)
+            for day, fname in inputs
+        ]
+        for future in as_completed(futures):
+            n_errors += _write_records(future.result(), output)
+    return n_errors
+
+
+def _write_records(records: list[dict[str, Any]], output: TextIO) -> int:
+    """Write records as JSON Lines and return the number of errors among them."""
+    for record in records:
+        output.write(json.dumps(record) + "\n")
+    output.flush()
+    return sum("error" in record for record in records)
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import math
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .days import DAYS, input_file, load_day
+from .generators import generate
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+STAGES: tuple[str, ...] = ("parse", "part1", "part2")
+SCALES: tuple[str, ...] = ("example", "input", "10", "100")
+# unit in which the size of the input of each day is measured for the throughput
+UNITS: dict[int, str] = {
+    1: "rows",
+    2: "reports",
+    3: "bytes",
+    4: "cells",
+    5: "updates",
+    6: "cells",
+    7: "equations",
+    8: "cells",
+    9: "digits",
+    10: "cells",
+    11: "stones",
+    12: "cells",
+    13: "machines",
+    14: "robots",
+    15: "cells",
+}
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """The timings of one stage of one day at one input scale.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    stage : str
+        The stage timed, one of ``"parse"``, ``"part1"`` or ``"part2"``.
+    scale : str
+        The input scale, one of ``"example"``, ``"input"`` or a scaling factor of the
+        size of the real input, e.g. ``"10"``.
+    size : int
+        The size of the input, measured in ``unit``.
+    unit : str
+        The unit in which the size of the input is measured, e.g. ``"cells"``.
+    times : list of float
+        The wall time of each repetition, in seconds.
+    """
+
+    day: int
+    stage: str
+    scale: str
+    size: int
+    unit: str
+    times: list[float] = field(repr=False)
+
+    @property
+    def median(self) -> float:
+        """Median wall time, in seconds."""
+        return float(np.median(self.times))
+
+    @property
+    def p95(self) -> float:
+        """95th percentile of the wall time, in seconds."""
+        return float(np.percentile(self.times, 95))
+
+    @property
+    def throughput(self) -> float:
+        """Number of units processed per second, based on the median wall time."""
+        return self.size / self.median if self.median != 0 else math.inf
+
+
+def count_units(day: int, text: str) -> int:
+    """Measure the size of an input in the unit of the day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    text : str
+        The content of the input file.
+
+    Returns
+    -------
+    size : int
+        The size of the input, see :data:`UNITS`.
+    """
+    unit = UNITS[day]
+    lines = [line for line in text.splitlines() if len(line.strip()) != 0]
+    if unit == "bytes":
+        return len(text.encode())
+    elif unit == "digits":
+        return len(text.strip())
+    elif unit == "stones":
+        return len(text.split())
+    elif unit == "cells":
+        # day 15 map is followed by the instructions, which do not start with '#'
+        return sum(len(line) for line in lines if day != 15 or line[0] == "#")
+    elif unit == "updates":
+        return sum("," in line for line in lines)
+    elif unit == "machines":
+        return sum(line.startswith("Prize") for line in lines)
+    return len(lines)
+
+
+def benchmark(day: int, fname: Path, scale: str, repeat: int = 5) -> list[BenchResult]:
+    """Time the parsing and the 2 parts of a day.
+
+    Each repetition of a part is timed on a freshly parsed input, parsed outside of the
+    timed region, thus the artifacts shared between the parts, e.g. a graph, are built
+    and timed in every repetition of each part.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    fname : Path
+        The input file.
+    scale : str
+        The input scale, stored in the results.
+    repeat : int
+        The number of repetitions of each stage.
+
+    Returns
+    -------
+    results : list of BenchResult
+        The timings of each stage implemented by the day.
+    """
+    module = load_day(day)
+    size = count_units(day, fname.read_text())
+    results = []
+    for stage in STAGES:
+        func = getattr(module, stage, None)
+        if func is None:
+            continue
+        times = []
+        for _ in range(repeat):
+            if stage == "parse":
+                start = time.perf_counter()
+                func(fname)
+            else:
+                # a fresh parsed input, such that each repetition builds the artifacts
+                # cached on the parsed input, see aoc.artifacts.artifact
+                data = module.parse(fname)
+                start = time.perf_counter()
+                func(data)
+            times.append(time.perf_counter() - start)
+        results.append(BenchResult(day, stage, scale, size, UNITS[day], times))
+    return results
+
+
+def run_benchmarks(
+    days: Sequence[int] = DAYS,
+    scales: Sequence[str] = ("example", "input"),
+    repeat: int = 5,
+    n_jobs: int = 1,
+) -> list[BenchResult]:
+    """Benchmark several days at several input scales.
+
+    Parameters
+    ----------
+    days : sequence of int
+        The days to benchmark.
+    scales : sequence of str
+        The input scales, among ``"example"``, ``"input"`` or an integer scaling factor
+        of the size of the real input, e.g. ``"10"``. The scaled inputs are generated
+        with :func:`aoc.generators.generate`.
+    repeat : int
+        The number of repetitions of each stage.
+    n_jobs : int
+        The number of worker processes. Defaults to 1 to avoid contention between the
+        benchmarks.
+
+    Returns
+    -------
+    results : list of BenchResult
+        The timings, sorted by day, scale and stage.
+    """
+    for scale in scales:
+        if scale not in ("example", "input") and not scale.isdigit():
+            raise ValueError(f"Invalid scale '{scale}', choose among {SCALES}.")
+    with tempfile.TemporaryDirectory(prefix="aoc-bench-") as tmpdir:
+        tasks = []
+        for day in days:
+            for scale in scales:
+                if scale in ("example", "input"):
+                    tasks.append((day, input_file(day, f"{scale}.txt"), scale))
+                    continue
+                size = int(scale) * count_units(day, input_file(day).read_text())
+                fname = Path(tmpdir) / f"day{day}_input_x{scale}.txt"
+                generate(day, fname, size, seed=0)
+                tasks.append((day, fname, scale))
+        if n_jobs <= 1:
+            results = [benchmark(*task, repeat=repeat) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(benchmark, *task, repeat) for task in tasks]
+                results = [future.result() for future in futures]
+    return [result for elt in results for result in elt]
+
+
+def format_benchmarks(results: Sequence[BenchResult]) -> str:
+    """Format the benchmark results as a table.
+
+    Parameters
+    ----------
+    results : sequence of BenchResult
+        The results to format.
+
+    Returns
+    -------
+    table : str
+        The formatted table.
+    """
+    lines = [
+        f"{'day':>3}  {'scale':>7}  {'stage':>5}  {'size':>10}  {'median (s)':>10}  "
+        f"{'p95 (s)':>10}  {'throughput':>22}"
+    ]
+    for res in results:
+        throughput = f"{res.throughput:.3g} {res.unit}/s"
+        lines.append(
+            f"{res.day:>3}  {res.scale:>7}  {res.stage:>5}  {res.size:>10}  "
+            f"{res.median:>10.4f}  {res.p95:>10.4f}  {throughput:>22}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import grid
+from .days import ROOT, load_day
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from numpy.typing import NDArray
+
+CACHE_DIR: Path = ROOT / ".cache"
+_CHUNK_SIZE: int = 1 << 20
+
+
+def file_hash(fname: str | Path) -> str:
+    """Hash the content of a file.
+
+    Parameters
+    ----------
+    fname : str | Path
+        The file to hash.
+
+    Returns
+    -------
+    digest : str
+        The hexadecimal BLAKE2b digest of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(fname, "rb") as fid:
+        while chunk := fid.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(day: int, fname: Path) -> str:
+    """Key of a parsed input, invalidated when the input or the parser changes.
+
+    The parser covers the module of the day, the shared modules building the parsed
+    structures, e.g. :mod:`aoc.grid`, and the name of the input file, on which parsing
+    may depend, e.g. the map size of day 14.
+    """
+    digest = hashlib.blake2b(digest_size=4)
+    for module in (load_day(day), grid):
+        digest.update(file_hash(module.__file__).encode())
+    digest.update(fname.name.encode())
+    return f"{file_hash(fname)}-{digest.hexdigest()}"
+
+
+def to_arrays(day: int, data: Any) -> dict[str, NDArray]:
+    """Convert the parsed input of a day to named arrays.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    data : Any
+        The parsed input, as returned by the ``parse`` function of the day.
+
+    Returns
+    -------
+    arrays : dict of str to array
+        The named arrays. Days whose parsed input is not a single array define their
+        own conversion with a ``to_arrays`` function.
+    """
+    module = load_day(day)
+    if hasattr(module, "to_arrays"):
+        return module.to_arrays(data)
+    if not isinstance(data, np.ndarray):
+        raise TypeError(f"Day {day} must define 'to_arrays' to cache its input.")
+    return {"data": data}
+
+
+def from_arrays(day: int, arrays: dict[str, NDArray]) -> Any:
+    """Convert named arrays back to the parsed input of a day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    arrays : dict of str to array
+        The named arrays, as returned by :func:`to_arrays`.
+
+    Returns
+    -------
+    data : Any
+        The parsed input, as returned by the ``parse`` function of the day.
+    """
+    module = load_day(day)
+    if hasattr(module, "from_arrays"):
+        return module.from_arrays(arrays)
+    return arrays["data"]
+
+
+def cached_parse(
+    day: int, fname: str | Path, cache_dir: str | Path | None = None
+) -> Any:
+    """Parse an input file, or load its parsed structures from the cache.
+
+    The parsed structures are stored as one ``.npy`` file per array in a folder named
+    after the content hash of the input file and a hash of the parser: the solver
+    module, :mod:`aoc.grid` and the name of the input file. A change to either
+    invalidates the cache entry. Cached arrays are memory-mapped in read-only mode.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    fname : str | Path
+        The input file.
+    cache_dir : str | Path | None
+        The cache folder. Defaults to :data:`CACHE_DIR`.
+
+    Returns
+    -------
+    data : Any
+        The parsed input, as returned by the ``parse`` function of the day.
+    """
+    fname = Path(fname)
+    cache_dir = CACHE_DIR if cache_dir is None else Path(cache_dir)
+    entry = cache_dir / f"day{day}" / _cache_key(day, fname)
+    if entry.exists():
+        arrays = {
+            file.stem: np.load(file, mmap_mode="r") for file in entry.glob("*.npy")
+        }
+        return from_arrays(day, arrays)
+    data = load_day(day).parse(fname)
+    # write in a temporary folder first such that concurrent readers never see a
+    # partially written entry.
+    tmp = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+    tmp.mkdir(parents=True, exist_ok=True)
+    for name, array in to_arrays(day, data).items():
+        np.save(tmp / f"{name}.npy", array, allow_pickle=False)
+    try:
+        tmp.rename(entry)
+    except OSError:  # another process stored the same entry concurrently
+        shutil.rmtree(tmp, ignore_errors=True)
+    return data
+
+
+def clear_cache(cache_dir: str | Path | None = None) -> None:
+    """Remove all the cached parsed inputs.
+
+    Parameters
+    ----------
+    cache_dir : str | Path | None
+        The cache folder. Defaults to :data:`CACHE_DIR`.
+    """
+    cache_dir = CACHE_DIR if cache_dir is None else Path(cache_dir)
+    shutil.rmtree(cache_dir, ignore_errors=True)
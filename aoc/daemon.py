@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import CACHE_DIR, file_hash
+from .days import DAYS, PARTS, input_file, load_day
+
+if TYPE_CHECKING:
+    from typing import Any
+
+SOCKET_PATH: Path = CACHE_DIR / "daemon.sock"
+# dependencies imported lazily by the solvers, imported once when the daemon starts
+_WARM_MODULES: tuple[str, ...] = ("networkx", "sympy")
+
+
+class LRUCache:
+    """Mapping evicting the least recently used entry when full.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of entries.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"The size of the cache must be positive, got {maxsize}.")
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: Any) -> bool:
+        """Check if the key is cached, without marking it as used."""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get the value of a key and mark it as the most recently used."""
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self._maxsize < len(self._entries):
+            self._entries.popitem(last=False)
+
+
+class Solver:
+    """Solver keeping the parsed inputs and the answers in memory between requests.
+
+    Parameters
+    ----------
+    max_inputs : int
+        The maximum number of parsed inputs kept in memory.
+    max_results : int
+        The maximum number of answers kept in memory.
+    """
+
+    def __init__(self, max_inputs: int = 32, max_results: int = 4096) -> None:
+        self._inputs = LRUCache(max_inputs)
+        self._results = LRUCache(max_results)
+        # content hash of the input files, keyed by (path, modification time, size)
+        self._hashes: dict[tuple[str, int, int], str] = {}
+        self._paths: dict[str, Path] = {}  # input file of each known content hash
+
+    def warm_up(self) -> None:
+        """Import the solvers of all days and their lazily imported dependencies."""
+        for day in DAYS:
+            load_day(day)
+        for name in _WARM_MODULES:
+            with suppress(ImportError):
+                importlib.import_module(name)
+
+    def resolve(self, day: int, source: str) -> tuple[str, Path]:
+        """Resolve an input file, or the content hash of a known input file.
+
+        Parameters
+        ----------
+        day : int
+            The day of the puzzle.
+        source : str
+            The input file, see :func:`~aoc.days.input_file`, or the content hash of an
+            input file already solved by the daemon.
+
+        Returns
+        -------
+        digest : str
+            The content hash of the input file.
+        fname : Path
+            The input file.
+        """
+        if source in self._paths:
+            return source, self._paths[source]
+        fname = input_file(day, source)
+        digest = self._hash(fname)
+        self._paths[digest] = fname
+        return digest, fname
+
+    def _hash(self, fname: Path) -> str:
+        """Content hash of a file, hashed again only if it was modified."""
+        stat = fname.stat()
+        key = (str(fname.resolve()), stat.st_mtime_ns, stat.st_size)
+        if key not in self._hashes:
+            self._hashes[key] = file_hash(fname)
+        return self._hashes[key]
+
+    def solve(self, day: int, part: int, source: str) -> dict[str, Any]:
+        """Solve one part of one day, reusing the parsed input and answer if cached.
+
+        Parameters
+        ----------
+        day : int
+            The day of the puzzle.
+        part : int
+            The part of the puzzle, 1 or 2.
+        source : str
+            The input file or the content hash of a known input file, see
+            :meth:`resolve`.
+
+        Returns
+        -------
+        response : dict
+            The answer, the content hash of the input, whether the answer and the parsed
+            input were served from the caches, and the wall time spent, in seconds.
+        """
+        start = time.perf_counter()
+        if part not in PARTS:
+            raise ValueError(f"Part {part} is not available, choose among {PARTS}.")
+        module = load_day(day)
+        solver = getattr(module, f"part{part}", None)
+        if solver is None:
+            raise ValueError(f"Day {day} does not implement part {part}.")
+        digest, fname = self.resolve(day, source)
+        response = {"day": day, "part": part, "input": digest}
+        answer = self._results.get((day, part, digest))
+        if answer is not None:
+            return response | {
+                "answer": answer,
+                "cached_answer": True,
+                "cached_input": True,
+                "time": time.perf_counter() - start,
+            }
+        data = self._inputs.get((day, digest))
+        cached_input = data is not None
+        if not cached_input:
+            # the file of a known content hash may have changed since it was hashed
+            if self._hash(fname) != digest:
+                self._paths.pop(digest, None)
+                raise ValueError(
+                    f"The input file '{fname}' changed since it was hashed as "
+                    f"'{digest}', request it by path."
+                )
+            data = module.parse(fname)
+            self._inputs.put((day, digest), data)
+        answer = solver(data)
+        self._results.put((day, part, digest), answer)
+        return response | {
+            "answer": answer,
+            "cached_answer": False,
+            "cached_input": cached_input,
+            "time": time.perf_counter() - start,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Size and hit rate of the caches."""
+        return {
+            name: {"size": len(cache), "hits": cache.hits, "misses": cache.misses}
+            for name, cache in (("inputs", self._inputs), ("results", self._results))
+        }
+
+
+def parse_request(line: str) -> tuple[str, dict[str, str]]:
+    """Parse a request, e.g. ``solve day=6 part=1 input=input.txt``.
+
+    Parameters
+    ----------
+    line : str
+        The request, a command followed by ``key=value`` arguments.
+
+    Returns
+    -------
+    command : str
+        The command.
+    arguments : dict of str to str
+        The arguments.
+    """
+    command, *arguments = line.split()
+    try:
+        return command, dict(argument.split("=", 1) for argument in arguments)
+    except ValueError:
+        raise ValueError(f"Invalid arguments '{line}', expected 'key=value' pairs.")
+
+
+def resolve_paths(line: str) -> str:
+    """Resolve the input path of a request against the working directory of the client.
+
+    The daemon resolves the relative paths against its own working directory, thus a
+    client resolves them before sending the request. Bare file names, looked up in the
+    folder of the day, and content hashes are kept as is.
+
+    Parameters
+    ----------
+    line : str
+        The request, e.g. ``solve day=6 part=1 input=../inputs/day6.txt``.
+
+    Returns
+    -------
+    line : str
+        The request, with an absolute input path.
+    """
+    command, arguments = parse_request(line)
+    value = arguments.get("input")
+    # the raw value is tested, as Path normalizes './input.txt' into a bare name
+    if value is not None and ("/" in value or value.startswith(".")):
+        arguments["input"] = str(Path(value).resolve())
+    return " ".join([command, *(f"{key}={value}" for key, value in arguments.items())])
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handler answering one JSON line per request line."""
+
+    def handle(self) -> None:
+        """Answer the requests of a connection until the client closes it."""
+        for line in self.rfile:
+            line = line.decode().strip()
+            if len(line) == 0:
+                continue
+            try:
+                response = self.server.dispatch(line)
+            except Exception as error:
+                response = {"error": f"{type(error).__name__}: {error}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """Daemon answering the requests sent over a Unix domain socket.
+
+    The requests are text lines, answered by one JSON line each:
+
+    - ``solve day=N part=P input=<path|hash>`` solves one part, see
+      :meth:`Solver.solve`.
+    - ``stats`` returns the size and hit rate of the caches.
+    - ``ping`` returns ``{"pong": true}``.
+    - ``shutdown`` stops the daemon.
+
+    Parameters
+    ----------
+    socket_path : str | Path
+        The path to the Unix domain socket.
+    solver : Solver
+        The solver answering the ``solve`` requests.
+    """
+
+    def __init__(self, socket_path: str | Path, solver: Solver) -> None:
+        self.socket_path = Path(socket_path)
+        self.solver = solver
+        super().__init__(str(self.socket_path), _Handler)
+
+    def dispatch(self, line: str) -> dict[str, Any]:
+        """Answer one request."""
+        command, arguments = parse_request(line)
+        if command == "solve":
+            return self.solver.solve(
+                int(arguments["day"]), int(arguments["part"]), arguments["input"]
+            )
+        elif command == "stats":
+            return self.solver.stats()
+        elif command == "ping":
+            return {"pong": True}
+        elif command == "shutdown":
+            # shutdown() waits for serve_forever() to return, thus it can not be called
+            # from the thread handling the request.
+            threading.Thread(target=self.shutdown).start()
+            return {"shutdown": True}
+        raise ValueError(f"Unknown command '{command}'.")
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        with suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+
+def serve(
+    socket_path: str | Path = SOCKET_PATH,
+    max_inputs: int = 32,
+    max_results: int = 4096,
+) -> None:
+    """Run the daemon until it receives a ``shutdown`` request.
+
+    Parameters
+    ----------
+    socket_path : str | Path
+        The path to the Unix domain socket. A stale socket file left by a daemon which
+        did not exit cleanly is replaced.
+    max_inputs : int
+        The maximum number of parsed inputs kept in memory.
+    max_results : int
+        The maximum number of answers kept in memory.
+    """
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            request("ping", socket_path)
+        except OSError:
+            os.unlink(socket_path)  # stale socket
+        else:
+            raise RuntimeError(f"A daemon is already listening on '{socket_path}'.")
+    solver = Solver(max_inputs, max_results)
+    solver.warm_up()
+    with Daemon(socket_path, solver) as daemon:
+        try:
+            daemon.serve_forever()
+        finally:
+            daemon.server_close()
+
+
+def request(line: str, socket_path: str | Path = SOCKET_PATH) -> dict[str, Any]:
+    """Send one request to the daemon and return its response.
+
+    Parameters
+    ----------
+    line : str
+        The request, e.g. ``solve day=6 part=1 input=input.txt``.
+    socket_path : str | Path
+        The path to the Unix domain socket of the daemon.
+
+    Returns
+    -------
+    response : dict
+        The response of the daemon.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(line.strip().encode() + b"\n")
+        with client.makefile("rb") as fid:
+            return json.loads(fid.readline())
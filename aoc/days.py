@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+ROOT: Path = Path(__file__).parent.parent
+DAYS: tuple[int, ...] = tuple(
+    sorted(
+        int(folder.name[3:])
+        for folder in ROOT.glob("day*")
+        if (folder / "main.py").exists()
+    )
+)
+PARTS: tuple[int, ...] = (1, 2)
+
+
+def load_day(day: int) -> ModuleType:
+    """Import the solver module of a day.
+
+    Parameters
+    ----------
+    day : int
+        The day to import.
+
+    Returns
+    -------
+    module : ModuleType
+        The module exposing ``parse``, ``part1`` and ``part2``.
+    """
+    if day not in DAYS:
+        raise ValueError(f"Day {day} is not available, choose among {DAYS}.")
+    return importlib.import_module(f"day{day}.main")
+
+
+def input_file(day: int, fname: str | Path = "input.txt") -> Path:
+    """Resolve the input file of a day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    fname : str | Path
+        The input file. A bare file name, e.g. ``"example.txt"``, is looked up in the
+        folder of the day.
+
+    Returns
+    -------
+    fname : Path
+        The path to the input file.
+    """
+    fname = Path(fname)
+    if fname.parent == Path():
+        fname = ROOT / f"day{day}" / fname
+    if not fname.exists():
+        raise FileNotFoundError(f"The input file '{fname}' does not exist.")
+    return fname
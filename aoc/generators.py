@@ -0,0 +1,678 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numpy.typing import NDArray
+
+
+def _write_grid(fname: Path, grid: NDArray[np.uint8], footer: str = "") -> None:
+    """Write a grid of ASCII codes, one row per line, followed by an optional footer."""
+    newlines = np.full((grid.shape[0], 1), ord("\n"), dtype=np.uint8)
+    with open(fname, "wb") as fid:
+        fid.write(np.hstack((grid, newlines)).tobytes())
+        fid.write(footer.encode())
+
+
+def _square(size: int) -> tuple[int, int]:
+    """Shape of the square grid with at least size cells."""
+    side = max(math.ceil(math.sqrt(size)), 1)
+    return side, side
+
+
+def generate_day1(fname: Path, n_rows: int, seed: int | None = None) -> None:
+    """Generate the 2 lists of location IDs.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of location IDs in each list.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    left = rng.integers(10000, 100000, size=n_rows)
+    # draw half of the right list from the left list to get a non-zero similarity
+    right = rng.integers(10000, 100000, size=n_rows)
+    shared = rng.random(n_rows) < 0.5
+    right[shared] = rng.choice(left, size=np.count_nonzero(shared))
+    with open(fname, "w") as fid:
+        fid.writelines(f"{a}   {b}\n" for a, b in zip(left, right, strict=True))
+
+
+def generate_day2(
+    fname: Path,
+    n_reports: int,
+    min_levels: int = 5,
+    max_levels: int = 8,
+    seed: int | None = None,
+) -> None:
+    """Generate the reports of levels.
+
+    A third of the reports are safe, a third are made unsafe by changing one level and
+    the remaining reports are random.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_reports : int
+        The number of reports.
+    min_levels : int
+        The minimum number of levels in a report, at least 2.
+    max_levels : int
+        The maximum number of levels in a report.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    if min_levels < 2 or max_levels < min_levels:
+        raise ValueError("The number of levels must verify 2 <= min <= max.")
+    rng = np.random.default_rng(seed)
+    with open(fname, "w") as fid:
+        for kind in rng.integers(0, 3, size=n_reports):
+            n_levels = int(rng.integers(min_levels, max_levels + 1))
+            if kind == 2:
+                levels = rng.integers(1, 100, size=n_levels)
+            else:
+                steps = rng.integers(1, 4, size=n_levels - 1) * rng.choice((-1, 1))
+                levels = np.cumsum(np.concatenate(([0], steps)))
+                levels += int(rng.integers(1, 100)) - levels.min()
+                if kind == 1:
+                    levels[rng.integers(0, n_levels)] += int(rng.integers(-5, 6))
+                    levels = np.abs(levels)
+            fid.write(" ".join(map(str, levels)) + "\n")
+
+
+_GARBAGE: str = "#/}+%{:,$[;!?<-)^>*&@'~(] "
+_WORDS: tuple[str, ...] = (
+    "from()",
+    "when()",
+    "what()",
+    "who()",
+    "why()",
+    "how()",
+    "where()",
+    "select()",
+    "mul[",
+    "mul (",
+    "do(",
+    "don't",
+)
+
+
+def generate_day3(fname: Path, n_bytes: int, seed: int | None = None) -> None:
+    """Generate the corrupted memory.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write, of at least n_bytes bytes.
+    n_bytes : int
+        The size of the corrupted memory.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    chunks = []
+    size = 0
+    while size < n_bytes:
+        kind = rng.random()
+        if kind < 0.4:
+            a, b = rng.integers(1, 1000, size=2)
+            chunk = f"mul({a},{b})"
+        elif kind < 0.45:
+            chunk = "do()"
+        elif kind < 0.5:
+            chunk = "don't()"
+        elif kind < 0.6:
+            chunk = _WORDS[rng.integers(0, len(_WORDS))]
+        elif kind < 0.6005:
+            chunk = "\n"
+        else:
+            chunk = "".join(rng.choice(list(_GARBAGE), size=rng.integers(1, 6)))
+        chunks.append(chunk)
+        size += len(chunk)
+    with open(fname, "w") as fid:
+        fid.write("".join(chunks) + "\n")
+
+
+def generate_day4(
+    fname: Path, n_rows: int, n_cols: int, seed: int | None = None
+) -> None:
+    """Generate the word search.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of rows of the grid.
+    n_cols : int
+        The number of columns of the grid.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.frombuffer(b"XMAS", dtype=np.uint8)
+    _write_grid(fname, rng.choice(letters, size=(n_rows, n_cols)))
+
+
+def generate_day5(
+    fname: Path,
+    n_updates: int,
+    n_pages: int = 49,
+    min_length: int = 5,
+    max_length: int = 23,
+    seed: int | None = None,
+) -> None:
+    """Generate the page ordering rules and the updates.
+
+    The rules are drawn from a total order of the pages, with a rule for every pair of
+    pages, thus the correct order of every update is unique. Half of the updates are
+    correctly ordered.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_updates : int
+        The number of updates.
+    n_pages : int
+        The number of distinct pages, between 1 and 90. The pages are numbered with 2
+        digits.
+    min_length : int
+        The minimum number of pages in an update.
+    max_length : int
+        The maximum number of pages in an update, at most n_pages.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    if not 1 <= n_pages <= 90:
+        raise ValueError("The number of pages must be between 1 and 90.")
+    if not 1 <= min_length <= max_length <= n_pages:
+        raise ValueError("The number of pages in an update must be in [1, n_pages].")
+    rng = np.random.default_rng(seed)
+    order = rng.choice(np.arange(10, 100), size=n_pages, replace=False)
+    rules = [
+        (order[i], order[j]) for i in range(n_pages) for j in range(i + 1, n_pages)
+    ]
+    rng.shuffle(rules)
+    rank = {page: k for k, page in enumerate(order)}
+    with open(fname, "w") as fid:
+        fid.writelines(f"{X}|{Y}\n" for X, Y in rules)
+        fid.write("\n")
+        for _ in range(n_updates):
+            length = int(rng.integers(min_length // 2, max_length // 2 + 1)) * 2 + 1
+            length = min(max(length, min_length), max_length)
+            update = rng.choice(order, size=length, replace=False)
+            if rng.random() < 0.5:
+                update = sorted(update, key=rank.get)
+            fid.write(",".join(map(str, update)) + "\n")
+
+
+def generate_day6(
+    fname: Path,
+    n_rows: int,
+    n_cols: int,
+    density: float = 0.05,
+    seed: int | None = None,
+) -> None:
+    """Generate the map of the guard patrol.
+
+    The map contains a single guard, facing up, on a free position from which the
+    guard patrol leaves the map.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of rows of the map.
+    n_cols : int
+        The number of columns of the map.
+    density : float
+        The probability of each position to be an obstacle, in [0, 1).
+    seed : int | None
+        The seed of the random number generator.
+    """
+    if not 0 <= density < 1:
+        raise ValueError("The obstacle density must be in [0, 1).")
+    rng = np.random.default_rng(seed)
+    obstacles = rng.random((n_rows, n_cols)) < density
+    free = np.flatnonzero(~obstacles)
+    for start in rng.choice(free, size=min(free.size, 100), replace=False):
+        if _guard_leaves(obstacles, *np.unravel_index(start, obstacles.shape)):
+            break
+    else:
+        raise RuntimeError(
+            "Could not find a guard position from which the guard leaves the map, "
+            "reduce the obstacle density."
+        )
+    grid = np.where(obstacles, ord("#"), ord(".")).astype(np.uint8)
+    grid.flat[start] = ord("^")
+    _write_grid(fname, grid)
+
+
+def _guard_leaves(obstacles: NDArray[np.bool], x: int, y: int) -> bool:
+    """Check if the guard starting at (x, y) and facing up leaves the map."""
+    n_rows, n_cols = obstacles.shape
+    dx, dy = -1, 0
+    turns = set()
+    while True:
+        next_x, next_y = x + dx, y + dy
+        if not (0 <= next_x < n_rows and 0 <= next_y < n_cols):
+            return True
+        if obstacles[next_x, next_y]:
+            if (x, y, dx, dy) in turns:
+                return False  # the guard is stuck in a loop
+            turns.add((x, y, dx, dy))
+            dx, dy = dy, -dx  # turn right
+            continue
+        x, y = next_x, next_y
+
+
+def generate_day7(
+    fname: Path,
+    n_equations: int,
+    min_numbers: int = 2,
+    max_numbers: int = 12,
+    seed: int | None = None,
+) -> None:
+    """Generate the calibration equations.
+
+    A third of the equations are solvable with '+' and '*', a third require '||' and
+    the remaining equations are random.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_equations : int
+        The number of equations.
+    min_numbers : int
+        The minimum number of operands of an equation.
+    max_numbers : int
+        The maximum number of operands of an equation. The solvers try up to
+        3**(max_numbers - 1) combinations of operators.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    with open(fname, "w") as fid:
+        for kind in rng.integers(0, 3, size=n_equations):
+            n_numbers = int(rng.integers(min_numbers, max_numbers + 1))
+            # small operands keep the results in the range of the real input
+            numbers = [int(elt) for elt in rng.integers(1, 10, size=n_numbers)]
+            numbers[0] = int(rng.integers(1, 1000))
+            result = numbers[0]
+            for num in numbers[1:]:
+                op = rng.integers(0, 2 + (kind == 1))
+                if op == 0:
+                    result += num
+                elif op == 1:
+                    result *= num
+                else:
+                    result = int(f"{result}{num}")
+            if kind == 2:
+                result += int(rng.integers(1, 1000))
+            fid.write(f"{result}: {' '.join(map(str, numbers))}\n")
+
+
+_FREQUENCIES: bytes = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def generate_day8(
+    fname: Path,
+    n_rows: int,
+    n_cols: int,
+    n_frequencies: int = 40,
+    density: float = 0.08,
+    seed: int | None = None,
+) -> None:
+    """Generate the map of the antennas.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of rows of the map.
+    n_cols : int
+        The number of columns of the map.
+    n_frequencies : int
+        The number of distinct frequencies, between 1 and 62.
+    density : float
+        The probability of each position to hold an antenna, in [0, 1].
+    seed : int | None
+        The seed of the random number generator.
+    """
+    if not 1 <= n_frequencies <= len(_FREQUENCIES):
+        raise ValueError(
+            f"The number of frequencies must be in [1, {len(_FREQUENCIES)}]."
+        )
+    rng = np.random.default_rng(seed)
+    grid = np.full((n_rows, n_cols), ord("."), dtype=np.uint8)
+    antennas = rng.random((n_rows, n_cols)) < density
+    frequencies = np.frombuffer(_FREQUENCIES[:n_frequencies], dtype=np.uint8)
+    grid[antennas] = rng.choice(frequencies, size=np.count_nonzero(antennas))
+    _write_grid(fname, grid)
+
+
+def generate_day9(fname: Path, n_digits: int, seed: int | None = None) -> None:
+    """Generate the disk map.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_digits : int
+        The number of digits of the disk map, rounded up to an odd number such that the
+        disk map ends with a file.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    n_digits += 1 - n_digits % 2
+    digits = rng.integers(0, 10, size=n_digits, dtype=np.uint8)
+    digits[::2] = rng.integers(1, 10, size=digits[::2].size)  # files are not empty
+    with open(fname, "wb") as fid:
+        fid.write((digits + ord("0")).tobytes() + b"\n")
+
+
+def generate_day10(
+    fname: Path,
+    n_rows: int,
+    n_cols: int,
+    n_trails: int | None = None,
+    seed: int | None = None,
+) -> None:
+    """Generate the topographic map.
+
+    Hiking trails, i.e. paths of heights 0 to 9, are carved into a random map of heights
+    1 to 8 without crossing each other. Thus, every position of height 0 or 9 belongs to
+    a complete trail.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of rows of the map.
+    n_cols : int
+        The number of columns of the map.
+    n_trails : int | None
+        The number of trails to attempt to carve, the attempts which get stuck between
+        other trails and the edges of the map are abandoned. Defaults to one per 20
+        positions.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    grid = rng.integers(1, 9, size=(n_rows, n_cols), dtype=np.uint8)
+    carved = np.zeros((n_rows, n_cols), dtype=bool)
+    n_trails = grid.size // 20 if n_trails is None else n_trails
+    steps = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+    for _ in range(n_trails):
+        x, y = int(rng.integers(0, n_rows)), int(rng.integers(0, n_cols))
+        if carved[x, y]:
+            continue
+        trail = [(x, y)]
+        while len(trail) < 10:
+            candidates = [
+                (x + dx, y + dy)
+                for dx, dy in steps
+                if 0 <= x + dx < n_rows
+                and 0 <= y + dy < n_cols
+                and not carved[x + dx, y + dy]
+                and (x + dx, y + dy) not in trail
+            ]
+            if len(candidates) == 0:
+                break
+            x, y = candidates[rng.integers(0, len(candidates))]
+            trail.append((x, y))
+        if len(trail) != 10:
+            continue
+        for height, pos in enumerate(trail):
+            grid[pos] = height
+            carved[pos] = True
+    _write_grid(fname, grid + ord("0"))
+
+
+def generate_day11(fname: Path, n_stones: int, seed: int | None = None) -> None:
+    """Generate the engraved numbers of the stones.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_stones : int
+        The number of stones.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    stones = rng.integers(0, 10 ** rng.integers(1, 8, size=n_stones))
+    with open(fname, "w") as fid:
+        fid.write(" ".join(map(str, stones)) + "\n")
+
+
+def generate_day12(
+    fname: Path,
+    n_rows: int,
+    n_cols: int,
+    region_size: int = 10,
+    seed: int | None = None,
+) -> None:
+    """Generate the map of the garden plots.
+
+    The garden is split in rectangular regions. Neighboring regions, including
+    diagonally, are planted with different plants.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of rows of the map.
+    n_cols : int
+        The number of columns of the map.
+    region_size : int
+        The maximum size of a region along each dimension.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    row_cuts = np.cumsum(rng.integers(1, region_size + 1, size=n_rows))
+    col_cuts = np.cumsum(rng.integers(1, region_size + 1, size=n_cols))
+    row_cuts = np.concatenate(([0], row_cuts[row_cuts < n_rows], [n_rows]))
+    col_cuts = np.concatenate(([0], col_cuts[col_cuts < n_cols], [n_cols]))
+    plants = np.zeros((row_cuts.size - 1, col_cuts.size - 1), dtype=np.uint8)
+    for i in range(plants.shape[0]):
+        for j in range(plants.shape[1]):
+            # exclude the plants of the regions already planted around (i, j)
+            excluded = set(plants[max(i - 1, 0) : i, max(j - 1, 0) : j + 2].flat)
+            if 0 < j:
+                excluded.add(plants[i, j - 1])
+            choices = [
+                ord(c) for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ" if ord(c) not in excluded
+            ]
+            plants[i, j] = choices[rng.integers(0, len(choices))]
+    grid = np.repeat(
+        np.repeat(plants, np.diff(row_cuts), axis=0), np.diff(col_cuts), axis=1
+    )
+    _write_grid(fname, grid)
+
+
+def generate_day13(fname: Path, n_machines: int, seed: int | None = None) -> None:
+    """Generate the claw machines.
+
+    The buttons of each machine move the claw along linearly independent directions,
+    thus each machine has at most one solution. Half of the prizes are reachable in at
+    most 100 presses of each button.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_machines : int
+        The number of machines.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    machines = []
+    for _ in range(n_machines):
+        while True:
+            A = rng.integers(10, 100, size=2)
+            B = rng.integers(10, 100, size=2)
+            if A[0] * B[1] != A[1] * B[0]:
+                break
+        if rng.random() < 0.5:
+            prize = rng.integers(0, 101) * A + rng.integers(0, 101) * B
+        else:
+            prize = rng.integers(1000, 20000, size=2)
+        machines.append(
+            f"Button A: X+{A[0]}, Y+{A[1]}\n"
+            f"Button B: X+{B[0]}, Y+{B[1]}\n"
+            f"Prize: X={prize[0]}, Y={prize[1]}\n"
+        )
+    with open(fname, "w") as fid:
+        fid.write("\n".join(machines))
+
+
+def generate_day14(fname: Path, n_robots: int, seed: int | None = None) -> None:
+    """Generate the robots.
+
+    The robots are positioned on the map of the real input, of size (101, 103).
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write. It must not be named 'example.txt', which is parsed as a map
+        of size (11, 7).
+    n_robots : int
+        The number of robots.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    if Path(fname).name == "example.txt":
+        raise ValueError("The file name 'example.txt' is reserved for the example.")
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 101, size=n_robots)
+    y = rng.integers(0, 103, size=n_robots)
+    vx, vy = rng.integers(-100, 101, size=(2, n_robots))
+    with open(fname, "w") as fid:
+        fid.writelines(
+            f"p={a},{b} v={c},{d}\n" for a, b, c, d in zip(x, y, vx, vy, strict=True)
+        )
+
+
+def generate_day15(
+    fname: Path,
+    n_rows: int,
+    n_cols: int,
+    n_instructions: int | None = None,
+    wall_density: float = 0.08,
+    box_density: float = 0.25,
+    seed: int | None = None,
+) -> None:
+    """Generate the warehouse and the robot instructions.
+
+    The warehouse is enclosed by walls and contains a single robot, on a free position.
+
+    Parameters
+    ----------
+    fname : Path
+        The file to write.
+    n_rows : int
+        The number of rows of the warehouse, including the walls, at least 3.
+    n_cols : int
+        The number of columns of the warehouse, including the walls, at least 3.
+    n_instructions : int | None
+        The number of instructions. Defaults to 8 per position.
+    wall_density : float
+        The probability of each inner position to be a wall.
+    box_density : float
+        The probability of each inner position to be a box.
+    seed : int | None
+        The seed of the random number generator.
+    """
+    if n_rows < 3 or n_cols < 3:
+        raise ValueError("The warehouse must be at least of shape (3, 3).")
+    rng = np.random.default_rng(seed)
+    grid = np.full((n_rows, n_cols), ord("#"), dtype=np.uint8)
+    inner = rng.random((n_rows - 2, n_cols - 2))
+    grid[1:-1, 1:-1] = np.where(
+        inner < wall_density,
+        ord("#"),
+        np.where(inner < wall_density + box_density, ord("O"), ord(".")),
+    )
+    x, y = rng.integers(1, n_rows - 1), rng.integers(1, n_cols - 1)
+    grid[x, y] = ord("@")
+    n_instructions = 8 * grid.size if n_instructions is None else n_instructions
+    instructions = rng.choice(np.frombuffer(b"<>^v", dtype=np.uint8), n_instructions)
+    lines = [
+        instructions[k : k + 1000].tobytes().decode()
+        for k in range(0, n_instructions, 1000)
+    ]
+    _write_grid(fname, grid, footer="\n" + "\n".join(lines) + "\n")
+
+
+# generator of each day, taking the file name, the size of the input in the unit of the
+# day (see aoc.bench.UNITS) and the seed.
+GENERATORS: dict[int, Callable[[Path, int, int | None], None]] = {
+    1: lambda fname, size, seed: generate_day1(fname, size, seed=seed),
+    2: lambda fname, size, seed: generate_day2(fname, size, seed=seed),
+    3: lambda fname, size, seed: generate_day3(fname, size, seed=seed),
+    4: lambda fname, size, seed: generate_day4(fname, *_square(size), seed=seed),
+    5: lambda fname, size, seed: generate_day5(fname, size, seed=seed),
+    6: lambda fname, size, seed: generate_day6(fname, *_square(size), seed=seed),
+    7: lambda fname, size, seed: generate_day7(fname, size, seed=seed),
+    8: lambda fname, size, seed: generate_day8(fname, *_square(size), seed=seed),
+    9: lambda fname, size, seed: generate_day9(fname, size, seed=seed),
+    10: lambda fname, size, seed: generate_day10(fname, *_square(size), seed=seed),
+    11: lambda fname, size, seed: generate_day11(fname, size, seed=seed),
+    12: lambda fname, size, seed: generate_day12(fname, *_square(size), seed=seed),
+    13: lambda fname, size, seed: generate_day13(fname, size, seed=seed),
+    14: lambda fname, size, seed: generate_day14(fname, size, seed=seed),
+    15: lambda fname, size, seed: generate_day15(fname, *_square(size), seed=seed),
+}
+
+
+def generate(day: int, fname: str | Path, size: int, seed: int | None = None) -> Path:
+    """Generate a valid input file for a day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    fname : str | Path
+        The file to write.
+    size : int
+        The size of the input, in the unit of the day, e.g. the number of rows for day 1
+        or the number of cells for the grids.
+    seed : int | None
+        The seed of the random number generator.
+
+    Returns
+    -------
+    fname : Path
+        The file written.
+    """
+    if day not in GENERATORS:
+        raise ValueError(
+            f"Day {day} has no generator, choose among {tuple(GENERATORS)}."
+        )
+    if size <= 0:
+        raise ValueError(f"The size must be strictly positive, got {size}.")
+    fname = Path(fname)
+    GENERATORS[day](fname, size, seed)
+    return fname
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+class Grid:
+    """A 2D character grid stored with one byte per cell and padded borders.
+
+    The grid is surrounded by ``pad`` rows and columns filled with a sentinel value,
+    such that moving up to ``pad`` cells away from any cell of the grid stays within
+    the array. The cells are addressed by their flat index in the padded array, and the
+    neighbors of a cell are reached by adding the offsets of :attr:`offsets4` or
+    :attr:`offsets8` to its index.
+
+    Parameters
+    ----------
+    padded : array of shape (n_rows + 2 * pad, n_cols + 2 * pad)
+        The padded grid, with the ASCII code of each cell.
+    pad : int
+        The width of the padding around the grid.
+    """
+
+    def __init__(self, padded: NDArray[np.uint8], pad: int = 1) -> None:
+        if padded.ndim != 2 or padded.dtype != np.uint8:
+            raise ValueError("The padded grid must be a 2D array of uint8.")
+        if pad < 0 or any(size < 2 * pad for size in padded.shape):
+            raise ValueError(
+                f"Invalid padding {pad} for a grid of shape {padded.shape}."
+            )
+        self._padded = padded
+        self._pad = pad
+        width = padded.shape[1]
+        # offsets in clockwise order, starting from up
+        self._offsets4 = np.array([-width, 1, width, -1], dtype=np.intp)
+        self._offsets8 = np.array(
+            [-width, -width + 1, 1, width + 1, width, width - 1, -1, -width - 1],
+            dtype=np.intp,
+        )
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes, pad: int = 1, fill: int = 0) -> Grid:
+        """Create a grid from the raw bytes of a text grid, one row per line.
+
+        Parameters
+        ----------
+        buffer : bytes
+            The text grid, with one row per line. The rows must have the same length.
+        pad : int
+            The width of the padding around the grid.
+        fill : int
+            The value of the padding cells.
+
+        Returns
+        -------
+        grid : Grid
+            The grid.
+        """
+        raw = np.frombuffer(buffer, dtype=np.uint8)
+        newlines = np.flatnonzero(raw == ord("\n"))
+        n_cols = int(newlines[0]) if newlines.size != 0 else raw.size
+        terminator = 2 if 0 < n_cols and raw[n_cols - 1] == ord("\r") else 1
+        n_cols -= terminator - 1
+        stride = n_cols + terminator
+        n_rows = -(-raw.size // stride)  # the last line terminator is optional
+        if raw.size not in (n_rows * stride, n_rows * stride - terminator) or not (
+            np.array_equal(newlines, np.arange(stride - 1, raw.size, stride))
+        ):
+            raise ValueError("The rows of the grid must have the same length.")
+        # view of shape (n_rows, n_cols) skipping the line terminators, without copy
+        values = np.lib.stride_tricks.as_strided(
+            raw, shape=(n_rows, n_cols), strides=(stride, 1), writeable=False
+        )
+        padded = np.full((n_rows + 2 * pad, n_cols + 2 * pad), fill, dtype=np.uint8)
+        padded[pad : pad + n_rows, pad : pad + n_cols] = values
+        return cls(padded, pad)
+
+    @classmethod
+    def from_file(cls, fname: str | Path, pad: int = 1, fill: int = 0) -> Grid:
+        """Create a grid from a text file, one row per line.
+
+        Parameters
+        ----------
+        fname : str | Path
+            The text file.
+        pad : int
+            The width of the padding around the grid.
+        fill : int
+            The value of the padding cells.
+
+        Returns
+        -------
+        grid : Grid
+            The grid.
+        """
+        return cls.from_bytes(Path(fname).read_bytes(), pad, fill)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, NDArray]) -> Grid:
+        """Create a grid from the named arrays returned by :meth:`to_arrays`."""
+        return cls(arrays["grid"], int(arrays["pad"][0]))
+
+    def to_arrays(self) -> dict[str, NDArray]:
+        """Convert the grid to named arrays, e.g. to cache it."""
+        return {"grid": self._padded, "pad": np.array([self._pad], dtype=np.int64)}
+
+    def copy(self) -> Grid:
+        """Copy the grid, e.g. to edit a read-only grid."""
+        return Grid(self._padded.copy(), self._pad)
+
+    def index(self, x: int | NDArray, y: int | NDArray) -> int | NDArray:
+        """Flat index of the cell(s) at row x and column y of the grid."""
+        return (x + self._pad) * self._padded.shape[1] + y + self._pad
+
+    def coords(self, index: int | NDArray) -> tuple[int | NDArray, int | NDArray]:
+        """Row and column of the cell(s) at the flat index in the grid."""
+        if isinstance(index, int | np.integer):
+            x, y = divmod(int(index), self._padded.shape[1])
+        else:
+            x, y = np.divmod(index, self._padded.shape[1])
+        return x - self._pad, y - self._pad
+
+    def find(self, char: str) -> NDArray[np.intp]:
+        """Flat indices of the cells of the grid holding the character, sorted."""
+        return np.flatnonzero(self.flat == ord(char))
+
+    @property
+    def flat(self) -> NDArray[np.uint8]:
+        """Flattened view of the padded grid, indexed by the flat index of the cells."""
+        return self._padded.reshape(-1)
+
+    @property
+    def offsets4(self) -> NDArray[np.intp]:
+        """Flat offsets to the 4 neighbors, clockwise from up."""
+        return self._offsets4
+
+    @property
+    def offsets8(self) -> NDArray[np.intp]:
+        """Flat offsets to the 8 neighbors, clockwise from up."""
+        return self._offsets8
+
+    @property
+    def pad(self) -> int:
+        """Width of the padding around the grid."""
+        return self._pad
+
+    @property
+    def padded(self) -> NDArray[np.uint8]:
+        """Padded grid, of shape (n_rows + 2 * pad, n_cols + 2 * pad)."""
+        return self._padded
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape of the grid, without the padding."""
+        rows, cols = self._padded.shape
+        return rows - 2 * self._pad, cols - 2 * self._pad
+
+    @property
+    def values(self) -> NDArray[np.uint8]:
+        """View on the grid, without the padding."""
+        rows, cols = self.shape
+        return self._padded[self._pad : self._pad + rows, self._pad : self._pad + cols]
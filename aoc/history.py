@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import json
+import math
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .bench import BenchResult
+from .days import ROOT
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+HISTORY_FILE: Path = ROOT / ".bench-history.jsonl"
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    """A benchmark result stored in the history.
+
+    Parameters
+    ----------
+    commit : str
+        The git commit benchmarked, suffixed with ``+dirty`` if the working tree had
+        uncommitted changes, or ``"unknown"`` outside of a git repository.
+    timestamp : float
+        The time at which the benchmark was stored, in seconds since the epoch.
+    result : BenchResult
+        The timings.
+    """
+
+    commit: str
+    timestamp: float
+    result: BenchResult
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """The comparison of the timings of one stage of one day between 2 commits.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    stage : str
+        The stage timed, one of ``"parse"``, ``"part1"`` or ``"part2"``.
+    scale : str
+        The input scale.
+    baseline : float
+        The median wall time of the baseline, in seconds.
+    candidate : float
+        The median wall time of the candidate, in seconds.
+    pvalue : float
+        The one-sided p-value of the Mann-Whitney U test for the candidate being
+        slower, if ``change`` is positive, or faster, if ``change`` is negative.
+    threshold : float
+        The relative change below which a difference is not reported.
+    alpha : float
+        The significance level of the test.
+    """
+
+    day: int
+    stage: str
+    scale: str
+    baseline: float
+    candidate: float
+    pvalue: float
+    threshold: float
+    alpha: float
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median wall time, positive for a slowdown."""
+        return self.candidate / self.baseline - 1 if self.baseline != 0 else 0.0
+
+    @property
+    def status(self) -> str:
+        """``"slower"``, ``"faster"`` or ``"same"`` given the threshold and noise."""
+        if self.alpha <= self.pvalue or abs(self.change) <= self.threshold:
+            return "same"
+        return "slower" if 0 < self.change else "faster"
+
+
+def git_commit(root: str | Path = ROOT) -> str:
+    """Get the commit checked out in a git repository.
+
+    Parameters
+    ----------
+    root : str | Path
+        A folder of the repository.
+
+    Returns
+    -------
+    commit : str
+        The abbreviated hash of the commit, suffixed with ``+dirty`` if tracked files
+        have uncommitted changes, or ``"unknown"`` if it can not be determined.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit if len(status) == 0 else f"{commit}+dirty"
+
+
+def rev_parse(revision: str, root: str | Path = ROOT) -> str | None:
+    """Resolve a git revision, e.g. ``HEAD`` or a branch, to the hash of its commit.
+
+    Parameters
+    ----------
+    revision : str
+        The revision.
+    root : str | Path
+        A folder of the repository.
+
+    Returns
+    -------
+    commit : str | None
+        The full hash of the commit, or None if it can not be resolved.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_history(
+    results: Sequence[BenchResult],
+    commit: str | None = None,
+    fname: str | Path = HISTORY_FILE,
+) -> str:
+    """Append benchmark results to the history.
+
+    Parameters
+    ----------
+    results : sequence of BenchResult
+        The results to store.
+    commit : str | None
+        The commit benchmarked. If None, the commit checked out, see
+        :func:`git_commit`.
+    fname : str | Path
+        The history file, in JSON Lines with one record per result.
+
+    Returns
+    -------
+    commit : str
+        The commit with which the results are tagged.
+    """
+    commit = git_commit() if commit is None else commit
+    timestamp = time.time()
+    with open(fname, "a") as fid:
+        for res in results:
+            record = {
+                "commit": commit,
+                "timestamp": timestamp,
+                "day": res.day,
+                "stage": res.stage,
+                "scale": res.scale,
+                "size": res.size,
+                "unit": res.unit,
+                "times": res.times,
+            }
+            fid.write(json.dumps(record) + "\n")
+    return commit
+
+
+def load_history(fname: str | Path = HISTORY_FILE) -> list[HistoryRecord]:
+    """Load the benchmark results stored in the history.
+
+    Parameters
+    ----------
+    fname : str | Path
+        The history file.
+
+    Returns
+    -------
+    records : list of HistoryRecord
+        The records, in the order in which they were stored.
+    """
+    records = []
+    with open(fname) as fid:
+        for line in fid:
+            if len(line.strip()) == 0:
+                continue
+            elt = json.loads(line)
+            result = BenchResult(
+                elt["day"],
+                elt["stage"],
+                elt["scale"],
+                elt["size"],
+                elt["unit"],
+                elt["times"],
+            )
+            records.append(HistoryRecord(elt["commit"], elt["timestamp"], result))
+    return records
+
+
+def _resolve_commit(records: Sequence[HistoryRecord], commit: str | None) -> str:
+    """Find the commit of the history matching a prefix or a revision, or the last."""
+    if len(records) == 0:
+        raise ValueError("The benchmark history is empty.")
+    if commit is None:
+        return records[-1].commit
+    matches = sorted({rec.commit for rec in records if rec.commit.startswith(commit)})
+    if len(matches) == 0:
+        # a git revision, e.g. HEAD or main, matching the records of its clean tree
+        full = rev_parse(commit)
+        if full is not None:
+            matches = sorted(
+                {rec.commit for rec in records if full.startswith(rec.commit)}
+            )
+    if len(matches) == 0:
+        raise ValueError(f"The commit '{commit}' is not in the benchmark history.")
+    if 1 < len(matches):
+        raise ValueError(f"The commit '{commit}' is ambiguous, matching {matches}.")
+    return matches[0]
+
+
+def _mann_whitney(x: Sequence[float], y: Sequence[float]) -> float:
+    """One-sided p-value of the Mann-Whitney U test for y being larger than x.
+
+    The p-value is computed with the normal approximation, with correction for ties and
+    for continuity, which holds as from ~5 repetitions per sample.
+    """
+    n_x, n_y = len(x), len(y)
+    values = np.concatenate([x, y])
+    # mid-ranks, averaging the ranks of tied values
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(values.size)
+    ranks[order] = np.arange(1, values.size + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    ranks = (sums / counts)[inverse]
+    u = ranks[n_x:].sum() - n_y * (n_y + 1) / 2
+    n = n_x + n_y
+    ties = np.sum(counts**3 - counts)
+    sigma = math.sqrt(n_x * n_y / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n_x * n_y / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_history(
+    baseline: str,
+    candidate: str | None = None,
+    threshold: float = 0.1,
+    alpha: float = 0.05,
+    fname: str | Path = HISTORY_FILE,
+) -> list[Comparison]:
+    """Compare the timings stored in the history for 2 commits.
+
+    The timings of all the runs stored for a commit are pooled. A stage is reported
+    slower, or faster, if its median wall time changed by more than the threshold and
+    if the change is significant given the spread of the repetitions, according to a
+    one-sided Mann-Whitney U test.
+
+    Parameters
+    ----------
+    baseline : str
+        The baseline commit, as a prefix of its hash or a git revision, e.g. ``HEAD``.
+    candidate : str | None
+        The candidate commit, as a prefix of its hash or a git revision. If None, the
+        commit of the most recent record of the history.
+    threshold : float
+        The relative change of the median wall time below which a difference is not
+        reported, e.g. ``0.1`` for 10%.
+    alpha : float
+        The significance level of the test.
+    fname : str | Path
+        The history file.
+
+    Returns
+    -------
+    comparisons : list of Comparison
+        The comparisons of the stages benchmarked for both commits, at the same scale
+        and input size, sorted by day, scale and stage.
+    """
+    records = load_history(fname)
+    baseline = _resolve_commit(records, baseline)
+    candidate = _resolve_commit(records, candidate)
+    times: dict[tuple[str, int, str, str, int], list[float]] = {}
+    for rec in records:
+        if rec.commit not in (baseline, candidate):
+            continue
+        res = rec.result
+        key = (rec.commit, res.day, res.scale, res.stage, res.size)
+        times.setdefault(key, []).extend(res.times)
+    comparisons = []
+    for key in sorted(times):
+        commit, day, scale, stage, size = key
+        if commit != baseline or (candidate, *key[1:]) not in times:
+            continue
+        x, y = times[key], times[(candidate, *key[1:])]
+        base, cand = float(np.median(x)), float(np.median(y))
+        pvalue = _mann_whitney(x, y) if base <= cand else _mann_whitney(y, x)
+        comparisons.append(
+            Comparison(day, stage, scale, base, cand, pvalue, threshold, alpha)
+        )
+    return comparisons
+
+
+def format_comparisons(comparisons: Sequence[Comparison]) -> str:
+    """Format the comparisons as a table.
+
+    Parameters
+    ----------
+    comparisons : sequence of Comparison
+        The comparisons to format.
+
+    Returns
+    -------
+    table : str
+        The formatted table.
+    """
+    lines = [
+        f"{'day':>3}  {'scale':>7}  {'stage':>5}  {'baseline (s)':>12}  "
+        f"{'candidate (s)':>13}  {'change':>8}  {'p-value':>7}  status"
+    ]
+    for comp in comparisons:
+        lines.append(
+            f"{comp.day:>3}  {comp.scale:>7}  {comp.stage:>5}  {comp.baseline:>12.4f}  "
+            f"{comp.candidate:>13.4f}  {comp.change:>+8.1%}  {comp.pvalue:>7.3f}  "
+            f"{comp.status}"
+        )
+    return "\n".join(lines)
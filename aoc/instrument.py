@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from typing import Any
+
+# profile collecting the measurements, None while the instrumentation is disabled
+_profile: Profile | None = None
+_NULL_TIMER: nullcontext = nullcontext()
+
+
+@dataclass
+class Histogram:
+    """Summary of the distribution of the values observed under one name.
+
+    The values are counted in power-of-two buckets, labelled by their upper bound, such
+    that the memory used does not grow with the number of observations.
+
+    Parameters
+    ----------
+    count : int
+        The number of observations.
+    total : float
+        The sum of the observed values.
+    min : float
+        The smallest observed value.
+    max : float
+        The largest observed value.
+    buckets : dict of int to int
+        The number of observations per bucket, keyed by the exponent ``e`` of the upper
+        bound of the bucket, i.e. the values in ``[2 ** (e - 1), 2 ** e)``.
+    """
+
+    count: int = 0
+    total: float = 0
+    min: float = math.inf
+    max: float = -math.inf
+    buckets: dict[int, int] = field(default_factory=dict)
+
+    def add(self, value: float) -> None:
+        """Add an observation to the histogram."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        exponent = math.frexp(value)[1]
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the histogram to a JSON-serializable dictionary."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count != 0 else None,
+            "min": self.min if self.count != 0 else None,
+            "max": self.max if self.count != 0 else None,
+            "buckets": {
+                f"<{2.0**exponent:g}": n for exponent, n in sorted(self.buckets.items())
+            },
+        }
+
+
+@dataclass
+class Profile:
+    """The measurements collected while the instrumentation is enabled.
+
+    Parameters
+    ----------
+    counters : dict of str to int
+        The counters, by name.
+    timers : dict of str to Histogram
+        The distribution of the durations measured by each timer, in seconds.
+    histograms : dict of str to Histogram
+        The distribution of the values observed under each name.
+    """
+
+    counters: dict[str, int] = field(default_factory=dict)
+    timers: dict[str, Histogram] = field(default_factory=dict)
+    histograms: dict[str, Histogram] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the profile to a JSON-serializable dictionary."""
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "timers": {
+                name: hist.to_dict() for name, hist in sorted(self.timers.items())
+            },
+            "histograms": {
+                name: hist.to_dict() for name, hist in sorted(self.histograms.items())
+            },
+        }
+
+
+@contextmanager
+def profile() -> Generator[Profile, None, None]:
+    """Enable the instrumentation within the context.
+
+    Returns
+    -------
+    profile : Profile
+        The profile collecting the measurements made within the context. The previous
+        profile, if any, is restored when leaving the context.
+    """
+    global _profile
+
+    previous, _profile = _profile, Profile()
+    try:
+        yield _profile
+    finally:
+        _profile = previous
+
+
+def enabled() -> bool:
+    """Check if the instrumentation is enabled."""
+    return _profile is not None
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a counter, if the instrumentation is enabled.
+
+    Parameters
+    ----------
+    name : str
+        The name of the counter.
+    n : int
+        The increment.
+    """
+    if _profile is None:
+        return
+    _profile.counters[name] = _profile.counters.get(name, 0) + n
+
+
+def observe(name: str, value: float) -> None:
+    """Add a value to a histogram, if the instrumentation is enabled.
+
+    Parameters
+    ----------
+    name : str
+        The name of the histogram.
+    value : float
+        The observed value.
+    """
+    if _profile is None:
+        return
+    if name not in _profile.histograms:
+        _profile.histograms[name] = Histogram()
+    _profile.histograms[name].add(value)
+
+
+def timer(name: str) -> nullcontext | _Timer:
+    """Time a block of code, if the instrumentation is enabled.
+
+    Parameters
+    ----------
+    name : str
+        The name of the timer.
+
+    Returns
+    -------
+    timer : context manager
+        The context manager timing the block, or a shared no-op context manager if the
+        instrumentation is disabled.
+    """
+    if _profile is None:
+        return _NULL_TIMER
+    if name not in _profile.timers:
+        _profile.timers[name] = Histogram()
+    return _Timer(_profile.timers[name])
+
+
+class _Timer:
+    """Context manager adding the duration of a block to a histogram."""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self._histogram = histogram
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *args) -> None:
+        self._histogram.add(time.perf_counter() - self._start)
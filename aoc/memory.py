@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import re
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+_PROC_STATUS: Path = Path("/proc/self/status")
+_PROC_CLEAR_REFS: Path = Path("/proc/self/clear_refs")
+_UNITS: dict[str, int] = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+class MemoryBudgetError(RuntimeError):
+    """Error raised when a part exceeds the memory budget of its day."""
+
+
+@dataclass
+class MemoryUsage:
+    """The peak memory used within a :func:`track_memory` context.
+
+    Parameters
+    ----------
+    peak_traced : int
+        The peak size of the memory blocks allocated through Python, including the
+        numpy arrays, as traced by :mod:`tracemalloc`, in bytes.
+    peak_rss : int | None
+        The peak resident set size of the process, in bytes, or None if it can not be
+        measured on this platform. On Linux, the peak is reset when entering the
+        context, otherwise it is the peak since the start of the process.
+    """
+
+    peak_traced: int = 0
+    peak_rss: int | None = None
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of the current process.
+
+    Returns
+    -------
+    rss : int | None
+        The peak resident set size, in bytes, or None if it can not be measured on this
+        platform.
+    """
+    try:
+        status = _PROC_STATUS.read_text()
+    except OSError:
+        pass
+    else:
+        match = re.search(r"^VmHWM:\s+(\d+) kB", status, re.MULTILINE)
+        if match is not None:
+            return int(match.group(1)) * 1024
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # bytes on macOS, else kB
+
+
+def _reset_peak_rss() -> None:
+    """Reset the peak resident set size to the current one, on Linux only."""
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        pass
+
+
+@contextmanager
+def track_memory() -> Generator[MemoryUsage, None, None]:
+    """Measure the peak memory used within the context.
+
+    Returns
+    -------
+    usage : MemoryUsage
+        The peak memory usage, filled when leaving the context. Note that tracing the
+        memory allocations slows down the code run within the context.
+    """
+    usage = MemoryUsage()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    _reset_peak_rss()
+    try:
+        yield usage
+    finally:
+        usage.peak_traced = tracemalloc.get_traced_memory()[1]
+        usage.peak_rss = peak_rss()
+        if not tracing:
+            tracemalloc.stop()
+
+
+def parse_size(value: str) -> int:
+    """Parse a memory size, e.g. '512M' or '2G'.
+
+    Parameters
+    ----------
+    value : str
+        The size, as a number of bytes optionally followed by the binary unit ``K``,
+        ``M`` or ``G``, e.g. ``'512M'``, ``'512MB'`` or ``'512MiB'``, in any case.
+
+    Returns
+    -------
+    size : int
+        The size, in bytes.
+    """
+    # the value is upper-cased, thus the 'i' of the binary prefixes is matched as 'I'
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*(?:([KMG])I?)?B?", value.strip().upper())
+    if match is None:
+        raise ValueError(f"Invalid memory size '{value}', e.g. use '512M' or '2G'.")
+    return int(float(match.group(1)) * _UNITS[match.group(2) or ""])
+
+
+def format_size(size: int | None) -> str:
+    """Format a memory size in MiB."""
+    return "-" if size is None else f"{size / (1 << 20):.1f}"
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+    from typing import TextIO, TypeVar
+
+    T = TypeVar("T")
+
+
+class Progress:
+    """Progress reporter redrawing a single status line at a bounded rate.
+
+    The reporter is silent when the stream is not a terminal, e.g. when the output is
+    redirected to a file or when the solvers run in the workers of a process pool.
+
+    Parameters
+    ----------
+    total : int
+        The number of steps to complete.
+    desc : str
+        The description displayed in front of the progress.
+    max_rate : float
+        The maximum number of updates of the status line per second.
+    stream : TextIO | None
+        The stream on which the progress is written. If None, the standard output is
+        used.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        desc: str = "",
+        max_rate: float = 10.0,
+        stream: TextIO | None = None,
+    ) -> None:
+        if max_rate <= 0:
+            raise ValueError(f"The maximum rate must be positive, got {max_rate}.")
+        self._total = total
+        self._desc = desc
+        self._interval = 1 / max_rate
+        self._stream = sys.stdout if stream is None else stream
+        self._enabled = self._stream.isatty()
+        self._count = 0
+        self._start = time.perf_counter()
+        self._last = -float("inf")  # time of the last redraw
+        self._drawn = None  # count at the last redraw
+
+    def __enter__(self) -> Progress:
+        """Enter the context, returning the reporter."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit the context, closing the reporter."""
+        self.close()
+
+    def update(self, n: int = 1) -> None:
+        """Advance the progress by n steps, redrawing the status line if due."""
+        self._count += n
+        if not self._enabled:
+            return
+        now = time.perf_counter()
+        if now - self._last < self._interval and self._count < self._total:
+            return
+        self._last = now
+        self._draw(now)
+
+    def close(self) -> None:
+        """Draw the final status line and move to the next line."""
+        if not self._enabled or self._drawn is None:
+            return
+        if self._drawn != self._count:
+            self._draw(time.perf_counter())
+        self._stream.write("\n")
+        self._stream.flush()
+        self._enabled = False
+
+    def _draw(self, now: float) -> None:
+        """Redraw the status line."""
+        elapsed = now - self._start
+        line = f"{self._desc}: {self._count} / {self._total}"
+        if self._total != 0:
+            line += f" ({100 * self._count / self._total:.1f}%)"
+        if 0 < self._count < self._total:
+            eta = elapsed * (self._total - self._count) / self._count
+            line += f", ETA {eta:.1f} s"
+        else:
+            line += f", {elapsed:.1f} s"
+        self._stream.write(f"\r{line}\033[K")
+        self._stream.flush()
+        self._drawn = self._count
+
+
+def track(
+    iterable: Iterable[T],
+    desc: str = "",
+    total: int | None = None,
+    max_rate: float = 10.0,
+) -> Generator[T, None, None]:
+    """Iterate while reporting the progress, see :class:`Progress`.
+
+    Parameters
+    ----------
+    iterable : Iterable
+        The items to iterate over.
+    desc : str
+        The description displayed in front of the progress.
+    total : int | None
+        The number of items. If None, ``len(iterable)`` is used.
+    max_rate : float
+        The maximum number of updates of the status line per second.
+
+    Yields
+    ------
+    item : Any
+        The items of the iterable.
+    """
+    total = len(iterable) if total is None else total
+    with Progress(total, desc, max_rate) as progress:
+        for item in iterable:
+            yield item
+            progress.update()
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import instrument
+from .cache import cached_parse
+from .days import DAYS, PARTS, ROOT, input_file, load_day
+from .memory import MemoryBudgetError, format_size, track_memory
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Any
+
+# dependencies slow to import, which should only be loaded on the code paths using them
+HEAVY_MODULES: tuple[str, ...] = ("matplotlib", "networkx", "sympy")
+_IMPORT_SCRIPT: str = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module("day{day}.main")
+import_time = time.perf_counter() - start
+modules = [name for name in {modules} if name in sys.modules]
+print(json.dumps({{"import_time": import_time, "modules": modules}}))
+"""
+
+
+@dataclass(frozen=True)
+class PartResult:
+    """The answer and timings of one part of one day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    part : int
+        The part of the puzzle, 1 or 2.
+    fname : Path
+        The input file solved.
+    answer : int | None
+        The answer to the puzzle, or None if the day does not implement the part.
+    parse_time : float
+        The wall time spent parsing the input file, in seconds.
+    solve_time : float
+        The wall time spent solving the part, in seconds.
+    profile : dict | None
+        The measurements of the instrumentation while solving the part, see
+        :meth:`~aoc.instrument.Profile.to_dict`, or None if it was disabled.
+    peak_traced : int | None
+        The peak memory allocated while parsing and solving the part, in bytes, or None
+        if the memory was not tracked, see :class:`~aoc.memory.MemoryUsage`.
+    peak_rss : int | None
+        The peak resident set size of the process while parsing and solving the part,
+        in bytes, or None if the memory was not tracked or can not be measured.
+    """
+
+    day: int
+    part: int
+    fname: Path
+    answer: int | None
+    parse_time: float
+    solve_time: float
+    profile: dict[str, Any] | None = None
+    peak_traced: int | None = None
+    peak_rss: int | None = None
+
+    @property
+    def peak_memory(self) -> int | None:
+        """Peak memory compared to the budgets, the resident set size if available."""
+        return self.peak_traced if self.peak_rss is None else self.peak_rss
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    """The import time of the module of one day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    import_time : float
+        The wall time spent importing the module in a fresh interpreter, in seconds.
+    modules : tuple of str
+        The heavy dependencies, among :data:`HEAVY_MODULES`, loaded by the import.
+    """
+
+    day: int
+    import_time: float
+    modules: tuple[str, ...]
+
+
+def solve(
+    day: int,
+    part: int,
+    fname: str | Path = "input.txt",
+    cache: bool = False,
+    profile: bool = False,
+    memory: bool = False,
+) -> PartResult:
+    """Parse the input and solve one part of one day.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    part : int
+        The part of the puzzle, 1 or 2.
+    fname : str | Path
+        The input file, see :func:`~aoc.days.input_file`.
+    cache : bool
+        If True, the parsed input is loaded from the cache, see
+        :func:`~aoc.cache.cached_parse`.
+    profile : bool
+        If True, the instrumentation is enabled while solving the part, see
+        :mod:`aoc.instrument`.
+    memory : bool
+        If True, the peak memory used while parsing and solving the part is measured,
+        see :func:`~aoc.memory.track_memory`. Tracing the allocations slows down both
+        the parsing and the solving.
+
+    Returns
+    -------
+    result : PartResult
+        The answer and the timings.
+    """
+    return solve_day(day, (part,), fname, cache, profile, memory)[0]
+
+
+def solve_day(
+    day: int,
+    parts: Sequence[int] = PARTS,
+    fname: str | Path = "input.txt",
+    cache: bool = False,
+    profile: bool = False,
+    memory: bool = False,
+) -> list[PartResult]:
+    """Parse the input once and solve several parts of one day.
+
+    The parts share the parsed input, and thus the artifacts computed from it, see
+    :func:`~aoc.artifacts.artifact`.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+    parts : sequence of int
+        The parts of the puzzle to solve, in order.
+    fname : str | Path
+        The input file, see :func:`~aoc.days.input_file`.
+    cache : bool
+        If True, the parsed input is loaded from the cache, see
+        :func:`~aoc.cache.cached_parse`.
+    profile : bool
+        If True, the instrumentation is enabled while solving each part, see
+        :mod:`aoc.instrument`.
+    memory : bool
+        If True, the peak memory used while solving each part is measured, see
+        :func:`~aoc.memory.track_memory`. The parsing is measured with the first part.
+
+    Returns
+    -------
+    results : list of PartResult
+        The answer and the timings of each part. The parse time is reported on the
+        first part solved, and is 0 for the parts reusing the parsed input.
+    """
+    module = load_day(day)
+    fname = input_file(day, fname)
+    results = []
+    data = None
+    for part in parts:
+        solver = getattr(module, f"part{part}", None)
+        if solver is None:
+            results.append(PartResult(day, part, fname, None, 0.0, 0.0))
+            continue
+        with ExitStack() as stack:
+            usage = stack.enter_context(track_memory()) if memory else None
+            parse_time = 0.0
+            if data is None:
+                start = time.perf_counter()
+                data = cached_parse(day, fname) if cache else module.parse(fname)
+                parse_time = time.perf_counter() - start
+            measurements = (
+                stack.enter_context(instrument.profile()) if profile else None
+            )
+            start = time.perf_counter()
+            answer = solver(data)
+            solve_time = time.perf_counter() - start
+        results.append(
+            PartResult(
+                day,
+                part,
+                fname,
+                answer,
+                parse_time,
+                solve_time,
+                None if measurements is None else measurements.to_dict(),
+                None if usage is None else usage.peak_traced,
+                None if usage is None else usage.peak_rss,
+            )
+        )
+    return results
+
+
+def run(
+    days: Sequence[int] = DAYS,
+    parts: Sequence[int] = PARTS,
+    fname: str | Path = "input.txt",
+    n_jobs: int | None = None,
+    cache: bool = False,
+    profile: bool = False,
+    memory: bool = False,
+) -> list[PartResult]:
+    """Solve several days and parts across a process pool.
+
+    The parts of a day are solved in the same task, on the same parsed input, see
+    :func:`solve_day`.
+
+    Parameters
+    ----------
+    days : sequence of int
+        The days to solve.
+    parts : sequence of int
+        The parts to solve for each day.
+    fname : str | Path
+        The input file, see :func:`~aoc.days.input_file`.
+    n_jobs : int | None
+        The number of worker processes. If None, one worker per CPU is used. If 1, the
+        days are solved sequentially in the current process.
+    cache : bool
+        If True, the parsed inputs are loaded from the cache, see
+        :func:`~aoc.cache.cached_parse`.
+    profile : bool
+        If True, the instrumentation is enabled while solving each part, see
+        :mod:`aoc.instrument`.
+    memory : bool
+        If True, the peak memory used by each part is measured, see
+        :func:`~aoc.memory.track_memory`.
+
+    Returns
+    -------
+    results : list of PartResult
+        The results, sorted by day and part.
+    """
+    for part in parts:
+        if part not in PARTS:
+            raise ValueError(f"Part {part} is not available, choose among {PARTS}.")
+    parts = sorted(parts)
+    n_jobs = min(os.cpu_count() if n_jobs is None else n_jobs, len(days))
+    if n_jobs <= 1:
+        results = [solve_day(day, parts, fname, cache, profile, memory) for day in days]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(solve_day, day, parts, fname, cache, profile, memory)
+                for day in days
+            ]
+            results = [future.result() for future in futures]
+    results = [result for elt in results for result in elt]
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def check_budgets(results: Sequence[PartResult], budgets: dict[int, int]) -> None:
+    """Check that the parts did not exceed the memory budget of their day.
+
+    Parameters
+    ----------
+    results : sequence of PartResult
+        The results, solved with the memory tracking enabled.
+    budgets : dict of int to int
+        The memory budget of each day, in bytes, compared to
+        :attr:`PartResult.peak_memory`. The days without budget are not checked.
+
+    Raises
+    ------
+    MemoryBudgetError
+        If at least one part exceeded its budget.
+    """
+    exceeded = []
+    for result in results:
+        budget = budgets.get(result.day)
+        if budget is None or result.answer is None:
+            continue
+        if result.peak_memory is None:
+            raise ValueError(
+                f"The memory of day {result.day} part {result.part} was not tracked."
+            )
+        if budget < result.peak_memory:
+            exceeded.append(
+                f"day {result.day} part {result.part}: "
+                f"{format_size(result.peak_memory)} MiB > {format_size(budget)} MiB"
+            )
+    if len(exceeded) != 0:
+        raise MemoryBudgetError(
+            "Memory budget exceeded by " + ", ".join(exceeded) + "."
+        )
+
+
+def measure_import(day: int) -> ImportResult:
+    """Measure the import time of the module of one day.
+
+    The module is imported in a fresh interpreter, such that the modules already loaded
+    by the current process, e.g. by another day, do not hide the import cost.
+
+    Parameters
+    ----------
+    day : int
+        The day of the puzzle.
+
+    Returns
+    -------
+    result : ImportResult
+        The import time and the heavy dependencies loaded by the import.
+    """
+    load_day(day)  # validate the day
+    script = _IMPORT_SCRIPT.format(day=day, modules=HEAVY_MODULES)
+    process = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(process.stdout)
+    return ImportResult(day, report["import_time"], tuple(report["modules"]))
+
+
+def measure_imports(days: Sequence[int] = DAYS) -> list[ImportResult]:
+    """Measure the import time of the module of several days, one after the other.
+
+    Parameters
+    ----------
+    days : sequence of int
+        The days to measure.
+
+    Returns
+    -------
+    results : list of ImportResult
+        The import times, sorted by day.
+    """
+    return [measure_import(day) for day in sorted(days)]
+
+
+def format_imports(results: Sequence[ImportResult]) -> str:
+    """Format the import times as a table.
+
+    Parameters
+    ----------
+    results : sequence of ImportResult
+        The import times to format.
+
+    Returns
+    -------
+    table : str
+        The formatted table.
+    """
+    lines = [f"{'day':>3}  {'import (s)':>10}  heavy modules"]
+    for result in results:
+        modules = ", ".join(result.modules) if len(result.modules) != 0 else "-"
+        lines.append(f"{result.day:>3}  {result.import_time:>10.4f}  {modules}")
+    return "\n".join(lines)
+
+
+def write_profile(results: Sequence[PartResult], fname: str | Path) -> None:
+    """Write the answers, timings and instrumentation of a run to a JSON file.
+
+    Parameters
+    ----------
+    results : sequence of PartResult
+        The results of the run, solved with the instrumentation enabled.
+    fname : str | Path
+        The JSON file to write.
+    """
+    runs = [
+        {
+            "day": result.day,
+            "part": result.part,
+            "input": str(result.fname),
+            "answer": result.answer,
+            "parse_time": result.parse_time,
+            "solve_time": result.solve_time,
+            "profile": result.profile,
+        }
+        for result in results
+    ]
+    with open(fname, "w") as fid:
+        json.dump(runs, fid, indent=2)
+
+
+def format_results(results: Sequence[PartResult]) -> str:
+    """Format the results as a table.
+
+    Parameters
+    ----------
+    results : sequence of PartResult
+        The results to format.
+
+    Returns
+    -------
+    table : str
+        The formatted table.
+    """
+    memory = any(result.peak_traced is not None for result in results)
+    header = (
+        f"{'day':>3}  {'part':>4}  {'answer':>20}  {'parse (s)':>10}  {'solve (s)':>10}"
+    )
+    if memory:
+        header += f"  {'traced (MiB)':>12}  {'rss (MiB)':>10}"
+    lines = [header]
+    for result in results:
+        answer = "-" if result.answer is None else str(result.answer)
+        line = (
+            f"{result.day:>3}  {result.part:>4}  {answer:>20}  "
+            f"{result.parse_time:>10.4f}  {result.solve_time:>10.4f}"
+        )
+        if memory:
+            line += (
+                f"  {format_size(result.peak_traced):>12}"
+                f"  {format_size(result.peak_rss):>10}"
+            )
+        lines.append(line)
+    return "\n".join(lines)
@@ -1,37 +1,287 @@
 from __future__ import annotations
 
+import io
+import tempfile
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-data: NDArray[np.int32] = np.loadtxt(fname, dtype=np.int32)  # shape of (1000, 2)
+_NEWLINE: int = ord("\n")
+_SPACE: int = ord(" ")
+_ZERO: int = ord("0")
+_MAX_DIGITS: int = 9  # largest number of digits fitting in an int32
+
+
+def parse(fname: Path) -> NDArray[np.int32]:
+    """Parse the input file into an array of shape (n_locations, 2).
+
+    The location IDs are written in fixed-width columns, thus they are decoded straight
+    from the bytes of the file, one digit position at a time. Other layouts fall back
+    to :func:`numpy.loadtxt`.
+    """
+    return _parse_bytes(Path(fname).read_bytes())
+
+
+def _parse_bytes(raw: bytes) -> NDArray[np.int32]:
+    """Decode the lines of the input file, with a fallback for non fixed-width ones."""
+    data = _parse_fixed_width(raw)
+    if data is None:
+        data = np.loadtxt(io.BytesIO(raw), dtype=np.int32, ndmin=2)
+    return data
+
+
+def _parse_fixed_width(raw: bytes) -> NDArray[np.int32] | None:
+    """Decode 2 columns of fixed-width integers, or None if the layout differs."""
+    if len(raw) == 0:
+        return None
+    if raw[-1] != _NEWLINE:
+        raw += b"\n"
+    width = raw.index(b"\n") + 1
+    if len(raw) % width != 0:
+        return None
+    lines = np.frombuffer(raw, dtype=np.uint8).reshape(-1, width)
+    is_digit = lines[0, :-1] != _SPACE
+    edges = np.diff(is_digit.astype(np.int8), prepend=0, append=0)
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    if starts.size != 2 or _MAX_DIGITS < np.max(stops - starts):
+        return None
+    # the separators, before, between and after the 2 columns of digits
+    bounds = [0, starts[0], stops[0], starts[1], stops[1], width - 1]
+    if np.any(lines[:, -1] != _NEWLINE) or any(
+        np.any(lines[:, start:stop] != _SPACE)
+        for start, stop in zip(bounds[::2], bounds[1::2], strict=True)
+    ):
+        return None
+    data = np.empty((lines.shape[0], 2), dtype=np.int32)
+    for k, (start, stop) in enumerate(zip(starts, stops, strict=True)):
+        digits = lines[:, start:stop] - _ZERO
+        # wrap-around of the uint8 subtraction maps the non-digit bytes above 9
+        if np.any(9 < digits):
+            return None
+        weights = 10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int32)
+        data[:, k] = digits.astype(np.int32) @ weights
+    return data
 
 
 # %% part 1
 def get_distances(data: NDArray[np.int32]) -> int:
     """Get the total distances."""
     distances = np.abs(np.sort(data[:, 1]) - np.sort(data[:, 0]))
-    return np.sum(distances)
+    return np.sum(distances, dtype=np.int64)
 
 
-total = get_distances(data)
-print(f"The total distance is {total}.")
+def part1(data: NDArray[np.int32]) -> int:
+    """Solve part 1."""
+    return int(get_distances(data))
 
 
 # %% part 2
+def count_occurrences(
+    values: NDArray[np.int32], locations: NDArray[np.int32]
+) -> NDArray[np.int64]:
+    """Count the occurrences of each value among the locations.
+
+    The counts are looked up in a histogram of the locations if their range is small
+    compared to their number, else in the sorted unique locations.
+    """
+    if locations.size == 0:
+        return np.zeros(values.size, dtype=np.int64)
+    low, high = int(locations.min()), int(locations.max())
+    if high - low <= 4 * locations.size:
+        counts = np.bincount(locations - low, minlength=high - low + 1)
+        inside = (low <= values) & (values <= high)
+        return np.where(inside, counts[np.clip(values - low, 0, high - low)], 0)
+    unique, counts = np.unique(locations, return_counts=True)
+    idx = np.clip(np.searchsorted(unique, values), 0, unique.size - 1)
+    return np.where(unique[idx] == values, counts[idx], 0)
+
+
 def get_similarity(data: NDArray[np.int32]) -> int:
     """Get the similarity score."""
-    intersection = np.intersect1d(data[:, 0], data[:, 1])
-    total = 0
-    for elt in intersection:
-        total += np.where(data[:, 1] == elt)[0].size * elt
-    return total
+    values = np.unique(data[:, 0])
+    counts = count_occurrences(values, data[:, 1])
+    return np.sum(values.astype(np.int64) * counts)
+
+
+def part2(data: NDArray[np.int32]) -> int:
+    """Solve part 2."""
+    return int(get_similarity(data))
+
+
+# %% out-of-core
+def solve_out_of_core(
+    fname: Path, memory_limit: int = 256 << 20, tmpdir: Path | None = None
+) -> tuple[int, int]:
+    """Solve both parts on an input file larger than the memory.
+
+    The file is read in chunks whose columns are sorted and written to temporary files,
+    the sorted runs. The runs of each column are then merged, one block per run at a
+    time. The total distance is accumulated over the 2 merged columns read in lockstep,
+    position by position, and the similarity score over a second merge of the columns
+    read in a merge-join, value by value, such that both passes hold about one block per
+    column whatever the ranges of values of the columns.
+
+    Parameters
+    ----------
+    fname : Path
+        The input file.
+    memory_limit : int
+        The approximate ceiling of the memory used for the data, in bytes. A lower
+        ceiling yields more runs, merged in smaller blocks.
+    tmpdir : Path | None
+        The folder in which the sorted runs are written, by default the temporary folder
+        of the system. The runs take ~8 bytes per line of the input file.
+
+    Returns
+    -------
+    distance : int
+        The total distance, see :func:`part1`.
+    similarity : int
+        The similarity score, see :func:`part2`.
+    """
+    with tempfile.TemporaryDirectory(prefix="aoc-day1-", dir=tmpdir) as folder:
+        # the raw chunk, its parsed columns and their sorted copies take ~3x the chunk
+        runs = _write_sorted_runs(fname, max(memory_limit // 4, 1), Path(folder))
+        # each run buffers a block per column, copied ~4x while merged and aligned
+        block = max(memory_limit // (32 * max(len(runs), 1)), 1)
+        distance = 0
+        for lblock, rblock in zip(
+            _rechunk(_merge_runs([run[0] for run in runs], block), block),
+            _rechunk(_merge_runs([run[1] for run in runs], block), block),
+            strict=True,
+        ):
+            distance += int(np.sum(np.abs(rblock - lblock), dtype=np.int64))
+        similarity = _merge_join(
+            _merge_runs([run[0] for run in runs], block),
+            _merge_runs([run[1] for run in runs], block),
+        )
+        del runs  # release the memory-maps before removing the runs
+    return distance, similarity
+
+
+def _write_sorted_runs(
+    fname: Path, chunk_size: int, folder: Path
+) -> list[NDArray[np.int32]]:
+    """Sort the columns of the input file chunk by chunk into memory-mapped runs."""
+    runs = []
+    with open(fname, "rb") as fid:
+        remainder = b""
+        while True:
+            raw = fid.read(chunk_size)
+            chunk = remainder + raw
+            if len(raw) != 0:
+                # the partial line at the end of the chunk is left for the next one
+                end = chunk.rfind(b"\n") + 1
+                chunk, remainder = chunk[:end], chunk[end:]
+            if len(chunk.strip()) != 0:
+                data = _parse_bytes(chunk)
+                run = folder / f"run-{len(runs)}.npy"
+                np.save(run, np.sort(data.T, axis=1))  # shape of (2, n_lines)
+                del data
+                runs.append(np.load(run, mmap_mode="r"))
+            if len(raw) == 0:
+                break
+    return runs
+
+
+def _merge_runs(
+    runs: list[NDArray[np.int32]], block: int
+) -> Generator[NDArray[np.int32], None, None]:
+    """Merge sorted runs into sorted blocks, loading one block per run at a time."""
+    positions = [0] * len(runs)
+    buffers = [np.empty(0, dtype=np.int32) for _ in runs]
+    while True:
+        for k, run in enumerate(runs):
+            if buffers[k].size < block and positions[k] < run.size:
+                stop = positions[k] + block - buffers[k].size
+                buffers[k] = np.concatenate((buffers[k], run[positions[k] : stop]))
+                positions[k] = min(stop, run.size)
+        pending = [
+            buffer[-1]
+            for k, buffer in enumerate(buffers)
+            if positions[k] < runs[k].size
+        ]
+        if len(pending) == 0:
+            merged = np.sort(np.concatenate(buffers)) if len(buffers) != 0 else None
+            if merged is not None and merged.size != 0:
+                yield merged
+            return
+        # the values up to the smallest last value of the runs still being read are
+        # complete, and the run holding it is emptied such that it is refilled
+        frontier = min(pending)
+        split = [np.searchsorted(buffer, frontier, side="right") for buffer in buffers]
+        yield np.sort(
+            np.concatenate(
+                [buffer[:idx] for buffer, idx in zip(buffers, split, strict=True)]
+            )
+        )
+        buffers = [buffer[idx:] for buffer, idx in zip(buffers, split, strict=True)]
+
+
+def _rechunk(
+    blocks: Iterable[NDArray[np.int32]], size: int
+) -> Generator[NDArray[np.int32], None, None]:
+    """Regroup the values of the blocks into blocks of a fixed size, but the last."""
+    buffer = np.empty(0, dtype=np.int32)
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        while size <= buffer.size:
+            yield buffer[:size]
+            buffer = buffer[size:]
+    if buffer.size != 0:
+        yield buffer
+
+
+def _merge_join(
+    left: Iterable[NDArray[np.int32]], right: Iterable[NDArray[np.int32]]
+) -> int:
+    """Similarity score of 2 sorted columns given in sorted blocks, in a merge-join.
+
+    The next block is read from the column with the smallest buffered maximum, and the
+    values below the buffered maximum of both columns are settled and dropped, thus the
+    buffers hold about one block per column even if the ranges of values differ.
+    """
+    columns = [iter(left), iter(right)]
+    buffers = [np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)]
+    reading = [True, True]
+    similarity = 0
+    while any(reading):
+        # an empty buffer is refilled first
+        k = min(
+            (k for k in range(2) if reading[k]),
+            key=lambda k: buffers[k][-1] if buffers[k].size != 0 else -np.inf,
+        )
+        block = next(columns[k], None)
+        if block is None:
+            reading[k] = False
+        else:
+            buffers[k] = np.concatenate((buffers[k], block))
+        if any(reading[k] and buffers[k].size == 0 for k in range(2)):
+            continue
+        pending = [buffers[k][-1] for k in range(2) if reading[k]]
+        if len(pending) == 0:
+            break
+        # the values below the last value of the columns still being read are complete
+        bound = min(pending)
+        split = [np.searchsorted(buffer, bound) for buffer in buffers]
+        similarity += _similarity(buffers[0][: split[0]], buffers[1][: split[1]])
+        buffers = [buffer[idx:] for buffer, idx in zip(buffers, split, strict=True)]
+    return similarity + _similarity(*buffers)
+
+
+def _similarity(left: NDArray[np.int32], right: NDArray[np.int32]) -> int:
+    """Similarity score of the values of a range complete in both sorted columns."""
+    values = np.unique(left)
+    return int(np.sum(values.astype(np.int64) * count_occurrences(values, right)))
 
 
-total = get_similarity(data)
-print(f"The total similarity score is {total}.")
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The total distance is {part1(data)}.")
+    print(f"The total similarity score is {part2(data)}.")
@@ -3,51 +3,72 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import networkx as nx
 import numpy as np
 
+from aoc.artifacts import artifact
+from aoc.grid import Grid
+
 if TYPE_CHECKING:
+    import networkx as nx
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: NDArray[np.int8] = np.array(
-        [[int(elt) for elt in line.strip()] for line in fid.readlines()], dtype=np.int8
-    )
+
+def parse(fname: Path) -> Grid:
+    """Parse the topographic map into a grid of heights, padded outside of the map."""
+    return Grid.from_file(fname, pad=1, fill=0)
+
+
+def to_arrays(data: Grid) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return data.to_arrays()
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> Grid:
+    """Convert the named arrays to the parsed input."""
+    return Grid.from_arrays(arrays)
 
 
 # %% part 1
-def build_graph(
-    data: NDArray[np.int8], trailheads: list[tuple[int, int]]
-) -> nx.DiGraph:
-    """Build the graph containing the trails on the map."""
+def build_graph(data: Grid, trailheads: NDArray[np.intp]) -> nx.DiGraph:
+    """Build the graph containing the trails on the map.
+
+    The nodes of the graph are the flat indices of the positions in the grid.
+    """
+    import networkx as nx
+
     G = nx.DiGraph()
-    for x, y in trailheads:
-        assert data[x, y] == 0  # sanity-check
-        add_edges_on_path(G, data, x, y)
+    for index in trailheads.tolist():
+        assert data.flat[index] == ord("0")  # sanity-check
+        add_edges_on_path(G, data, index)
     return G
 
 
-def add_edges_on_path(G: nx.DiGraph, data: NDArray[np.int8], x: int, y: int):
-    """Add all edges next to (x, y) on the trail."""
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        new_x, new_y = x + dx, y + dy
-        if in_bounds(data, new_x, new_y) and data[new_x, new_y] == data[x, y] + 1:
-            G.add_edge((x, y), (new_x, new_y))
-            add_edges_on_path(G, data, new_x, new_y)
+def add_edges_on_path(G: nx.DiGraph, data: Grid, index: int):
+    """Add all edges next to the position on the trail."""
+    flat = data.flat
+    for offset in data.offsets4.tolist():
+        new_index = index + offset
+        # the padding is never one step above a height of the map
+        if flat[new_index] == flat[index] + 1:
+            G.add_edge(index, new_index)
+            add_edges_on_path(G, data, new_index)
+
 
+@artifact
+def find_trails(data: Grid) -> tuple[nx.DiGraph, list[int], list[int]]:
+    """Build the graph of the trails and list the trailheads and trailends.
 
-def in_bounds(data: NDArray[np.int8], x: int, y: int) -> bool:
-    """Check if the position is on the map."""
-    rows, cols = data.shape
-    return 0 <= x < rows and 0 <= y < cols
+    The graph is built once per map and shared by both parts.
+    """
+    trailheads = data.find("0")
+    return build_graph(data, trailheads), trailheads.tolist(), data.find("9").tolist()
 
 
-def measure_score(data: NDArray[np.int8]) -> int:
+def measure_score(data: Grid) -> int:
     """Measure the total score of the trails on the map."""
-    trailheads = list(zip(*np.where(data == 0), strict=False))
-    trailends = list(zip(*np.where(data == 9), strict=False))
-    G = build_graph(data, trailheads)
+    import networkx as nx
+
+    G, trailheads, trailends = find_trails(data)
     total_score = 0
     for trailhead in trailheads:
         score = 0
@@ -58,16 +79,17 @@ def measure_score(data: NDArray[np.int8]) -> int:
     return total_score
 
 
-total = measure_score(data)
-print(f"The total score of the trailheads is: {total}.")
+def part1(data: Grid) -> int:
+    """Solve part 1."""
+    return measure_score(data)
 
 
 # %% part 2
-def measure_rating(data: NDArray[np.int8]) -> int:
+def measure_rating(data: Grid) -> int:
     """Measure the total rating of the trails on the map."""
-    trailheads = list(zip(*np.where(data == 0), strict=False))
-    trailends = list(zip(*np.where(data == 9), strict=False))
-    G = build_graph(data, trailheads)
+    import networkx as nx
+
+    G, trailheads, trailends = find_trails(data)
     total_rating = 0
     for trailhead in trailheads:
         rating = 0
@@ -77,5 +99,12 @@ def measure_rating(data: NDArray[np.int8]) -> int:
     return total_rating
 
 
-total = measure_rating(data)
-print(f"The total rating of the trailheads is: {total}.")
+def part2(data: Grid) -> int:
+    """Solve part 2."""
+    return measure_rating(data)
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The total score of the trailheads is: {part1(data)}.")
+    print(f"The total rating of the trailheads is: {part2(data)}.")
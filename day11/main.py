@@ -3,10 +3,30 @@ from __future__ import annotations
 from collections import Counter
 from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: list[int] = [int(elt) for elt in fid.read().strip().split(" ")]
+import numpy as np
+
+from aoc.progress import track
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+def parse(fname: Path) -> list[int]:
+    """Parse the engraved numbers of the stones."""
+    with open(fname) as fid:
+        return [int(elt) for elt in fid.read().strip().split(" ")]
+
+
+def to_arrays(data: list[int]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return {"data": np.array(data, dtype=np.int64)}
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> list[int]:
+    """Convert the named arrays to the parsed input."""
+    return arrays["data"].tolist()
 
 
 # %% part 1
@@ -33,48 +53,44 @@ def process_blink(data: list[int]) -> list[int]:
 
 def count_stones_after_n_blinks(data: list[int], n: int) -> int:
     """Count the number of stones after n blinks."""
-    for k in range(n):
-        print(f"Processing blink {k + 1} / {n}..")
+    for _ in track(range(n), "Blinking"):
         data = process_blink(data)
     return len(data)
 
 
-total = count_stones_after_n_blinks(data, 25)
-print(f"Total stones after 25 blinks: {total}.")
+def part1(data: list[int]) -> int:
+    """Solve part 1."""
+    return count_stones_after_n_blinks(data, 25)
 
 
 # %% part 2
-@cache
-def process_stone(stone: int) -> list[int]:  # noqa: F811
-    """Process the given stone and figure out what happens to it."""
-    if stone == 0:
-        return [1]
-    elif len(str(stone)) % 2 == 0:
-        stone = str(stone)
-        assert stone[0] != "0"  # sanity-check, a stone can't start with 0
-        return [int(stone[: len(stone) // 2]), int(stone[len(stone) // 2 :])]
-    else:
-        return [stone * 2024]
+_process_stone_cached = cache(process_stone)
 
 
-def process_blink(stone_counts: Counter[int]) -> Counter[int]:  # noqa: F811
-    """Process a blink iteration on the list of stones."""
+def process_blink_counts(stone_counts: Counter[int]) -> Counter[int]:
+    """Process a blink iteration on the number of stones of each value."""
     counts = Counter()
     for stone, count in stone_counts.items():
-        transformed_stones = process_stone(stone)
+        transformed_stones = _process_stone_cached(stone)
         for new_stone in transformed_stones:
             counts[new_stone] += count
     return counts
 
 
-def count_stones_after_n_blinks(data: list[int], n: int) -> int:  # noqa: F811
-    """Count the number of stones after n blinks."""
+def count_stones_after_n_blinks_by_value(data: list[int], n: int) -> int:
+    """Count the number of stones after n blinks, grouping stones by value."""
     stone_counts = Counter(data)
-    for k in range(n):
-        print(f"Processing blink {k + 1} / {n}..")
-        stone_counts = process_blink(stone_counts)
+    for _ in track(range(n), "Blinking"):
+        stone_counts = process_blink_counts(stone_counts)
     return sum(stone_counts.values())
 
 
-total = count_stones_after_n_blinks(data, 75)
-print(f"Total stones after 75 blinks: {total}.")
+def part2(data: list[int]) -> int:
+    """Solve part 2."""
+    return count_stones_after_n_blinks_by_value(data, 75)
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"Total stones after 25 blinks: {part1(data)}.")
+    print(f"Total stones after 75 blinks: {part2(data)}.")
@@ -1,95 +1,107 @@
 from __future__ import annotations
 
-from itertools import product
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import networkx as nx
 import numpy as np
 
+from aoc.artifacts import artifact
+from aoc.grid import Grid
+
 if TYPE_CHECKING:
+    import networkx as nx
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-char_to_num: dict[str, int] = dict()
-with open(fname) as fid:
-    data: list[str] = [line.strip() for line in fid.readlines()]
-data_numerical: list[list[int]] = []
-for line in data:
-    new_char = set(line).difference(set(char_to_num))
-    for char in new_char:
-        char_to_num[char] = len(char_to_num)
-    line = [char_to_num[char] for char in line]
-    data_numerical.append(line)
-data: NDArray[np.int8] = np.array(data_numerical, dtype=np.int8)
-num_to_char: dict[int, str] = {v: k for k, v in char_to_num.items()}
+
+def parse(fname: Path) -> Grid:
+    """Parse the garden map into a grid of plants, padded outside of the map."""
+    return Grid.from_file(fname, pad=1, fill=0)
+
+
+def to_arrays(data: Grid) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return data.to_arrays()
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> Grid:
+    """Convert the named arrays to the parsed input."""
+    return Grid.from_arrays(arrays)
 
 
 # %% part 1
-def build_graph() -> nx.Graph:
-    """Build a graph representation of the map."""
-    G = nx.Graph()
-    rows, cols = data.shape
-    for x, y in product(range(rows), range(cols)):
-        G.add_node((x, y))
-        for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-            new_x, new_y = x + dx, y + dy
-            if in_bounds(data, new_x, new_y) and data[new_x, new_y] == data[x, y]:
-                G.add_edge((x, y), (new_x, new_y))
-    return G
+@artifact
+def build_graph(data: Grid) -> nx.Graph:
+    """Build a graph representation of the map.
 
+    The nodes of the graph are the flat indices of the positions in the grid. The graph
+    is built once per map and shared by both parts.
+    """
+    import networkx as nx
 
-def in_bounds(data: NDArray[np.int8], x: int, y: int) -> bool:
-    """Check if the antinode is still on the map."""
+    G = nx.Graph()
+    flat = data.flat
     rows, cols = data.shape
-    return 0 <= x < rows and 0 <= y < cols
+    indices = data.index(*np.indices((rows, cols))).ravel().tolist()
+    G.add_nodes_from(indices)
+    right, down = data.offsets4[1:3].tolist()  # the graph is undirected
+    for index in indices:
+        for new_index in (index + right, index + down):
+            # the padding never holds the same plant as the map
+            if flat[new_index] == flat[index]:
+                G.add_edge(index, new_index)
+    return G
 
 
 def estimate_fence_cost(G: nx.Graph) -> int:
     """Estimate the cost of the fence."""
+    import networkx as nx
+
     return sum(
         len(elt) * sum(4 - G.degree[node] for node in elt)
         for elt in nx.connected_components(G)
     )
 
 
-G = build_graph()
-total = estimate_fence_cost(G)
-print(f"The cost of the fence is {total}.")
+def part1(data: Grid) -> int:
+    """Solve part 1."""
+    return estimate_fence_cost(build_graph(data))
 
 
 # %% part 2
-def build_boundary_graph(
-    component: set[tuple[int, int]],
-) -> nx.Graph:
+def build_boundary_graph(data: Grid, component: set[int]) -> nx.Graph:
     """Find the boundary edges of a component."""
+    import networkx as nx
+
     G_boundary = nx.Graph()
-    for x, y in component:
-        for dx, dy in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
-            new_x, new_y = x + dx, y + dy
-            if in_bounds(data, new_x, new_y) and (new_x, new_y) in component:
+    up, right, down, left = data.offsets4.tolist()
+    for index in component:
+        x, y = data.coords(index)
+        for offset in (up, right, down, left):
+            if index + offset in component:
                 continue  # the new point is within the same region
-            # this is a boundary edge between (x, y) and (new_x, new_y), let's add it in
+            # this is a boundary edge between index and index + offset, let's add it in
             # our grid-representation of the boundaries.
-            if dx == -1 and dy == 0:  # edge on the top of (x, y)
+            if offset == up:  # edge on the top of (x, y)
                 p1 = (x, y)
                 p2 = (x, y + 1)
-            elif dx == 1 and dy == 0:  # edge on the bottom of (x, y)
+            elif offset == down:  # edge on the bottom of (x, y)
                 p1 = (x + 1, y)
                 p2 = (x + 1, y + 1)
-            elif dx == 0 and dy == -1:  # edge on the left of (x, y)
+            elif offset == left:  # edge on the left of (x, y)
                 p1 = (x, y)
                 p2 = (x + 1, y)
-            elif dx == 0 and dy == 1:  # edge on the right of (x, y)
+            elif offset == right:  # edge on the right of (x, y)
                 p1 = (x, y + 1)
                 p2 = (x + 1, y + 1)
             G_boundary.add_edge(p1, p2)
     return G_boundary
 
 
-def count_sides(component: set[tuple[int, int]]) -> int:
+def count_sides(data: Grid, component: set[int]) -> int:
     """Count the number of cycles of the component."""
-    G_boundary = build_boundary_graph(component)
+    import networkx as nx
+
+    G_boundary = build_boundary_graph(data, component)
     cycles = nx.cycle_basis(G_boundary)  # find all cycles within the component
     n_sides = 0
     for cycle in cycles:
@@ -141,11 +153,19 @@ def get_direction(p1: tuple[int, int], p2: tuple[int, int]) -> str:
         return "vertical"
 
 
-def estimate_fence_cost(G: nx.Graph) -> int:
-    """Estimate the cost of the fence."""
-    return sum(len(elt) * count_sides(elt) for elt in nx.connected_components(G))
+def estimate_discounted_fence_cost(data: Grid, G: nx.Graph) -> int:
+    """Estimate the cost of the fence with the bulk discount."""
+    import networkx as nx
+
+    return sum(len(elt) * count_sides(data, elt) for elt in nx.connected_components(G))
+
+
+def part2(data: Grid) -> int:
+    """Solve part 2."""
+    return estimate_discounted_fence_cost(data, build_graph(data))
 
 
-G = build_graph()
-total = estimate_fence_cost(G)
-print(f"The cost of the fence is {total}.")
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The cost of the fence is {part1(data)}.")
+    print(f"The cost of the fence is {part2(data)}.")
@@ -5,25 +5,41 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
-from sympy import Matrix, symbols
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    lines: list[str] = fid.readlines()
-lines: list[tuple[str, str, str]] = list(
-    zip(lines[::4], lines[1::4], lines[2::4], strict=False)
-)
-data: list[dict[str, NDArray[np.int64]]] = []
-pattern = re.compile(r"(\d+)")
-for line in lines:
-    data_ = dict()
-    for elt, line_ in zip(("A", "B", "Prize"), line, strict=True):
-        x, y = re.findall(pattern, line_)
-        data_[elt] = np.array((int(x), int(y)), dtype=int)
-    data.append(data_)
+
+def parse(fname: Path) -> list[dict[str, NDArray[np.int64]]]:
+    """Parse the button behaviors and prize location of each claw machine."""
+    with open(fname) as fid:
+        lines: list[str] = fid.readlines()
+    lines: list[tuple[str, str, str]] = list(
+        zip(lines[::4], lines[1::4], lines[2::4], strict=False)
+    )
+    data: list[dict[str, NDArray[np.int64]]] = []
+    pattern = re.compile(r"(\d+)")
+    for line in lines:
+        data_ = dict()
+        for elt, line_ in zip(("A", "B", "Prize"), line, strict=True):
+            x, y = re.findall(pattern, line_)
+            data_[elt] = np.array((int(x), int(y)), dtype=int)
+        data.append(data_)
+    return data
+
+
+def to_arrays(data: list[dict[str, NDArray[np.int64]]]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    machines = [[data_["A"], data_["B"], data_["Prize"]] for data_ in data]
+    return {"data": np.array(machines, dtype=np.int64).reshape(-1, 3, 2)}
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> list[dict[str, NDArray[np.int64]]]:
+    """Convert the named arrays to the parsed input."""
+    return [
+        dict(zip(("A", "B", "Prize"), machine, strict=True))
+        for machine in arrays["data"]
+    ]
 
 
 # %% part 1
@@ -55,13 +71,16 @@ def resolve(data: list[dict[str, NDArray[np.int64]]]) -> int:
     return total
 
 
-total = resolve(data)
-print(f"The minimum number of token to spend is {total}.")
+def part1(data: list[dict[str, NDArray[np.int64]]]) -> int:
+    """Solve part 1."""
+    return int(resolve(data))
 
 
 # %% part 2
 def solve_diophantine_system(A_x, A_y, B_x, B_y, P_x, P_y) -> tuple[int, int] | None:
     """Solve the system of diophantine linear equations."""
+    from sympy import Matrix, symbols
+
     a, b = symbols("a b", integer=True)
     # represent the system in matrix form for analysis
     M = Matrix([[A_x, B_x], [A_y, B_y]])
@@ -79,17 +98,24 @@ def solve_diophantine_system(A_x, A_y, B_x, B_y, P_x, P_y) -> tuple[int, int] |
             return a_sol, b_sol
 
 
-def resolve(data: list[dict[str, NDArray[np.int64]]]) -> int:  # noqa: F811
-    """Solve all machine claw problems."""
+def resolve_with_conversion(data: list[dict[str, NDArray[np.int64]]]) -> int:
+    """Solve all machine claw problems after the unit conversion of the prizes."""
     total = 0
     for data_ in data:
-        data_["Prize"] += 10000000000000
-        solution = solve_diophantine_system(*data_["A"], *data_["B"], *data_["Prize"])
+        prize = data_["Prize"] + 10000000000000
+        solution = solve_diophantine_system(*data_["A"], *data_["B"], *prize)
         if solution is None:
             continue
         total += compute_solution_cost(solution)
     return total
 
 
-total = resolve(data)
-print(f"The minimum number of token to spend is {total}.")
+def part2(data: list[dict[str, NDArray[np.int64]]]) -> int:
+    """Solve part 2."""
+    return int(resolve_with_conversion(data))
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The minimum number of token to spend is {part1(data)}.")
+    print(f"The minimum number of token to spend is {part2(data)}.")
@@ -1,39 +1,66 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
-from matplotlib import pyplot as plt
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    lines: list[str] = [elt.strip().split(" ") for elt in fid.readlines()]
-MAP_SIZE: tuple[int, int] = (11, 7) if fname.name == "example.txt" else (101, 103)
-# /!\ does not respect the numpy convention.
+from aoc.progress import track
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+def parse(fname: Path) -> tuple[NDArray[np.int64], tuple[int, int]]:
+    """Parse the robot positions/velocities and the size of the map.
+
+    The positions and velocities are stored in an array of shape (n_robots, 4) with
+    the columns (x, y, vx, vy).
+    """
+    with open(fname) as fid:
+        lines: list[list[str]] = [elt.strip().split(" ") for elt in fid.readlines()]
+    robots = []
+    for line in lines:
+        x, y = map(int, line[0].split("=")[1].split(","))
+        vx, vy = map(int, line[1].split("=")[1].split(","))
+        robots.append((x, y, vx, vy))
+    # /!\ does not respect the numpy convention.
+    map_size = (11, 7) if Path(fname).name == "example.txt" else (101, 103)
+    return np.array(robots, dtype=np.int64).reshape(-1, 4), map_size
+
+
+def to_arrays(data: tuple[NDArray[np.int64], tuple[int, int]]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return {"data": data[0], "map_size": np.array(data[1], dtype=np.int64)}
+
+
+def from_arrays(
+    arrays: dict[str, NDArray],
+) -> tuple[NDArray[np.int64], tuple[int, int]]:
+    """Convert the named arrays to the parsed input."""
+    return arrays["data"], tuple(arrays["map_size"].tolist())
 
 
 # %% part 1
 class Robot:
     """Object representing a robot with its 2D position and velocity."""
 
-    def __init__(self, x: int, y: int, vx: int, vy: int) -> None:
+    def __init__(
+        self, x: int, y: int, vx: int, vy: int, map_size: tuple[int, int]
+    ) -> None:
+        self._map_size = map_size
         self._x = x
         self._y = y
         self._vx = vx
         self._vy = vy
 
-    def move(self) -> None:
-        """Move the robot during 1 second."""
-        new_x = self._x + self._vx
-        if 0 <= new_x:
-            self._x = new_x % MAP_SIZE[0]
-        else:
-            self._x = MAP_SIZE[0] + new_x
-        new_y = self._y + self._vy
-        if 0 <= new_y:
-            self._y = new_y % MAP_SIZE[1]
-        else:
-            self._y = MAP_SIZE[1] + new_y
+    def move(self, n: int = 1) -> None:
+        """Move the robot during n seconds.
+
+        The map wraps around, thus the position after n seconds is computed at once.
+        """
+        self._x = (self._x + n * self._vx) % self._map_size[0]
+        self._y = (self._y + n * self._vy) % self._map_size[1]
 
     def __repr__(self) -> str:
         """Representation of the robot."""
@@ -42,13 +69,14 @@ class Robot:
     @property
     def quadrant(self) -> int | None:
         """Quandrant in which the robot is, or None if it's in-between."""
-        if 0 <= self._x < MAP_SIZE[0] // 2 and 0 <= self._y < MAP_SIZE[1] // 2:
+        xmid, ymid = self._map_size[0] // 2, self._map_size[1] // 2
+        if 0 <= self._x < xmid and 0 <= self._y < ymid:
             return 0  # top-left
-        elif 0 <= self._x < MAP_SIZE[0] // 2 and MAP_SIZE[1] // 2 < self._y:
+        elif 0 <= self._x < xmid and ymid < self._y:
             return 1  # bottom-left
-        elif MAP_SIZE[0] // 2 < self._x and 0 <= self._y < MAP_SIZE[1] // 2:
+        elif xmid < self._x and 0 <= self._y < ymid:
             return 2  # top-right
-        elif MAP_SIZE[0] // 2 < self._x and MAP_SIZE[1] // 2 < self._y:
+        elif xmid < self._x and ymid < self._y:
             return 3  # bottom-right
         else:
             return None
@@ -74,22 +102,15 @@ class Robot:
         return self._vy
 
 
-def list_robots(lines: list[str]) -> list[Robot]:
-    """Parse the input in a list of robots."""
-    robots = []
-    for line in lines:
-        x, y = map(int, line[0].split("=")[1].split(","))
-        vx, vy = map(int, line[1].split("=")[1].split(","))
-        robots.append(Robot(x, y, vx, vy))
-    return robots
+def list_robots(data: NDArray[np.int64], map_size: tuple[int, int]) -> list[Robot]:
+    """Create the list of robots from their positions and velocities."""
+    return [Robot(x, y, vx, vy, map_size) for x, y, vx, vy in data.tolist()]
 
 
 def move_robots(robots: list[Robot], n: int) -> None:
     """Move the robots during n seconds."""
-    for k, robot in enumerate(robots):
-        print(f"Moving robot {k + 1} / {len(robots)}.")
-        for _ in range(n):
-            robot.move()
+    for robot in track(robots, "Moving robots"):
+        robot.move(n)
 
 
 def compute_safety_factor(robots: list[Robot]) -> int:
@@ -102,28 +123,30 @@ def compute_safety_factor(robots: list[Robot]) -> int:
     return quadrants[0] * quadrants[1] * quadrants[2] * quadrants[3]
 
 
-robots = list_robots(lines)
-move_robots(robots, 100)
-safety_factor = compute_safety_factor(robots)
-print(f"The safety factor is {safety_factor}.")
+def part1(data: tuple[NDArray[np.int64], tuple[int, int]]) -> int:
+    """Solve part 1."""
+    robots = list_robots(*data)
+    move_robots(robots, 100)
+    return compute_safety_factor(robots)
 
 
 # %% part 2
-def plot_map(robots: list[Robot], t_start: int = 0) -> None:
+def plot_map(robots: list[Robot], map_size: tuple[int, int], t_start: int = 0) -> None:
     """Plot an interactive map of the robot positions."""
+    from matplotlib import pyplot as plt
+
     if plt.get_backend() != "QtAgg":
         plt.switch_backend("QtAgg")
     if not plt.isinteractive():
         plt.ion()
     fig, ax = plt.subplots(1, 1, figsize=(10, 10))
-    ax.set_xlim(0, MAP_SIZE[0])
-    ax.set_ylim(0, MAP_SIZE[1])
+    ax.set_xlim(0, map_size[0])
+    ax.set_ylim(0, map_size[1])
     ax.set_aspect("equal")
     ax.set_title("Press Space to step forward 1 second")
 
-    for _ in range(t_start):
-        for r in robots:
-            r.move()
+    for r in robots:
+        r.move(t_start)
 
     scatter = ax.scatter([r.x for r in robots], [r.y for r in robots], c="r", s=10)
     time_step = t_start
@@ -172,8 +195,14 @@ def find_xmas_tree(robots: list[Robot], n_iter: int) -> int:
     return pos
 
 
-robots = list_robots(lines)
-pos = find_xmas_tree(robots, 10000)
-robots = list_robots(lines)
-print(f"The timestamp forming a X-mas tree is {pos}.")
-plot_map(robots, pos)
+def part2(data: tuple[NDArray[np.int64], tuple[int, int]]) -> int:
+    """Solve part 2."""
+    return find_xmas_tree(list_robots(*data), 10000)
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The safety factor is {part1(data)}.")
+    pos = part2(data)
+    print(f"The timestamp forming a X-mas tree is {pos}.")
+    plot_map(list_robots(*data), data[1], pos)
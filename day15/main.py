@@ -4,74 +4,99 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
-from matplotlib import pyplot as plt
+
+from aoc.grid import Grid
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    text: list[str] = fid.read().split("\n")
-split_idx: int = text.index("")
-char_to_num: dict[str, int] = {".": 0, "#": 1, "O": 2, "@": 3}
-data: list[int] = [[char_to_num[char] for char in line] for line in text[:split_idx]]
-data: NDArray[np.int8] = np.array(data, dtype=np.int8)
-instructions: list[str] = [elt for elt in text[split_idx + 1 :] if len(elt) != 0]
-instructions: str = "".join(instructions)
-# extract the robot position
-x, y = np.where(data == 3)
-x, y = x[0], y[0]
-data[x, y] = 0
+_WALL: int = ord("#")
+_BOX: int = ord("O")
+_EMPTY: int = ord(".")
 
 
-# %% part 1
-_DIRECTIONS: dict[str, NDArray[np.int8]] = {
-    ">": np.array([0, 1], dtype=np.int8),
-    "<": np.array([0, -1], dtype=np.int8),
-    "^": np.array([-1, 0], dtype=np.int8),
-    "v": np.array([1, 0], dtype=np.int8),
-}
+def parse(fname: Path) -> tuple[Grid, int, str]:
+    """Parse the warehouse map, the robot position and the list of instructions.
+
+    The position of the robot is its flat index in the grid.
+    """
+    buffer = Path(fname).read_bytes().replace(b"\r\n", b"\n")
+    split_idx = buffer.index(b"\n\n")
+    # the map is surrounded by walls, pad it with walls as well to keep the robot in
+    grid = Grid.from_bytes(buffer[:split_idx], pad=1, fill=_WALL)
+    instructions: str = buffer[split_idx + 2 :].decode().replace("\n", "")
+    # extract the robot position
+    robot = grid.find("@")
+    if robot.size != 1:
+        raise ValueError("The warehouse must contain exactly one robot.")
+    index = int(robot[0])
+    grid.flat[index] = _EMPTY
+    return grid, index, instructions
+
+
+def to_arrays(data: tuple[Grid, int, str]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    grid, index, instructions = data
+    return grid.to_arrays() | {
+        "robot": np.array([index], dtype=np.int64),
+        "instructions": np.frombuffer(instructions.encode(), dtype=np.uint8),
+    }
 
 
+def from_arrays(arrays: dict[str, NDArray]) -> tuple[Grid, int, str]:
+    """Convert the named arrays to the parsed input."""
+    return (
+        Grid.from_arrays(arrays),
+        int(arrays["robot"][0]),
+        arrays["instructions"].tobytes().decode(),
+    )
+
+
+# %% part 1
 class AutomaticWarehouseSystem:
     """An object representing the warehouse and the robot."""
 
-    def __init__(self, warehouse: NDArray[np.int8], robot_x: int, robot_y: int) -> None:
-        self._map = warehouse
-        self._robot = np.array([robot_x, robot_y], dtype=np.int8)
+    def __init__(self, warehouse: Grid, robot: int) -> None:
+        self._grid = warehouse
+        self._map = warehouse.flat
+        self._robot = robot
+        up, right, down, left = warehouse.offsets4.tolist()
+        self._directions = {">": right, "<": left, "^": up, "v": down}
 
     def move(self, direction: str) -> None:
         """Attempt to move the robot in the direction."""
-        direction = _DIRECTIONS[direction]
+        direction = self._directions[direction]
         new_pos = self._robot + direction
-        if self._map[*new_pos] == 0:
+        if self._map[new_pos] == _EMPTY:
             self._robot = new_pos
             return
-        elif self._map[*new_pos] == 1:
+        elif self._map[new_pos] == _WALL:
             return
-        elif self._map[*new_pos] == 2:
-            temp_pos = new_pos.copy()
+        elif self._map[new_pos] == _BOX:
+            temp_pos = new_pos
             while True:
                 temp_pos += direction
-                if self._map[*temp_pos] == 2:
+                if self._map[temp_pos] == _BOX:
                     continue
-                elif self._map[*temp_pos] == 0:
-                    self._map[*temp_pos], self._map[*new_pos] = (
-                        self._map[*new_pos],
-                        self._map[*temp_pos],
+                elif self._map[temp_pos] == _EMPTY:
+                    self._map[temp_pos], self._map[new_pos] = (
+                        self._map[new_pos],
+                        self._map[temp_pos],
                     )
                     self._robot = new_pos
                     break
-                elif self._map[*temp_pos] == 1:
+                elif self._map[temp_pos] == _WALL:
                     break
         else:
             raise RuntimeError("Invalid map position/value.")
 
     def plot(self) -> None:
         """Plot the warehouse map."""
+        from matplotlib import pyplot as plt
+
         f, ax = plt.subplots(1, 1, layout="constrained")
-        ax.imshow(self._map, cmap="viridis")
-        ax.scatter(*self._robot, color="red")
+        ax.imshow(self._grid.values, cmap="viridis")
+        ax.scatter(*self._grid.coords(self._robot), color="red")
         ax.set_xticks([])
         ax.set_yticks([])
         plt.show()
@@ -85,13 +110,19 @@ def simulate(warehouse: AutomaticWarehouseSystem, instructions: str) -> None:
 
 def sum_gps_coordinates(warehouse: AutomaticWarehouseSystem) -> int:
     """Sum the gps coordinates of box in the warehouse."""
-    pos = np.where(warehouse._map == 2)
-    return np.sum(100 * pos[0] + pos[1])
+    x, y = warehouse._grid.coords(warehouse._grid.find("O"))
+    return np.sum(100 * x + y)
+
 
+def part1(data: tuple[Grid, int, str]) -> int:
+    """Solve part 1."""
+    warehouse, robot, instructions = data
+    # the robot pushes the boxes around, thus work on a copy of the warehouse.
+    warehouse = AutomaticWarehouseSystem(warehouse.copy(), robot)
+    simulate(warehouse, instructions)
+    return int(sum_gps_coordinates(warehouse))
 
-warehouse = AutomaticWarehouseSystem(data, x, y)
-simulate(warehouse, instructions)
-total = sum_gps_coordinates(warehouse)
-print(f"The sum of the box GPS coordinates is {total}.")
 
-# %% part 2
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The sum of the box GPS coordinates is {part1(data)}.")
@@ -1,85 +1,275 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-reports: list[list[int]] = []
-size: int = 0
-with open(fname) as fid:
-    for line in fid:
-        line = line.strip().split(" ")
-        report = [int(elt) for elt in line]
-        reports.append(report)
-        size = max(size, len(report))
+_NEWLINE: int = ord("\n")
+_WHITESPACES: NDArray[np.uint8] = np.frombuffer(b" \t\r\n", dtype=np.uint8)
+_MIN_STEP: int = 1
+_MAX_STEP: int = 3
+
+
+def parse(fname: Path) -> tuple[NDArray[np.int32], NDArray[np.int64]]:
+    """Parse the reports into a ragged array.
+
+    The reports have different lengths and are stored as the concatenation of their
+    levels and the offset of each report in the concatenation, with a trailing offset
+    equal to the total number of levels.
+    """
+    raw = Path(fname).read_bytes()
+    levels = np.fromstring(raw, dtype=np.int32, sep=" ")
+    # count the levels of each line from the first byte of each whitespace-separated
+    # token, skipping the empty lines
+    buffer = np.frombuffer(raw, dtype=np.uint8)
+    blank = np.isin(buffer, _WHITESPACES)
+    first = ~blank & np.concatenate(([True], blank[:-1]))
+    lengths = np.bincount(np.cumsum(buffer == _NEWLINE)[first])
+    lengths = lengths[lengths != 0]
+    if levels.size != lengths.sum():
+        raise ValueError(f"The reports in '{fname}' must only contain integers.")
+    offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+    return levels, offsets
+
+
+def to_arrays(data: tuple[NDArray[np.int32], NDArray[np.int64]]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return {"levels": data[0], "offsets": data[1]}
+
+
+def from_arrays(
+    arrays: dict[str, NDArray],
+) -> tuple[NDArray[np.int32], NDArray[np.int64]]:
+    """Convert the named arrays to the parsed input."""
+    return arrays["levels"], arrays["offsets"]
 
-# array of shape (1000, 8)
-data: NDArray[np.float16] = np.full((len(reports), size), np.nan, dtype=np.float16)
-for i, report in enumerate(reports):
-    data[i, : len(report)] = report
+
+def _bad_steps(
+    levels: NDArray[np.int32], offsets: NDArray[np.int64]
+) -> list[NDArray[np.int64]]:
+    """Count the bad steps cumulatively, for increasing and for decreasing reports.
+
+    A step between 2 consecutive levels of a report is good if the level changes by 1
+    to 3 in the direction of the report. The steps between 2 reports are not counted.
+    The number of bad steps between the levels i and j > i is ``counts[j] - counts[i]``.
+    """
+    steps = np.diff(levels)
+    boundary = np.zeros(steps.size, dtype=bool)
+    boundary[offsets[1:-1] - 1] = True  # step from the last level to the next report
+    counts = []
+    for direction in (1, -1):
+        good = (_MIN_STEP <= direction * steps) & (direction * steps <= _MAX_STEP)
+        counts.append(np.concatenate(([0], np.cumsum(~good & ~boundary))))
+    return counts
 
 
 # %% part 1
-def get_safe_reports(data: NDArray[np.float16]) -> int:
+def get_safe_reports(data: tuple[NDArray[np.int32], NDArray[np.int64]]) -> int:
     """Get the number of safe reports.
 
     A report is safe if all elements are either increasing or decreasing by 1-3.
     """
-    safe = 0
-    diff = np.diff(data, axis=1)
-    for elt in diff:  # array of shape (n_levels - 1,) containing nans
-        elt = elt[~np.isnan(elt)]
-        # first check monotonicity, excluding 0 (same number) and then check the step
-        if (np.all(0 < elt) or np.all(elt < 0)) and not np.any(3 < np.abs(elt)):
-            safe += 1
-    return safe
+    levels, offsets = data
+    if levels.size == 0:
+        return 0
+    starts, stops = offsets[:-1], offsets[1:] - 1  # first and last level
+    safe = np.zeros(starts.size, dtype=bool)
+    for counts in _bad_steps(levels, offsets):
+        safe |= counts[stops] == counts[starts]
+    return int(np.count_nonzero(safe))
 
 
-total = get_safe_reports(data)
-print(f"The number of safe reports is {total}.")
+def part1(data: tuple[NDArray[np.int32], NDArray[np.int64]]) -> int:
+    """Solve part 1."""
+    return get_safe_reports(data)
 
 
 # %% part 2
-def get_safe_reports_with_dampener(data: NDArray[np.float16]) -> int:
+def get_safe_reports_with_dampener(
+    data: tuple[NDArray[np.int32], NDArray[np.int64]],
+) -> int:
     """Get the number of safe reports with a problem dampener.
 
     The same rules applies, but now if removing one level from the reports makes it safe
     then the report is considered safe.
+
+    Removing the level j of a report yields a safe report if the steps before the level
+    j - 1 and after the level j + 1 are good, and if the step from the level j - 1 to
+    the level j + 1 is good, which is checked for every level of every report at once.
     """
-    safe = 0
-    for report in data:
-        if _is_safe_with_dampener(report):
-            safe += 1
-    return safe
-
-
-def _is_safe(report: NDArray[np.float16]) -> bool:
-    """Check if a report is safe."""
-    diff = np.diff(report[~np.isnan(report)])
-    if not (np.all(diff > 0) or np.all(diff < 0)):  # check monotonicity
-        return False
-    if np.any(3 < np.abs(diff)):
-        return False
-    return True
-
-
-def _is_safe_with_dampener(report: NDArray[np.foat16]) -> bool:
-    """Check if a report is safe with the problem dampener."""
-    if _is_safe(report):
-        return True
-    # let's try to remove one level
-    report = report[~np.isnan(report)]
-    for k in range(len(report)):
-        new_report = np.delete(report, k)
-        if _is_safe(new_report):
-            return True
-    return False
-
-
-total = get_safe_reports_with_dampener(data)
-print(f"The number of safe reports is {total}.")
+    levels, offsets = data
+    if levels.size == 0:
+        return 0
+    lengths = np.diff(offsets)
+    report = np.repeat(np.arange(lengths.size), lengths)  # report of each level
+    start = offsets[:-1][report]  # first level of the report of each level
+    stop = offsets[1:][report] - 1  # last level of the report of each level
+    idx = np.arange(levels.size)
+    before, after = np.maximum(idx - 1, start), np.minimum(idx + 1, stop)
+    inner = (start < idx) & (idx < stop)
+    bridge = np.zeros(levels.size, dtype=np.int64)
+    # step from the level before to the level after the removed one
+    bridge[inner] = levels[after[inner]].astype(np.int64) - levels[before[inner]]
+    safe = np.zeros(lengths.size, dtype=bool)
+    for direction, counts in zip((1, -1), _bad_steps(levels, offsets), strict=True):
+        good = (_MIN_STEP <= direction * bridge) & (direction * bridge <= _MAX_STEP)
+        removable = (
+            (counts[before] == counts[start])
+            & (counts[stop] == counts[after])
+            & (good | ~inner)
+        )
+        safe |= np.bincount(report, weights=removable, minlength=lengths.size) != 0
+    return int(np.count_nonzero(safe))
+
+
+def part2(data: tuple[NDArray[np.int32], NDArray[np.int64]]) -> int:
+    """Solve part 2."""
+    return get_safe_reports_with_dampener(data)
+
+
+# %% streaming
+def validate(levels: Iterable[int]) -> tuple[bool, bool]:
+    """Check if a report is safe, without and with the problem dampener, in one pass.
+
+    For each direction, the pass tracks the last level of the report kept whole and the
+    last levels of the report with one level removed. The latter are at most 2, the
+    previous level if the current one is removed and the current level, thus the state
+    does not grow with the length of the report.
+
+    Parameters
+    ----------
+    levels : iterable of int
+        The levels of the report, consumed once and only until the report is unsafe in
+        both directions.
+
+    Returns
+    -------
+    safe : bool
+        True if the report is safe.
+    safe_with_dampener : bool
+        True if the report is safe once at most one level is removed.
+    """
+    iterator = iter(levels)
+    first = next(iterator, None)
+    if first is None:
+        return True, True
+    # per direction: the direction, the last level kept, or None once unsafe, and the
+    # last levels with one level removed, None standing for the removal of the first
+    states = [(1, first, (None,)), (-1, first, (None,))]
+    for level in iterator:
+        alive = []
+        for direction, last, removed in states:
+            extended = False
+            for prev in removed:
+                if prev is None or _MIN_STEP <= direction * (level - prev) <= _MAX_STEP:
+                    extended = True
+                    break
+            if last is not None:
+                removed = (last, level) if extended else (last,)
+                step = direction * (level - last)
+                last = level if _MIN_STEP <= step <= _MAX_STEP else None
+            elif extended:
+                removed = (level,)
+            else:
+                continue  # unsafe in this direction, even with the dampener
+            alive.append((direction, last, removed))
+        states = alive
+        if len(states) == 0:
+            return False, False
+    return any(last is not None for _, last, _ in states), True
+
+
+def count_safe_reports(
+    fname: Path, start: int = 0, stop: int | None = None
+) -> tuple[int, int]:
+    """Count the safe reports of a file, streamed line by line.
+
+    Parameters
+    ----------
+    fname : Path
+        The input file.
+    start : int
+        The offset, in bytes, from which the reports are counted. The report on which
+        the offset falls is counted with the previous chunk, unless the offset is at
+        the start of a line.
+    stop : int | None
+        The offset, in bytes, at which the count stops, after the report on which it
+        falls. If None, the end of the file.
+
+    Returns
+    -------
+    safe : int
+        The number of safe reports, see :func:`part1`.
+    safe_with_dampener : int
+        The number of safe reports with the problem dampener, see :func:`part2`.
+    """
+    safe = safe_with_dampener = 0
+    with open(fname, "rb") as fid:
+        if start != 0:
+            fid.seek(start - 1)
+            fid.readline()  # skip to the first line starting within the chunk
+        while stop is None or fid.tell() < stop:
+            line = fid.readline()
+            if len(line) == 0:
+                break
+            if len(line.strip()) == 0:
+                continue
+            result = validate(map(int, line.split()))
+            safe += result[0]
+            safe_with_dampener += result[1]
+    return safe, safe_with_dampener
+
+
+def count_safe_reports_parallel(
+    fname: Path, chunk_size: int = 64 << 20, n_jobs: int | None = None
+) -> tuple[int, int]:
+    """Count the safe reports of a large file, in chunks solved in parallel.
+
+    Parameters
+    ----------
+    fname : Path
+        The input file.
+    chunk_size : int
+        The size of the chunks, in bytes.
+    n_jobs : int | None
+        The number of worker processes. If None, one worker per CPU is used. If 1, the
+        chunks are counted sequentially in the current process.
+
+    Returns
+    -------
+    safe : int
+        The number of safe reports, see :func:`part1`.
+    safe_with_dampener : int
+        The number of safe reports with the problem dampener, see :func:`part2`.
+    """
+    size = os.path.getsize(fname)
+    bounds = list(range(0, size, chunk_size)) + [size]
+    chunks = list(zip(bounds[:-1], bounds[1:], strict=True))
+    n_jobs = min(os.cpu_count() if n_jobs is None else n_jobs, len(chunks))
+    if n_jobs <= 1:
+        counts = [count_safe_reports(fname, start, stop) for start, stop in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(count_safe_reports, fname, start, stop)
+                for start, stop in chunks
+            ]
+            counts = [future.result() for future in futures]
+    return (
+        sum(count[0] for count in counts),
+        sum(count[1] for count in counts),
+    )
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The number of safe reports is {part1(data)}.")
+    print(f"The number of safe reports is {part2(data)}.")
@@ -1,44 +1,259 @@
 from __future__ import annotations
 
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import reduce
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: str = fid.read()
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+_INSTRUCTIONS: re.Pattern[bytes] = re.compile(
+    rb"mul\((\d{1,3}),(\d{1,3})\)|(do\(\))|(don't\(\))"
+)
+# an instruction starting in a chunk ends at most this many bytes after the chunk
+_OVERLAP: int = len(b"mul(123,123)") - 1
+# opcodes of the instructions
+MUL: int = 0
+DO: int = 1
+DONT: int = 2
+
+
+def parse(fname: Path) -> dict[str, NDArray]:
+    """Tokenize the instructions of the corrupted memory, see :func:`tokenize`."""
+    return tokenize(Path(fname).read_bytes())
+
+
+def to_arrays(data: dict[str, NDArray]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return data
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> dict[str, NDArray]:
+    """Convert the named arrays to the parsed input."""
+    return {name: arrays[name] for name in ("opcode", "a", "b", "offset")}
+
+
+def tokenize(
+    buffer: bytes | mmap.mmap, start: int = 0, stop: int | None = None
+) -> dict[str, NDArray]:
+    """Tokenize the instructions of the corrupted memory in one pass.
+
+    Parameters
+    ----------
+    buffer : bytes | mmap
+        The corrupted memory.
+    start : int
+        The offset, in bytes, from which instructions are tokenized.
+    stop : int | None
+        The offset, in bytes, before which the tokenized instructions start. The last
+        one may end after it. If None, the end of the buffer.
+
+    Returns
+    -------
+    tokens : dict of str to array
+        The instructions, in order, as the arrays:
+
+        - ``"opcode"``: the instruction, :data:`MUL`, :data:`DO` or :data:`DONT`.
+        - ``"a"`` and ``"b"``: the operands of the multiplications, 0 otherwise.
+        - ``"offset"``: the offset of the instruction in the buffer, in bytes.
+    """
+    stop = len(buffer) if stop is None else stop
+    end = min(stop + _OVERLAP, len(buffer))
+    opcodes, operands, offsets = [], [], []
+    for match in _INSTRUCTIONS.finditer(buffer, start, end):
+        if stop <= match.start():
+            break
+        a, b, do, _ = match.groups()
+        if a is not None:
+            opcodes.append(MUL)
+            operands.extend((int(a), int(b)))
+        else:
+            opcodes.append(DO if do is not None else DONT)
+            operands.extend((0, 0))
+        offsets.append(match.start())
+    operands = np.array(operands, dtype=np.int32).reshape(-1, 2)
+    return {
+        "opcode": np.array(opcodes, dtype=np.uint8),
+        "a": operands[:, 0].copy(),
+        "b": operands[:, 1].copy(),
+        "offset": np.array(offsets, dtype=np.int64),
+    }
 
 
 # %% part 1
-def get_multiplication_result(data: str) -> int:
+def get_multiplication_result(data: dict[str, NDArray]) -> int:
     """Get the multiplication value after parsing the corrupted memory."""
-    pattern = re.compile(r"mul\(\d{1,3},\d{1,3}\)")
-    total = 0
-    for elt in re.findall(pattern, data):
-        a, b = map(int, re.findall(r"\d+", elt))
-        total += a * b
-    return total
+    products = data["a"].astype(np.int64) * data["b"]
+    return int(np.sum(products, where=data["opcode"] == MUL))
 
 
-total = get_multiplication_result(data)
-print(f"The total multiplication result is {total}.")
+def part1(data: dict[str, NDArray]) -> int:
+    """Solve part 1."""
+    return get_multiplication_result(data)
 
 
 # %% part 2
-def get_multiplication_result_with_conditionals(data: str) -> int:
+def get_enabled(opcodes: NDArray[np.uint8], enabled: bool = True) -> NDArray[np.bool_]:
+    """Get the state of each instruction, set by the last ``do()`` or ``don't()``.
+
+    Parameters
+    ----------
+    opcodes : array of shape (n_instructions,)
+        The instructions.
+    enabled : bool
+        The state before the first instruction.
+
+    Returns
+    -------
+    enabled : array of shape (n_instructions,)
+        True if the instruction is enabled.
+    """
+    idx = np.arange(opcodes.size)
+    last = np.maximum.accumulate(np.where(opcodes != MUL, idx, -1))
+    return np.where(last == -1, enabled, opcodes[last] == DO)
+
+
+def get_multiplication_result_with_conditionals(data: dict[str, NDArray]) -> int:
     """Get the multiplication value after parsing the corrupted memory."""
-    pattern = re.compile(r"(mul\(\d{1,3},\d{1,3}\))|(do\(\))|(don't\(\))")
-    total = 0
-    enabled = True
-    for elt in re.findall(pattern, data):
-        if enabled and elt[0]:
-            a, b = map(int, re.findall(r"\d+", elt[0]))
-            total += a * b
-        elif enabled and elt[2]:
-            enabled = False
-        elif not enabled and elt[1]:
-            enabled = True
-    return total
-
-
-total = get_multiplication_result_with_conditionals(data)
-print(f"The total multiplication result is {total}.")
+    products = data["a"].astype(np.int64) * data["b"]
+    enabled = get_enabled(data["opcode"]) & (data["opcode"] == MUL)
+    return int(np.sum(products, where=enabled))
+
+
+def part2(data: dict[str, NDArray]) -> int:
+    """Solve part 2."""
+    return get_multiplication_result_with_conditionals(data)
+
+
+# %% parallel scan
+@dataclass(frozen=True)
+class ScanSummary:
+    """Summary of the instructions of a chunk of the corrupted memory.
+
+    The summaries of consecutive chunks compose with ``+``, in order, such that the
+    summary of a file is the sum of the summaries of its chunks.
+
+    Parameters
+    ----------
+    total : int
+        The sum of all the multiplications, see :func:`part1`.
+    head : int
+        The sum of the multiplications before the first ``do()`` or ``don't()``, enabled
+        depending on the state at the start of the chunk.
+    tail : int
+        The sum of the enabled multiplications from the first ``do()`` or ``don't()``.
+    enabled : bool | None
+        The state at the end of the chunk, or None if the chunk has no ``do()`` or
+        ``don't()`` and keeps the state at its start.
+    """
+
+    total: int = 0
+    head: int = 0
+    tail: int = 0
+    enabled: bool | None = None
+
+    def __add__(self, other: ScanSummary) -> ScanSummary:
+        """Compose with the summary of the next chunk."""
+        if self.enabled is None:
+            head, tail = self.head + other.head, other.tail
+        else:
+            head, tail = self.head, self.tail + other.head * self.enabled + other.tail
+        enabled = self.enabled if other.enabled is None else other.enabled
+        return ScanSummary(self.total + other.total, head, tail, enabled)
+
+    @property
+    def result(self) -> int:
+        """Sum of the enabled multiplications, starting in the enabled state."""
+        return self.head + self.tail
+
+
+def scan_chunk(fname: Path, start: int, stop: int) -> ScanSummary:
+    """Summarize the instructions starting within a byte range of a file.
+
+    Parameters
+    ----------
+    fname : Path
+        The file with the corrupted memory, memory-mapped.
+    start : int
+        The offset, in bytes, of the first byte of the chunk.
+    stop : int
+        The offset, in bytes, after the last byte of the chunk. The instruction starting
+        before and ending after it is counted within this chunk.
+
+    Returns
+    -------
+    summary : ScanSummary
+        The summary of the chunk.
+    """
+    with (
+        open(fname, "rb") as fid,
+        mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        tokens = tokenize(buffer, start, stop)
+    products = tokens["a"].astype(np.int64) * tokens["b"]
+    multiplication = tokens["opcode"] == MUL
+    # the multiplications before the first do() or don't() depend on the previous chunk
+    conditional = np.flatnonzero(~multiplication)
+    first = conditional[0] if conditional.size != 0 else products.size
+    enabled = get_enabled(tokens["opcode"]) & multiplication
+    state = None if conditional.size == 0 else tokens["opcode"][conditional[-1]] == DO
+    return ScanSummary(
+        int(np.sum(products, where=multiplication)),
+        int(np.sum(products[:first], where=multiplication[:first])),
+        int(np.sum(products[first:], where=enabled[first:])),
+        None if state is None else bool(state),
+    )
+
+
+def scan(
+    fname: Path, chunk_size: int = 64 << 20, n_jobs: int | None = None
+) -> tuple[int, int]:
+    """Solve both parts on a large file, in chunks scanned in parallel.
+
+    Parameters
+    ----------
+    fname : Path
+        The file with the corrupted memory.
+    chunk_size : int
+        The size of the chunks, in bytes.
+    n_jobs : int | None
+        The number of worker processes. If None, one worker per CPU is used. If 1, the
+        chunks are scanned sequentially in the current process.
+
+    Returns
+    -------
+    result : int
+        The sum of all the multiplications, see :func:`part1`.
+    result_with_conditionals : int
+        The sum of the enabled multiplications, see :func:`part2`.
+    """
+    size = os.path.getsize(fname)
+    if size == 0:
+        return 0, 0
+    bounds = list(range(0, size, chunk_size)) + [size]
+    chunks = list(zip(bounds[:-1], bounds[1:], strict=True))
+    n_jobs = min(os.cpu_count() if n_jobs is None else n_jobs, len(chunks))
+    if n_jobs <= 1:
+        summaries = [scan_chunk(fname, start, stop) for start, stop in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(scan_chunk, fname, start, stop)
+                for start, stop in chunks
+            ]
+            summaries = [future.result() for future in futures]
+    summary = reduce(ScanSummary.__add__, summaries)
+    return summary.total, summary.result
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The total multiplication result is {part1(data)}.")
+    print(f"The total multiplication result is {part2(data)}.")
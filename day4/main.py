@@ -1,106 +1,444 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 
+from aoc.grid import Grid
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from typing import Any
+
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: list[str] = fid.readlines()
-# array of shape (140, 140)
-data = np.array([list(elt.strip()) for elt in data])
+
+def parse(fname: Path) -> Grid:
+    """Parse the input file into a grid of letters.
+
+    The grid is not padded, the searches read its values within explicit bounds.
+    """
+    return Grid.from_file(fname, pad=0)  # grid of shape (140, 140), without padding
+
+
+def to_arrays(data: Grid) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return data.to_arrays()
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> Grid:
+    """Convert the named arrays to the parsed input."""
+    return Grid.from_arrays(arrays)
+
 
 # %% part 1
-# fmt: off
-_DIRECTIONS: list[tuple[int, int]] = [
-    (0, 1),   # right
-    (0, -1),  # left
-    (1, 0),   # down
-    (-1, 0),  # up
-    (1, 1),   # down-right
-    (1, -1),  # down-left
-    (-1, 1),  # up-right
-    (-1, -1), # up-left
-]
-_WORD: str = "XMAS"
-# fmt: on
-
-
-def get_number_of_word(data: NDArray) -> int:
-    """Get the number of times the word appears in the data."""
-    total = 0
-    for i in range(data.shape[0]):
-        for j in range(data.shape[1]):
-            if data[i, j] == _WORD[0]:
-                total += _count_around_first_letter(data, i, j)
-    return total
+_WORD: bytes = b"XMAS"
+# directions (row step, column step) in which a word is read from its top-most letter,
+# the words read in the 4 other directions are the reversed words read in those
+_DIRECTIONS: tuple[tuple[int, int], ...] = ((0, 1), (1, -1), (1, 0), (1, 1))
+_BLOCK_SIZE: int = 1 << 22  # number of cells searched at once
+_MAX_TABLE_BITS: int = 20  # packed codes looked up in a table up to this many bits
 
 
-def _count_around_first_letter(data: NDArray, i: int, j: int) -> int:
-    """Count the number of patterns at that X location."""
-    count = 0
-    for offset in _DIRECTIONS:
-        if not 0 <= i + (len(_WORD) - 1) * offset[0] < data.shape[0]:
-            continue
-        if not 0 <= j + (len(_WORD) - 1) * offset[1] < data.shape[1]:
-            continue
-        for k, letter in enumerate(_WORD):
-            if k == 0:
-                continue  # skip the first letter which is already tested
-            if data[i + k * offset[0], j + k * offset[1]] != letter:
-                break
-        else:
-            count += 1
-    return count
+@dataclass(frozen=True)
+class _Patterns:
+    """The words and reversed words to search, packed in integers.
+
+    Parameters
+    ----------
+    patterns : list of bytes
+        The words and the reversed words, read from their top-most letter, grouped by
+        length.
+    lut : array of shape (256,)
+        The code of each letter, 0 for the letters absent from the words.
+    bits : int
+        The number of bits per letter.
+    max_letters : int
+        The number of letters packed in an integer, the following ones are checked
+        letter by letter.
+    groups : list of tuple
+        For each length, the length, the index of its first pattern, the sorted unique
+        packed prefixes, the index of the prefix of each pattern, and the table mapping
+        a packed code to 1 + its index among the prefixes, or to 0, if it is small
+        enough.
+    """
 
+    patterns: list[bytes]
+    lut: NDArray[np.unsignedinteger]
+    bits: int
+    max_letters: int
+    groups: list[tuple[int, int, NDArray, NDArray[np.intp], NDArray[np.intp] | None]]
+
+    @classmethod
+    def compile(cls, words: Iterable[bytes]) -> _Patterns:
+        """Pack the words and reversed words."""
+        words = list(words)
+        if any(len(word) == 0 for word in words):
+            raise ValueError("The words to search can not be empty.")
+        letters = sorted({letter for word in words for letter in word})
+        bits = len(letters).bit_length()
+        max_letters = 64 // bits
+        packed_bits = bits * min(max(len(word) for word in words), max_letters)
+        dtype = next(
+            dtype
+            for dtype in (np.uint16, np.uint32, np.uint64)
+            if packed_bits <= np.iinfo(dtype).bits
+        )
+        lut = np.zeros(256, dtype=dtype)  # the letters of no word are encoded as 0
+        lut[letters] = np.arange(1, len(letters) + 1)
+        patterns = sorted(
+            {elt for word in words for elt in (word, word[::-1])},
+            key=lambda pattern: (len(pattern), pattern),
+        )
+        groups = []
+        for length in sorted({len(pattern) for pattern in patterns}):
+            first = next(k for k, elt in enumerate(patterns) if len(elt) == length)
+            group = [elt for elt in patterns if len(elt) == length]
+            prefixes = [
+                _pack(lut[list(pattern[:max_letters])].tolist(), bits)
+                for pattern in group
+            ]
+            # the long patterns may share their packed prefix
+            codes, inverse = np.unique(
+                np.array(prefixes, dtype=dtype), return_inverse=True
+            )
+            table = None
+            if bits * min(length, max_letters) <= _MAX_TABLE_BITS:
+                # 1 + the index of the prefix of each packed code, 0 if none
+                table = np.zeros(1 << (bits * min(length, max_letters)), dtype=np.int32)
+                table[codes] = np.arange(1, codes.size + 1)
+            groups.append((length, first, codes, inverse, table))
+        return cls(patterns, lut, bits, max_letters, groups)
+
+
+def count_words(
+    data: Grid, words: Sequence[str | bytes], block_size: int = _BLOCK_SIZE
+) -> dict[str | bytes, int]:
+    """Count the occurrences of words in the 8 directions of the grid.
+
+    The letters are encoded on as few bits as possible and the letters of the windows
+    starting at every cell in one direction are packed in an integer, built from the
+    shifted views of the encoded grid, which is then looked up among the packed words.
+    A word longer than an integer is matched on its packed prefix and then checked
+    letter by letter at the candidate cells.
+
+    Parameters
+    ----------
+    data : Grid
+        The grid of letters, which is not modified.
+    words : sequence of str | bytes
+        The words to search.
+    block_size : int
+        The approximate number of cells searched at once, which bounds the memory used.
+
+    Returns
+    -------
+    counts : dict
+        The number of occurrences of each word, in all directions. A palindrome is
+        counted once per direction in which it reads.
+    """
+    encoded = {word: word.encode() if isinstance(word, str) else word for word in words}
+    if len(encoded) == 0:
+        return {}
+    patterns = _Patterns.compile(encoded.values())
+    values = data.values
+    step = max(block_size // max(values.shape[1], 1), 1)
+    counts = np.zeros(len(patterns.patterns), dtype=np.int64)
+    for row0 in range(0, values.shape[0], step):
+        counts += _count_rows(values, patterns, row0, row0 + step)
+    return _merge_counts(encoded, patterns, counts)
+
+
+def _merge_counts(
+    encoded: dict[str | bytes, bytes], patterns: _Patterns, counts: NDArray[np.int64]
+) -> dict[str | bytes, int]:
+    """Sum the occurrences of each word and of its reverse."""
+    found = dict(zip(patterns.patterns, counts.tolist(), strict=True))
+    return {word: found[elt] + found[elt[::-1]] for word, elt in encoded.items()}
+
+
+def _count_rows(
+    values: NDArray[np.uint8], patterns: _Patterns, row0: int, row1: int
+) -> NDArray[np.int64]:
+    """Count the patterns whose first letter is on the rows [row0, row1) of the grid."""
+    n_rows, n_cols = values.shape
+    row1 = min(row1, n_rows)
+    # the rows of the block and the rows below it reached by the longest pattern
+    length = max(len(pattern) for pattern in patterns.patterns)
+    encoded = patterns.lut[values[row0 : row1 + length - 1]]
+    shift = encoded.dtype.type(patterns.bits)
+    counts = np.zeros(len(patterns.patterns), dtype=np.int64)
+    for length, first, codes, inverse, table in patterns.groups:
+        n_packed = min(length, patterns.max_letters)
+        for dr, dc in _DIRECTIONS:
+            # windows whose first letter is in [row0, stop) x [col0, col0 + cols)
+            stop = min(row1, n_rows - dr * (length - 1))
+            cols = n_cols - abs(dc) * (length - 1)
+            if stop <= row0 or cols <= 0:
+                continue
+            col0 = (length - 1) if dc < 0 else 0
+            views = [
+                encoded[
+                    k * dr : stop - row0 + k * dr, col0 + k * dc : col0 + k * dc + cols
+                ]
+                for k in range(length)
+            ]
+            window = views[0].copy()
+            for view in views[1:n_packed]:
+                window <<= shift
+                window |= view
+            if table is not None:
+                hits = table[window]
+                found = np.bincount(hits.ravel(), minlength=codes.size + 1)[1:]
+                match, idx = hits != 0, hits - 1
+            else:
+                idx = np.minimum(np.searchsorted(codes, window), codes.size - 1)
+                match = codes[idx] == window
+                found = np.bincount(idx[match], minlength=codes.size)
+            if length <= patterns.max_letters:
+                counts[first : first + inverse.size] += found[inverse]
+                continue
+            cand_rows, cand_cols = np.nonzero(match)
+            prefix = idx[cand_rows, cand_cols]
+            for k in range(inverse.size):
+                pattern = patterns.patterns[first + k]
+                sel = prefix == inverse[k]
+                candidates = np.ones(np.count_nonzero(sel), dtype=bool)
+                for j in range(n_packed, length):  # letters not packed
+                    letter = patterns.lut[pattern[j]]
+                    candidates &= views[j][cand_rows[sel], cand_cols[sel]] == letter
+                counts[first + k] += np.count_nonzero(candidates)
+    return counts
+
+
+def _pack(letters: Sequence[int], bits: int) -> int:
+    """Pack the encoded letters of a word in an integer."""
+    code = 0
+    for letter in letters:
+        code = (code << bits) | letter
+    return code
+
+
+def get_number_of_word(data: Grid) -> int:
+    """Get the number of times the word appears in the data."""
+    return count_words(data, [_WORD])[_WORD]
 
-total = get_number_of_word(data)
-print(f"The total number of XMAS is {total}.")
+
+def part1(data: Grid) -> int:
+    """Solve part 1."""
+    return get_number_of_word(data)
 
 
 # %% part 2
-_RING_ROWS = np.array([0, 0, 0, 1, 2, 2, 2, 1])
-_RINGS_COLS = np.array([0, 1, 2, 2, 2, 1, 0, 0])
+_X_MAS: tuple[str, ...] = ("M.S", ".A.", "M.S")
 
 
-def get_number_of_x_mas(data: NDArray) -> int:
-    """Get the number of X-mas, i.e. of MAS formning an X."""
+def pattern_variants(
+    pattern: Sequence[str],
+    rotations: bool = True,
+    reflections: bool = True,
+    wildcard: str = ".",
+) -> list[NDArray[np.uint8]]:
+    """Get the distinct variants of a 2D pattern.
+
+    Parameters
+    ----------
+    pattern : sequence of str
+        The rows of the pattern, of the same length.
+    rotations : bool
+        If True, the rotations by 90, 180 and 270 degrees are included.
+    reflections : bool
+        If True, the mirror images of the pattern and of its rotations are included.
+    wildcard : str
+        The character matching any letter, encoded as 0.
+
+    Returns
+    -------
+    variants : list of array of shape (n_rows, n_cols)
+        The distinct variants, starting with the pattern itself, with the ASCII code of
+        each cell.
+    """
+    if len(pattern) == 0 or len({len(row) for row in pattern}) != 1:
+        raise ValueError(
+            "The rows of the pattern must have the same, non-zero, length."
+        )
+    base = np.frombuffer("".join(pattern).encode(), dtype=np.uint8)
+    base = np.where(base == ord(wildcard), 0, base).reshape(len(pattern), -1)
+    candidates = [np.rot90(base, k) for k in range(4 if rotations else 1)]
+    if reflections:
+        candidates += [np.fliplr(elt) for elt in candidates]
+    variants: list[NDArray[np.uint8]] = []
+    for elt in candidates:
+        if not any(np.array_equal(elt, variant) for variant in variants):
+            variants.append(np.ascontiguousarray(elt))
+    return variants
+
+
+def match_pattern(
+    data: Grid, variants: Sequence[NDArray[np.uint8]], coords: bool = False
+) -> int | NDArray[np.intp]:
+    """Match the variants of a 2D pattern against the whole grid.
+
+    Each cell of a variant, but the wildcards, compares a shifted view of the grid to
+    its letter and the boolean masks are combined, thus the grid is only read, e.g. from
+    a read-only memory-map.
+
+    Parameters
+    ----------
+    data : Grid
+        The grid of letters, which is not modified.
+    variants : sequence of array
+        The variants of the pattern, see :func:`pattern_variants`.
+    coords : bool
+        If True, the coordinates of the matches are returned instead of their number.
+
+    Returns
+    -------
+    matches : int | array of shape (n_matches, 2)
+        The number of matches of all the variants, or the row and column of the
+        top-left corner of each match, in the order of the variants.
+    """
+    values = data.values
+    n_rows, n_cols = values.shape
     total = 0
-    for i in range(1, data.shape[0] - 1):
-        for j in range(1, data.shape[1] - 1):
-            if data[i, j] == "A":
-                total += _count_around_A(data[i - 1 : i + 2, j - 1 : j + 2])
+    matches = []
+    for variant in variants:
+        rows, cols = n_rows - variant.shape[0] + 1, n_cols - variant.shape[1] + 1
+        if rows <= 0 or cols <= 0:
+            continue
+        mask = np.ones((rows, cols), dtype=bool)
+        for (i, j), letter in np.ndenumerate(variant):
+            if letter != 0:
+                mask &= values[i : i + rows, j : j + cols] == letter
+        if coords:
+            matches.append(np.argwhere(mask))
+        else:
+            total += int(np.count_nonzero(mask))
+    if coords:
+        return (
+            np.concatenate(matches)
+            if len(matches) != 0
+            else np.empty((0, 2), dtype=np.intp)
+        )
     return total
 
 
-def _count_around_A(data: NDArray) -> int:
-    """Count the number of patterns at that A location."""
-    assert data.shape == (3, 3)  # sanity-check
-    count = 0
-    for _ in range(4):
-        ring_values = data[_RING_ROWS, _RINGS_COLS]
-        rotated_values = np.roll(ring_values, 2)
-        data[_RING_ROWS, _RINGS_COLS] = rotated_values
-        if _is_pattern(data):
-            count += 1
-    return count
-
-
-def _is_pattern(data: NDArray) -> bool:
-    """Check if the data is the pattern."""
-    if (
-        data[0, 0] == "M"
-        and data[-1, 0] == "M"
-        and data[0, -1] == "S"
-        and data[-1, -1] == "S"
-    ):
-        return True
-    return False
-
-
-total = get_number_of_x_mas(data)
-print(f"The total number of X-MAS is {total}.")
+def get_number_of_x_mas(data: Grid) -> int:
+    """Get the number of X-mas, i.e. of MAS formning an X."""
+    return match_pattern(data, pattern_variants(_X_MAS))
+
+
+def part2(data: Grid) -> int:
+    """Solve part 2."""
+    return get_number_of_x_mas(data)
+
+
+# %% parallel search
+_WORKER: dict[str, Any] = {}  # memory-mapped grid and patterns of a worker process
+
+
+def count_words_parallel(
+    fname: str | Path,
+    words: Sequence[str | bytes],
+    tile_rows: int | None = None,
+    n_jobs: int | None = None,
+) -> dict[str | bytes, int]:
+    """Count the occurrences of words in a grid file, in row tiles searched in parallel.
+
+    Each tile counts the words whose top-most letter is on its rows, reading the
+    ``len(word) - 1`` rows below it as a halo, thus a word crossing the edge of 2 tiles
+    is counted once. The workers memory-map the text file directly, viewed as a grid
+    skipping the line terminators as in :meth:`~aoc.grid.Grid.from_bytes`, thus the grid
+    is never loaded in the parent process.
+
+    Parameters
+    ----------
+    fname : str | Path
+        The text grid of letters, with one row per line. The rows must have the same
+        length.
+    words : sequence of str | bytes
+        The words to search.
+    tile_rows : int | None
+        The number of rows per tile. If None, the rows are split in 4 tiles per worker.
+    n_jobs : int | None
+        The number of worker processes. If None, one worker per CPU is used.
+
+    Returns
+    -------
+    counts : dict
+        The number of occurrences of each word, see :func:`count_words`.
+    """
+    encoded = {word: word.encode() if isinstance(word, str) else word for word in words}
+    if len(encoded) == 0:
+        return {}
+    patterns = _Patterns.compile(encoded.values())
+    layout = _text_layout(fname)
+    n_rows = layout[0]
+    n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+    if tile_rows is None:
+        tile_rows = max(-(-n_rows // (4 * n_jobs)), 1)
+    tiles = [(row, min(row + tile_rows, n_rows)) for row in range(0, n_rows, tile_rows)]
+    counts = np.zeros(len(patterns.patterns), dtype=np.int64)
+    if n_rows == 0:
+        return _merge_counts(encoded, patterns, counts)
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        initializer=_init_worker,
+        initargs=(str(fname), layout, patterns),
+    ) as executor:
+        futures = [executor.submit(_count_tile, *tile) for tile in tiles]
+        for future in futures:
+            counts += future.result()
+    return _merge_counts(encoded, patterns, counts)
+
+
+def _text_layout(fname: str | Path) -> tuple[int, int, int, int]:
+    """Get the number of rows and columns, the row stride and the line terminator size.
+
+    Only the first line is read, the line terminators of the other rows are checked by
+    the workers, see :func:`_count_tile`.
+    """
+    size = os.path.getsize(fname)
+    with open(fname, "rb") as fid:
+        line = fid.readline()
+    terminator = 2 if line.endswith(b"\r\n") else 1
+    n_cols = len(line.rstrip(b"\r\n"))
+    stride = n_cols + terminator
+    n_rows = -(-size // stride) if n_cols != 0 else 0  # the last terminator is optional
+    if n_rows != 0 and size not in (n_rows * stride, n_rows * stride - terminator):
+        raise ValueError("The rows of the grid must have the same length.")
+    return n_rows, n_cols, stride, terminator
+
+
+def _init_worker(
+    fname: str, layout: tuple[int, int, int, int], patterns: _Patterns
+) -> None:
+    """Memory-map the text grid and store the patterns once per worker."""
+    n_rows, n_cols, stride, _ = layout
+    raw = np.memmap(fname, dtype=np.uint8, mode="r")
+    _WORKER["raw"] = raw
+    _WORKER["layout"] = layout
+    # view of shape (n_rows, n_cols) skipping the line terminators, without copy
+    _WORKER["values"] = np.lib.stride_tricks.as_strided(
+        raw, shape=(n_rows, n_cols), strides=(stride, 1), writeable=False
+    )
+    _WORKER["patterns"] = patterns
+
+
+def _count_tile(row0: int, row1: int) -> NDArray[np.int64]:
+    """Count the patterns whose top-most letter is on the rows [row0, row1)."""
+    raw, (_, n_cols, stride, terminator) = _WORKER["raw"], _WORKER["layout"]
+    ends = np.arange(row0, row1) * stride + n_cols + terminator - 1
+    if not np.all(raw[ends[ends < raw.size]] == ord("\n")):
+        raise ValueError("The rows of the grid must have the same length.")
+    return _count_rows(_WORKER["values"], _WORKER["patterns"], row0, row1)
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The total number of XMAS is {part1(data)}.")
+    print(f"The total number of X-MAS is {part2(data)}.")
@@ -1,89 +1,313 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import networkx as nx
 import numpy as np
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: list[str] = fid.readlines()
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
-# split the input between the page ordering rules and the updates.
-split: int = data.index("\n")
-rules: list[list[int]] = [
-    [int(page) for page in elt.strip().split("|")] for elt in data[:split]
-]
-updates: list[list[int]] = [
-    [int(page) for page in elt.strip().split(",")] for elt in data[split + 1 :]
-]
+    from numpy.typing import NDArray
 
-G_rules = nx.DiGraph()
-# add edges from the rules, each rule is of the form X|Y, meaning X -> Y
-for X, Y in rules:
-    G_rules.add_edge(X, Y)
+_PADDING: int = -1  # page of the padding of the updates
+_BLOCK_SIZE: int = 1 << 24  # number of pairs of pages compared at once
+
+
+def parse(
+    fname: Path,
+) -> tuple[NDArray[np.bool_], NDArray[np.int64], NDArray[np.int64]]:
+    """Parse the page ordering rules into a matrix and the updates into an array.
+
+    The rules are compiled into a boolean precedence matrix, where ``rules[X, Y]`` is
+    True if the page X must be printed before the page Y, with a last row and column of
+    False for the padding. The updates have different lengths and are stored in an
+    array padded with -1, together with their lengths.
+    """
+    with open(fname) as fid:
+        data: list[str] = fid.readlines()
+    # split the input between the page ordering rules and the updates.
+    split: int = data.index("\n")
+    rules = np.array(
+        [[int(page) for page in elt.strip().split("|")] for elt in data[:split]],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    updates: list[list[int]] = [
+        [int(page) for page in elt.strip().split(",")]
+        for elt in data[split + 1 :]
+        if len(elt.strip()) != 0
+    ]
+    lengths = np.array([len(update) for update in updates], dtype=np.int64)
+    padded = np.full((len(updates), lengths.max(initial=0)), _PADDING, dtype=np.int64)
+    padded[np.arange(padded.shape[1]) < lengths[:, np.newaxis]] = [
+        page for update in updates for page in update
+    ]
+    n_pages = max(rules.max(initial=0), padded.max(initial=0)) + 1
+    return _build_ruleset(rules, n_pages), padded, lengths
+
+
+def _build_ruleset(rules: NDArray[np.int64], n_pages: int) -> NDArray[np.bool_]:
+    """Build the precedence matrix of the page ordering rules."""
+    # the extra row and column are indexed by the padding, -1, and are never set
+    matrix = np.zeros((n_pages + 1, n_pages + 1), dtype=bool)
+    # each rule is of the form X|Y, meaning X -> Y
+    matrix[rules[:, 0], rules[:, 1]] = True
+    return matrix
+
+
+def to_arrays(
+    data: tuple[NDArray[np.bool_], NDArray[np.int64], NDArray[np.int64]],
+) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    rules, updates, lengths = data
+    return {"rules": rules, "updates": updates, "lengths": lengths}
+
+
+def from_arrays(
+    arrays: dict[str, NDArray],
+) -> tuple[NDArray[np.bool_], NDArray[np.int64], NDArray[np.int64]]:
+    """Convert the named arrays to the parsed input."""
+    return arrays["rules"], arrays["updates"], arrays["lengths"]
 
 
 # %% part 1
-def is_valid(update: list[int], G_ruleset: nx.DiGraph) -> bool:
-    """Check if an update is valid."""
-    G_sub = G_ruleset.subgraph(update)
-    position = {page: i for i, page in enumerate(update)}
-    # check all edges in the subgraph
-    for X, Y in G_sub.edges():
-        # if X must come before Y, but X's position is not before Y's, it's invalid
-        if position[Y] <= position[X]:
-            return False
-    return True  # if no edges are violated, the update is valid
+def is_valid(updates: NDArray[np.int64], rules: NDArray[np.bool_]) -> NDArray[np.bool_]:
+    """Check which updates are valid.
 
+    An update is invalid if a page is printed after a page which must come after it.
+    The rules between every pair of pages of the updates are gathered at once from the
+    precedence matrix, by blocks of updates.
 
-def find_middle_page_of_valid_updates(
-    updates: list[list[int]], G_ruleset: nx.DiGraph
-) -> list[int]:
-    """Find the middle page of the valid updates."""
-    middle_pages = []
-    for update in updates:
-        if is_valid(update, G_ruleset):
-            middle_pages.append(update[len(update) // 2])
-    return middle_pages
+    Parameters
+    ----------
+    updates : array of shape (n_updates, max_length)
+        The updates, padded with -1.
+    rules : array of shape (n_pages + 1, n_pages + 1)
+        The precedence matrix.
 
+    Returns
+    -------
+    valid : array of shape (n_updates,)
+        True if the update is valid.
+    """
+    length = updates.shape[1]
+    later = np.triu(np.ones((length, length), dtype=bool), k=1)  # i printed before j
+    valid = np.empty(updates.shape[0], dtype=bool)
+    step = max(_BLOCK_SIZE // max(length**2, 1), 1)
+    for start in range(0, updates.shape[0], step):
+        block = updates[start : start + step]
+        # violated[n, i, j] if the page j must come before the page i printed before it
+        violated = rules[block[:, np.newaxis, :], block[:, :, np.newaxis]] & later
+        valid[start : start + step] = ~violated.any(axis=(1, 2))
+    return valid
 
-middle_pages = find_middle_page_of_valid_updates(updates, G_rules)
-print(f"The sum of the middle pages is {np.sum(middle_pages)}.")
 
+def get_middle_pages(
+    updates: NDArray[np.int64], lengths: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    """Get the middle page of each update."""
+    return updates[np.arange(updates.shape[0]), lengths // 2]
 
-# %% part 2
-def find_invalid_updates(
-    updates: list[list[int]], G_ruleset: nx.DiGraph
-) -> list[list[int]]:
-    """Find the incorrectly ordered updates."""
-    invalids = []
-    for update in updates:
-        if not is_valid(update, G_ruleset):
-            invalids.append(update)
-    return invalids
+
+def part1(data: tuple[NDArray[np.bool_], NDArray[np.int64], NDArray[np.int64]]) -> int:
+    """Solve part 1."""
+    rules, updates, lengths = data
+    valid = is_valid(updates, rules)
+    return int(np.sum(get_middle_pages(updates[valid], lengths[valid])))
 
 
+# %% part 2
 def reorder_updates(
-    updates: list[list[int]], G_ruleset: nx.DigGraph
-) -> list[list[int]]:
-    """Reorder the update using the ruleset."""
-    valid_updates = []
-    for update in updates:
-        G_sub = G_ruleset.subgraph(update)
-        valid_updates.append(np.array(list(nx.topological_sort(G_sub)), dtype=np.int8))
-    return [update.tolist() for update in valid_updates]  # cast back to list
-
-
-def get_middle_page_sum(updates: list[list[int]]) -> int:
-    """Get the middle page of an update."""
-    count = 0
-    for update in updates:
-        count += update[len(update) // 2]
-    return count
-
-
-invalids = find_invalid_updates(updates, G_rules)
-valid_updates = reorder_updates(invalids, G_rules)
-total = get_middle_page_sum(valid_updates)
-print(f"The sum of the middle pages is {total}.")
+    updates: NDArray[np.int64], rules: NDArray[np.bool_]
+) -> NDArray[np.int64]:
+    """Reorder the updates using the ruleset.
+
+    The rules between the pages of each update are closed transitively by repeated
+    squaring of the precedence matrices of all the updates at once. The pages are then
+    sorted by their number of predecessors, which is strictly larger than the number of
+    predecessors of any of their predecessors. The padding is kept at the end.
+
+    Parameters
+    ----------
+    updates : array of shape (n_updates, max_length)
+        The updates, padded with -1.
+    rules : array of shape (n_pages + 1, n_pages + 1)
+        The precedence matrix.
+
+    Returns
+    -------
+    updates : array of shape (n_updates, max_length)
+        The reordered updates, padded with -1.
+    """
+    length = updates.shape[1]
+    reordered = np.empty_like(updates)
+    step = max(_BLOCK_SIZE // max(length**2, 1), 1)
+    for start in range(0, updates.shape[0], step):
+        block = updates[start : start + step]
+        # before[n, i, j] if the page i must come before the page j
+        before = rules[block[:, :, np.newaxis], block[:, np.newaxis, :]]
+        for _ in range(max(length - 1, 1).bit_length()):
+            # float32 products run on BLAS, unlike the integer ones
+            reach = before.astype(np.float32)
+            before |= np.matmul(reach, reach) != 0
+        if before[:, np.arange(length), np.arange(length)].any():
+            raise ValueError("The ordering rules of an update form a cycle.")
+        predecessors = before.sum(axis=1)
+        predecessors[block == _PADDING] = length  # keep the padding at the end
+        order = np.argsort(predecessors, axis=1, kind="stable")
+        reordered[start : start + step] = np.take_along_axis(block, order, axis=1)
+    return reordered
+
+
+class OrderCache:
+    """Canonical order of sets of pages, cached and kept up to date with the rules.
+
+    The order of a set of pages only depends on the rules between its pages, thus the
+    canonical order, computed with :func:`reorder_updates`, is cached by set of pages
+    with least-recently-used eviction. Adding or removing the rule ``X|Y`` invalidates
+    only the cached sets holding both X and Y.
+
+    Parameters
+    ----------
+    rules : array of shape (n_pages + 1, n_pages + 1)
+        The precedence matrix, see :func:`parse`, which is copied.
+    maxsize : int
+        The maximum number of cached sets of pages.
+    """
+
+    def __init__(self, rules: NDArray[np.bool_], maxsize: int = 1 << 16) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"The size of the cache must be positive, got {maxsize}.")
+        self._rules = np.array(rules, dtype=bool)
+        self._maxsize = maxsize
+        self._orders: OrderedDict[frozenset[int], tuple[int, ...]] = OrderedDict()
+        self._sets: dict[int, set[frozenset[int]]] = {}  # cached sets holding a page
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached sets of pages."""
+        return len(self._orders)
+
+    def order(self, pages: Iterable[int]) -> tuple[int, ...]:
+        """Get the canonical order of a set of pages."""
+        pages = list(pages)
+        if any(page < 0 for page in pages):
+            raise ValueError(f"The pages must be non-negative, got {pages}.")
+        order = self.reorder(np.array([pages], dtype=np.int64).reshape(1, -1))[0]
+        return tuple(order[: len(pages)].tolist())
+
+    def reorder(self, updates: NDArray[np.int64]) -> NDArray[np.int64]:
+        """Reorder updates, computing the order of the uncached sets of pages at once.
+
+        Parameters
+        ----------
+        updates : array of shape (n_updates, max_length)
+            The updates, padded with -1. The pages of an update must be distinct and
+            non-negative, and may have no rule.
+
+        Returns
+        -------
+        updates : array of shape (n_updates, max_length)
+            The reordered updates, padded with -1.
+        """
+        pages = updates[updates != _PADDING]
+        if pages.size != 0:
+            if pages.min() < 0:
+                raise ValueError("The pages must be non-negative, padded with -1.")
+            self._grow(int(pages.max()) + 1)  # pages without rules
+        keys = [frozenset(row[row != _PADDING].tolist()) for row in updates]
+        orders: dict[frozenset[int], tuple[int, ...]] = {}
+        for key in keys:
+            if key in orders:
+                continue
+            if key in self._orders:
+                self.hits += 1
+                self._orders.move_to_end(key)
+                orders[key] = self._orders[key]
+            else:
+                self.misses += 1
+                orders[key] = ()
+        missing = [key for key, order in orders.items() if len(order) != len(key)]
+        if len(missing) != 0:
+            pages = np.full((len(missing), updates.shape[1]), _PADDING, dtype=np.int64)
+            for k, key in enumerate(missing):
+                pages[k, : len(key)] = sorted(key)
+            for key, order in zip(
+                missing, reorder_updates(pages, self._rules), strict=True
+            ):
+                orders[key] = tuple(order[: len(key)].tolist())
+                self._put(key, orders[key])
+        reordered = np.full_like(updates, _PADDING)
+        for k, key in enumerate(keys):
+            reordered[k, : len(key)] = orders[key]
+        return reordered
+
+    def add_rule(self, before: int, after: int) -> None:
+        """Add the rule ``before|after``."""
+        if min(before, after) < 0:
+            raise ValueError(f"The pages must be non-negative, got {before}|{after}.")
+        self._grow(max(before, after) + 1)
+        if not self._rules[before, after]:
+            self._rules[before, after] = True
+            self._invalidate(before, after)
+
+    def remove_rule(self, before: int, after: int) -> None:
+        """Remove the rule ``before|after``, if it exists."""
+        n_pages = self._rules.shape[0] - 1
+        if min(before, after) < 0 or n_pages <= max(before, after):
+            return
+        if self._rules[before, after]:
+            self._rules[before, after] = False
+            self._invalidate(before, after)
+
+    @property
+    def rules(self) -> NDArray[np.bool_]:
+        """Read-only view of the precedence matrix."""
+        rules = self._rules.view()
+        rules.flags.writeable = False
+        return rules
+
+    def _grow(self, n_pages: int) -> None:
+        """Grow the matrix to hold the pages up to n_pages - 1, without rules."""
+        if self._rules.shape[0] <= n_pages:
+            # keep the padding in the last row and column
+            rules = np.zeros((n_pages + 1, n_pages + 1), dtype=bool)
+            n_old = self._rules.shape[0] - 1
+            rules[:n_old, :n_old] = self._rules[:n_old, :n_old]
+            self._rules = rules
+
+    def _put(self, key: frozenset[int], order: tuple[int, ...]) -> None:
+        """Cache the order of a set of pages, evicting the least recently used."""
+        self._orders[key] = order
+        for page in key:
+            self._sets.setdefault(page, set()).add(key)
+        while self._maxsize < len(self._orders):
+            self._discard(next(iter(self._orders)))
+
+    def _discard(self, key: frozenset[int]) -> None:
+        """Remove a set of pages from the cache."""
+        del self._orders[key]
+        for page in key:
+            self._sets[page].discard(key)
+
+    def _invalidate(self, before: int, after: int) -> None:
+        """Remove the cached sets of pages holding both pages of a rule."""
+        affected = self._sets.get(before, set()) & self._sets.get(after, set())
+        for key in affected:
+            self._discard(key)
+
+
+def part2(data: tuple[NDArray[np.bool_], NDArray[np.int64], NDArray[np.int64]]) -> int:
+    """Solve part 2."""
+    rules, updates, lengths = data
+    invalid = ~is_valid(updates, rules)
+    reordered = reorder_updates(updates[invalid], rules)
+    return int(np.sum(get_middle_pages(reordered, lengths[invalid])))
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The sum of the middle pages is {part1(data)}.")
+    print(f"The sum of the middle pages is {part2(data)}.")
@@ -1,65 +1,176 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from itertools import cycle
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 
-if TYPE_CHECKING:
-    from collections.abc import Generator
+from aoc import instrument
+from aoc.artifacts import artifact
+from aoc.grid import Grid
+from aoc.progress import track
 
+if TYPE_CHECKING:
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-char_to_num: dict[str, int] = {".": 0, "#": 1, "^": 2, ">": 3, "v": 4, "<": 5}
-with open(fname) as fid:
-    data: list[list[int]] = [
-        [char_to_num[char] for char in line.strip()] for line in fid.readlines()
-    ]
-# find the position and orientation of the guard and convert data to a binary matrix
-data: NDArray[np.int8] = np.array(data, dtype=np.int8)
-x, y = np.where(data > 1)
-x = int(x[0])
-y = int(y[0])
-orientation: int = int(data[x, y])
-data[x, y] = 0
-data: NDArray[np.bool] = data.astype(np.bool)
+# orientations of the guard, in the clockwise order of Grid.offsets4
+_GUARD: str = "^>v<"
+_OBSTACLE: int = ord("#")
+_OUTSIDE: int = 0  # value of the padding around the map
+
+
+def parse(fname: Path) -> tuple[Grid, int, int]:
+    """Parse the map and the position and orientation of the guard.
+
+    The position of the guard is its flat index in the grid, and its orientation is the
+    index of its direction in :attr:`~aoc.grid.Grid.offsets4`.
+    """
+    grid = Grid.from_file(fname, pad=1, fill=_OUTSIDE)
+    guard = np.flatnonzero(np.isin(grid.flat, np.frombuffer(_GUARD.encode(), np.uint8)))
+    if guard.size != 1:
+        raise ValueError("The map must contain exactly one guard.")
+    index = int(guard[0])
+    orientation = _GUARD.index(chr(grid.flat[index]))
+    grid.flat[index] = ord(".")
+    return grid, index, orientation
+
+
+def to_arrays(data: tuple[Grid, int, int]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return data[0].to_arrays() | {"guard": np.array(data[1:], dtype=np.int64)}
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> tuple[Grid, int, int]:
+    """Convert the named arrays to the parsed input."""
+    index, orientation = arrays["guard"].tolist()
+    return Grid.from_arrays(arrays), index, orientation
+
+
+# %% jump table
+@dataclass(frozen=True)
+class JumpTable:
+    """Obstacles of each row and column of the map, to jump from turn to turn.
+
+    The guard walks straight ahead until the cell before the next obstacle, found by
+    bisection in the sorted obstacles of its row or column, instead of one cell at a
+    time. A walk is thus in the number of turns of the guard rather than in the length
+    of its path.
+
+    Parameters
+    ----------
+    rows : list of list of int
+        The sorted columns of the obstacles of each row of the padded grid.
+    columns : list of list of int
+        The sorted rows of the obstacles of each column of the padded grid.
+    width : int
+        The number of columns of the padded grid, to convert the flat indices.
+    bounds : tuple of int
+        The first row or column of the padding before the map, and the first row and
+        column of the padding after the map, in the padded grid.
+    """
+
+    rows: list[list[int]]
+    columns: list[list[int]]
+    width: int
+    bounds: tuple[int, int, int]
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> JumpTable:
+        """Build the jump table of a map."""
+        n_rows, n_cols = grid.padded.shape
+        x, y = np.nonzero(grid.padded == _OBSTACLE)  # sorted by row, then column
+        rows = np.split(y, np.searchsorted(x, np.arange(1, n_rows)))
+        order = np.lexsort((x, y))  # sorted by column, then row
+        columns = np.split(x[order], np.searchsorted(y[order], np.arange(1, n_cols)))
+        return cls(
+            [row.tolist() for row in rows],
+            [column.tolist() for column in columns],
+            n_cols,
+            (grid.pad - 1, grid.pad + grid.shape[0], grid.pad + grid.shape[1]),
+        )
+
+    def jump(
+        self, index: int, orientation: int, obstacle: int | None = None
+    ) -> tuple[int, bool]:
+        """Walk the guard straight ahead, until the cell before the next obstacle.
+
+        Parameters
+        ----------
+        index : int
+            The flat index of the guard position in the grid.
+        orientation : int
+            The orientation of the guard, see :class:`Node`.
+        obstacle : int | None
+            The flat index of an obstacle added to the map, on top of the table.
+
+        Returns
+        -------
+        index : int
+            The flat index of the cell where the guard stops.
+        leaves : bool
+            True if the guard leaves the map from this cell instead of turning.
+        """
+        x, y = divmod(index, self.width)
+        ox, oy = (-1, -1) if obstacle is None else divmod(obstacle, self.width)
+        first, last_row, last_col = self.bounds
+        # the wall is the row or column of the obstacle, or of the padding, ahead
+        if orientation == 0:  # up
+            column = self.columns[y]
+            k = bisect_left(column, x)
+            wall = column[k - 1] if k != 0 else first
+            if oy == y and wall < ox < x:
+                wall = ox
+            return (wall + 1) * self.width + y, wall == first
+        if orientation == 1:  # right
+            row = self.rows[x]
+            k = bisect_right(row, y)
+            wall = row[k] if k != len(row) else last_col
+            if ox == x and y < oy < wall:
+                wall = oy
+            return x * self.width + wall - 1, wall == last_col
+        if orientation == 2:  # down
+            column = self.columns[y]
+            k = bisect_right(column, x)
+            wall = column[k] if k != len(column) else last_row
+            if oy == y and x < ox < wall:
+                wall = ox
+            return (wall - 1) * self.width + y, wall == last_row
+        row = self.rows[x]  # left
+        k = bisect_left(row, y)
+        wall = row[k - 1] if k != 0 else first
+        if ox == x and wall < oy < y:
+            wall = oy
+        return x * self.width + wall + 1, wall == first
+
+
+@artifact
+def jump_table(grid: Grid) -> JumpTable:
+    """Build the jump table of the map, shared by both parts."""
+    return JumpTable.from_grid(grid)
+
 
 # %% part 1
-_MOVEMENTS: dict[int, tuple[int, int]] = {
-    2: (-1, 0),
-    3: (0, 1),
-    4: (1, 0),
-    5: (0, -1),
-}
-
-
-def walk_normal_path(
-    data: NDArray[np.bool], x: int, y: int, orientation: int
-) -> set[tuple[int, int]]:
-    """Walk the guard pattern and list the positions visited."""
-    orientation_cycle: Generator = cycle(_MOVEMENTS)
-    while next(orientation_cycle) != orientation:
-        pass
-    positions = {(x, y)}
+def walk_normal_path(grid: Grid, index: int, orientation: int) -> NDArray[np.intp]:
+    """Walk the guard pattern and list the flat indices of the positions visited."""
+    table = jump_table(grid)
+    width = grid.padded.shape[1]
+    visited = np.zeros(grid.padded.shape, dtype=bool)
     while True:
-        dx, dy = _MOVEMENTS[orientation]
-        nextx, nexty = x + dx, y + dy  # next position
-        if nextx < 0 or data.shape[0] <= nextx or nexty < 0 or data.shape[1] <= nexty:
+        stop, leaves = table.jump(index, orientation)
+        # record the guard positions on the segment walked
+        (x0, y0), (x1, y1) = divmod(index, width), divmod(stop, width)
+        visited[min(x0, x1) : max(x0, x1) + 1, min(y0, y1) : max(y0, y1) + 1] = True
+        if leaves:
             break  # out of the map
-        elif data[nextx, nexty]:
-            orientation = next(orientation_cycle)
-            continue
-        # move forward and record the guard position
-        x, y = nextx, nexty
-        positions.add((x, y))
-    return positions
+        index, orientation = stop, turn_right(orientation)
+    return np.flatnonzero(visited)
 
 
-positions = walk_normal_path(data, x, y, orientation)
-print(f"The guard walked on {len(positions)} positions.")
+def part1(data: tuple[Grid, int, int]) -> int:
+    """Solve part 1."""
+    return walk_normal_path(*data).size
 
 
 # %% part 2
@@ -69,74 +180,84 @@ class Node:
 
     Parameters
     ----------
-    x : int
-        The x-coordinate of the guard.
-    y : int
-        The y-coordinate of the guard.
+    index : int
+        The flat index of the guard position in the grid.
     orientation : int
         The orientation of the guard.
-        * 2: facing up
-        * 3: facing right
-        * 4: facing down
-        * 5: facing left
+        * 0: facing up
+        * 1: facing right
+        * 2: facing down
+        * 3: facing left
     """
 
     # another representation of the guard position and orientation could be his position
     # on the 2D complex plane. Then, a change of orientation by 90° to the right
     # corresponds to a rotation (multiplication) by the complex number 1j.
 
-    x: int
-    y: int
+    index: int
     orientation: int
 
 
-def in_bounds(data: NDArray[np.bool_], x: int, y: int) -> bool:
-    """Check if the guard is still on the map."""
-    rows, cols = data.shape
-    return 0 <= x < rows and 0 <= y < cols
-
-
 def turn_right(orientation: int) -> int:
     """Turn the guard to the right."""
-    return {2: 3, 3: 4, 4: 5, 5: 2}[orientation]
+    return (orientation + 1) % 4
+
+
+def walk_path(grid: Grid, node: Node, obstacle: int | None = None) -> bool:
+    """Walk down a path and search for loops.
 
+    The guard jumps from turn to turn, see :class:`JumpTable`, and is in a loop once it
+    turns twice at the same position with the same orientation.
 
-def walk_path(data: NDArray[np.bool], node: Node) -> bool:
-    """Walk down a path and search for loops."""
-    visited = {node}
+    Parameters
+    ----------
+    grid : Grid
+        The map.
+    node : Node
+        The starting position and orientation of the guard.
+    obstacle : int | None
+        The flat index of an obstacle added to the map, which is not modified.
+
+    Returns
+    -------
+    loop : bool
+        True if the guard walks in a loop.
+    """
+    table = jump_table(grid)
+    index, orientation = node.index, node.orientation
+    visited = set()
     while True:
-        dx, dy = _MOVEMENTS[node.orientation]
-        nextx, nexty = node.x + dx, node.y + dy
-        if not in_bounds(data, nextx, nexty):
+        index, leaves = table.jump(index, orientation, obstacle)
+        if leaves:
+            instrument.observe("walk_path.states", len(visited))
             return False
-        if data[nextx, nexty]:
-            new_orientation = turn_right(node.orientation)
-            new_node = Node(node.x, node.y, new_orientation)
-            if new_node in visited:
-                return True
-            visited.add(new_node)
-            node = new_node
-            continue
-        new_node = Node(nextx, nexty, node.orientation)
+        new_node = Node(index, orientation)
         if new_node in visited:
+            instrument.observe("walk_path.states", len(visited))
             return True
         visited.add(new_node)
-        node = new_node
+        orientation = turn_right(orientation)
 
 
-def search_loops(data: NDArray[np.bool], node_start: Node) -> int:
+def search_loops(grid: Grid, node_start: Node) -> int:
     """Search for loops when adding one obstacle to the map."""
-    pos = walk_normal_path(data, node_start.x, node_start.y, node_start.orientation)
-    pos.remove((node_start.x, node_start.y))
+    pos = walk_normal_path(grid, node_start.index, node_start.orientation)
+    pos = pos[pos != node_start.index]
     n_loops = 0
-    for k, (x, y) in enumerate(pos):
-        print(f"Iteration {k + 1} / {len(pos)} for position {(x, y)}.")
-        data[x, y] = True
-        loop = walk_path(data, node_start)
-        data[x, y] = False
+    for index in track(pos.tolist(), "Searching loops"):
+        with instrument.timer("walk_path"):
+            loop = walk_path(grid, node_start, index)
         n_loops += loop
     return n_loops
 
 
-n_loops = search_loops(data, Node(x, y, orientation))
-print(f"The number of loops is {n_loops}.")
+def part2(data: tuple[Grid, int, int]) -> int:
+    """Solve part 2."""
+    grid, index, orientation = data
+    return search_loops(grid, Node(index, orientation))
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The guard walked on {part1(data)} positions.")
+    print(f"The number of loops is {part2(data)}.")
@@ -1,15 +1,50 @@
 from __future__ import annotations
 
-from itertools import product
+from itertools import pairwise, product
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: list[str] = fid.readlines()
-data: list[list[str]] = [elt.split(":") for elt in data]
-data: list[tuple[int, list[int]]] = [
-    (int(elt[0]), [int(e) for e in elt[1].strip().split(" ")]) for elt in data
-]
+import numpy as np
+
+from aoc import instrument
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+def parse(fname: Path) -> list[tuple[int, list[int]]]:
+    """Parse the equations into a list of (result, numbers)."""
+    with open(fname) as fid:
+        data: list[str] = fid.readlines()
+    data: list[list[str]] = [elt.split(":") for elt in data]
+    return [(int(elt[0]), [int(e) for e in elt[1].strip().split(" ")]) for elt in data]
+
+
+def to_arrays(data: list[tuple[int, list[int]]]) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays.
+
+    The equations have different number of operands which are stored as the
+    concatenation of the operands and the offset of each equation in the concatenation.
+    """
+    return {
+        "results": np.array([result for result, _ in data], dtype=np.int64),
+        "numbers": np.array([num for _, numbers in data for num in numbers], np.int64),
+        "offsets": np.cumsum(
+            [0] + [len(numbers) for _, numbers in data], dtype=np.int64
+        ),
+    }
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> list[tuple[int, list[int]]]:
+    """Convert the named arrays to the parsed input."""
+    numbers = arrays["numbers"].tolist()
+    offsets = arrays["offsets"].tolist()
+    return [
+        (result, numbers[start:stop])
+        for result, (start, stop) in zip(
+            arrays["results"].tolist(), pairwise(offsets), strict=True
+        )
+    ]
 
 
 # %% part 1
@@ -18,7 +53,7 @@ def is_valid(equation: tuple[int, list[int]]) -> bool:
     result, numbers = equation
     if len(numbers) == 1:
         return result == numbers[0]
-    for ops in product(["+", "*"], repeat=len(numbers) - 1):
+    for n_tries, ops in enumerate(product(["+", "*"], repeat=len(numbers) - 1), 1):
         value = numbers[0]
         for op, num in zip(ops, numbers[1:], strict=False):
             if op == "+":
@@ -26,21 +61,25 @@ def is_valid(equation: tuple[int, list[int]]) -> bool:
             elif op == "*":
                 value *= num
         if value == result:
+            instrument.observe("is_valid.combinations", n_tries)
             return True
+    instrument.observe("is_valid.combinations", n_tries)
     return False
 
 
-total = sum(equation[0] for equation in data if is_valid(equation))
-print(f"The sum of all valid equation's result is {total}.")
+def part1(data: list[tuple[int, list[int]]]) -> int:
+    """Solve part 1."""
+    return sum(equation[0] for equation in data if is_valid(equation))
 
 
 # %% part 2
-def is_valid(equation: tuple[int, list[int]]) -> bool:
-    """Check if an equation is valid."""
+def is_valid_with_concatenation(equation: tuple[int, list[int]]) -> bool:
+    """Check if an equation is valid, including the concatenation operator."""
     result, numbers = equation
     if len(numbers) == 1:
         return result == numbers[0]
-    for ops in product(["+", "*", "||"], repeat=len(numbers) - 1):
+    ops_combinations = product(["+", "*", "||"], repeat=len(numbers) - 1)
+    for n_tries, ops in enumerate(ops_combinations, 1):
         value = numbers[0]
         for op, num in zip(ops, numbers[1:], strict=False):
             if op == "+":
@@ -50,9 +89,20 @@ def is_valid(equation: tuple[int, list[int]]) -> bool:
             elif op == "||":
                 value = int(str(value) + str(num))
         if value == result:
+            instrument.observe("is_valid_with_concatenation.combinations", n_tries)
             return True
+    instrument.observe("is_valid_with_concatenation.combinations", n_tries)
     return False
 
 
-total = sum(equation[0] for equation in data if is_valid(equation))
-print(f"The sum of all valid equation's result is {total}.")
+def part2(data: list[tuple[int, list[int]]]) -> int:
+    """Solve part 2."""
+    return sum(
+        equation[0] for equation in data if is_valid_with_concatenation(equation)
+    )
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The sum of all valid equation's result is {part1(data)}.")
+    print(f"The sum of all valid equation's result is {part2(data)}.")
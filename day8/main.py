@@ -6,83 +6,95 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
+from aoc.grid import Grid
+from aoc.progress import track
+
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-char_to_num: dict[str, int] = {".": 0}
-with open(fname) as fid:
-    data: list[str] = [line.strip() for line in fid.readlines()]
-data_numerical: list[list[int]] = []
-for line in data:
-    new_char = set(line).difference(set(char_to_num))
-    for char in new_char:
-        char_to_num[char] = len(char_to_num)
-    line = [char_to_num[char] for char in line]
-    data_numerical.append(line)
-data: NDArray[np.int8] = np.array(data_numerical, dtype=np.int8)
+
+def parse(fname: Path) -> Grid:
+    """Parse the map into a grid where each frequency is the ASCII code of its antenna.
+
+    The grid is not padded since the antinodes can be anywhere on the map.
+    """
+    return Grid.from_file(fname, pad=0)
+
+
+def to_arrays(data: Grid) -> dict[str, NDArray]:
+    """Convert the parsed input to named arrays."""
+    return data.to_arrays()
+
+
+def from_arrays(arrays: dict[str, NDArray]) -> Grid:
+    """Convert the named arrays to the parsed input."""
+    return Grid.from_arrays(arrays)
 
 
 # %% part 1
 def find_antinodes(
-    data: NDArray[np.int8], antenna1: NDArray[np.int8], antenna2: NDArray[np.int8]
+    data: Grid, antenna1: NDArray[np.int64], antenna2: NDArray[np.int64]
 ) -> list[tuple[int, int]]:
     """Find the antinodes of a given pair of antennas."""
     x1, y1 = antenna1
     x2, y2 = antenna2
     # compute the vector from antenna1 to antenna2
-    vector = np.array([x2 - x1, y2 - y1], dtype=np.int8)  # (dx, dy)
+    vector = np.array([x2 - x1, y2 - y1], dtype=np.int64)  # (dx, dy)
     # compute the position of the 2 antinodes
     antinodes = [antenna1 - vector, antenna2 + vector]
     return [tuple(antinode) for antinode in antinodes if in_bounds(data, *antinode)]
 
 
-def in_bounds(data: NDArray[np.int8], x: int, y: int) -> bool:
+def in_bounds(data: Grid, x: int, y: int) -> bool:
     """Check if the antinode is still on the map."""
     rows, cols = data.shape
     return 0 <= x < rows and 0 <= y < cols
 
 
 def find_antinodes_for_frequency(
-    data: NDArray[np.int8], freq: int
+    data: Grid, freq: int, harmonics: bool = False
 ) -> set[tuple[int, int]]:
     """Find the antinodes for a given frequency."""
     antinodes = set()
+    finder = find_antinodes_with_harmonics if harmonics else find_antinodes
     # store the coordinates of the antennas at the frequency freq in a 2D array of shape
     # (n_antennas, 2) where the first column is the x coordinate and the second column
     # is the y coordinate.
-    antennas = np.vstack(np.where(data == freq), dtype=np.int8).T
+    antennas = np.vstack(
+        data.coords(np.flatnonzero(data.flat == freq)), dtype=np.int64
+    ).T
     for antenna1, antenna2 in combinations(antennas, 2):
-        new_antinodes = find_antinodes(data, antenna1, antenna2)
+        new_antinodes = finder(data, antenna1, antenna2)
         antinodes.update(set(new_antinodes))
     return set(antinodes)
 
 
-def find_antinodes_for_all_frequencies(data: NDArray[np.int8]) -> list[tuple[int, int]]:
+def find_antinodes_for_all_frequencies(
+    data: Grid, harmonics: bool = False
+) -> set[tuple[int, int]]:
     """Find the antinodes for all frequencies."""
     antinodes = set()
-    frequencies = np.unique(data)
-    for k, freq in enumerate(frequencies):
-        if freq == 0:  # skip the empty space
-            continue
-        print(f"{k} / {frequencies.size - 1}: Finding antinodes for frequency {freq}.")
-        antinodes.update(find_antinodes_for_frequency(data, freq))
+    frequencies = np.unique(data.values)
+    frequencies = frequencies[frequencies != ord(".")]  # skip the empty space
+    for freq in track(frequencies, "Finding antinodes"):
+        antinodes.update(find_antinodes_for_frequency(data, freq, harmonics))
     return antinodes
 
 
-total = len(find_antinodes_for_all_frequencies(data))
-print(f"The total number of antinodes is {total}.")
+def part1(data: Grid) -> int:
+    """Solve part 1."""
+    return len(find_antinodes_for_all_frequencies(data))
 
 
 # %% part 2
-def find_antinodes(  # noqa: F811
-    data: NDArray[np.int8], antenna1: NDArray[np.int8], antenna2: NDArray[np.int8]
+def find_antinodes_with_harmonics(
+    data: Grid, antenna1: NDArray[np.int64], antenna2: NDArray[np.int64]
 ) -> list[tuple[int, int]]:
     """Find the antinodes of a given pair of antennas, including harmonics."""
     x1, y1 = antenna1
     x2, y2 = antenna2
     # compute the vector from antenna1 to antenna2
-    vector = np.array([x2 - x1, y2 - y1], dtype=np.int8)  # (dx, dy)
+    vector = np.array([x2 - x1, y2 - y1], dtype=np.int64)  # (dx, dy)
     # compute the position of the antinodes
     antinodes = [tuple(antenna1), tuple(antenna2)]
     pos = antenna1
@@ -102,5 +114,12 @@ def find_antinodes(  # noqa: F811
     return antinodes
 
 
-total = len(find_antinodes_for_all_frequencies(data))
-print(f"The total number of antinodes is {total}.")
+def part2(data: Grid) -> int:
+    """Solve part 2."""
+    return len(find_antinodes_for_all_frequencies(data, harmonics=True))
+
+
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The total number of antinodes is {part1(data)}.")
+    print(f"The total number of antinodes is {part2(data)}.")
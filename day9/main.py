@@ -7,32 +7,53 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
+from aoc import instrument
+from aoc.artifacts import artifact
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator
 
     from numpy.typing import NDArray
 
-fname: Path = Path(__file__).parent / "input.txt"
-with open(fname) as fid:
-    data: str = fid.read().strip()
-    data: NDArray[np.int8] = np.array([int(char) for char in data], dtype=np.int8)
+
+def parse(fname: Path) -> NDArray[np.int8]:
+    """Parse the disk map into an array of digits."""
+    with open(fname) as fid:
+        data: str = fid.read().strip()
+    return np.array([int(char) for char in data], dtype=np.int8)
 
 
 # %% part 1
+@artifact
+def disk_layout(data: NDArray[np.int8]) -> tuple[NDArray[np.float32], list[slice]]:
+    """Lay out the blocks of the disk with their file ID, or nan for free space.
+
+    The layout is built once per disk map and shared by both parts, which compact a copy
+    of the read-only blocks. The position of each file in the blocks is returned as
+    well, except for the first file (ID=0).
+    """
+    assert data.size % 2 == 1  # sanity-check, the disk map ends with a file
+    sizes = data.astype(np.intp)
+    # file IDs on the even digits, nan to represent free space on the odd digits
+    ids = np.full(sizes.size, np.nan, dtype=np.float32)
+    ids[::2] = np.arange((sizes.size + 1) // 2)
+    blocks = np.repeat(ids, sizes)
+    blocks.flags.writeable = False
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+    file_idx = [
+        slice(start, stop)
+        for start, stop in zip(starts[2::2].tolist(), ends[2::2].tolist(), strict=True)
+    ]
+    return blocks, file_idx
+
+
 def compress(data: NDArray[np.int8]) -> NDArray[np.int32]:
     """Compress the data sequence."""
-    filesizes = data[::2]
-    free_spaces = data[1::2]
-    total_fsize = np.sum(filesizes)
-    # initialize the result with nan to represent free space
-    result = [0] * filesizes[0]
-    filesizes = filesizes[1:]
-    assert len(filesizes) == len(free_spaces)  # sanity-check
-    for k, (fsize, ssize) in enumerate(zip(filesizes, free_spaces, strict=True)):
-        result.extend([np.nan] * ssize)
-        result.extend([k + 1] * fsize)
-    result = np.array(result, dtype=np.float32)
+    total_fsize = np.sum(data[::2], dtype=np.int64)
+    result = disk_layout(data)[0].copy()
     # compaction logic
+    n_moves = 0
     while True:
         leftmost_free = np.where(np.isnan(result))[0][0]
         if leftmost_free == total_fsize:
@@ -40,46 +61,46 @@ def compress(data: NDArray[np.int8]) -> NDArray[np.int32]:
         rightmost_file = np.where(~np.isnan(result))[0][-1]
         result[leftmost_free] = result[rightmost_file]
         result[rightmost_file] = np.nan
+        n_moves += 1
+    instrument.count("compress.moves", n_moves)
+    instrument.count("compress.scans", 2 * n_moves + 1)  # np.where over the disk
     return result[:total_fsize].astype(np.int32)
 
 
-def checksum(compressed: NDArray[np.int32]) -> int:
-    """Calculate the checksum of the compressed data."""
+def checksum(compressed: NDArray[np.int32] | NDArray[np.float32]) -> int:
+    """Calculate the checksum of the compressed data, ignoring free spaces."""
     total_checksum = 0
     for k, file_id in enumerate(compressed):
-        total_checksum += k * int(file_id)
+        if not np.isnan(file_id):
+            total_checksum += k * int(file_id)
     return total_checksum
 
 
-compressed = compress(data)
-total = checksum(compressed)
-print(f"The total checksum is: {total}.")
+def part1(data: NDArray[np.int8]) -> int:
+    """Solve part 1."""
+    return checksum(compress(data))
 
 
 # %% part 2
-def compress(data: NDArray[np.int8]) -> NDArray[np.float32]:
+def compress_without_fragmentation(data: NDArray[np.int8]) -> NDArray[np.float32]:
     """Compress the data sequence without fragmentation."""
-    filesizes = data[::2]
-    free_spaces = data[1::2]
-    # initialize the result with nan to represent free space
-    result = [0] * filesizes[0]
-    filesizes = filesizes[1:]
-    assert len(filesizes) == len(free_spaces)  # sanity-check
-    file_idx = []  # initial position of each file in result, except the first (ID=0)
-    for k, (fsize, ssize) in enumerate(zip(filesizes, free_spaces, strict=True)):
-        result.extend([np.nan] * ssize)
-        result.extend([k + 1] * fsize)
-        file_idx.append(slice(len(result) - int(fsize), len(result)))
-    result = np.array(result, dtype=np.float32)
+    filesizes = data[2::2]
+    blocks, file_idx = disk_layout(data)
+    result = blocks.copy()
     # compaction logic
     for fsize, fpos in zip(filesizes[::-1], file_idx[::-1], strict=True):
         left_free_spaces = np.where(np.isnan(result[: fpos.start]))[0]
+        instrument.observe(
+            "compress_without_fragmentation.free_cells", left_free_spaces.size
+        )
         for group in _consecutive_groups(left_free_spaces):
             group = list(group)
             if len(group) >= fsize:
                 result[group[:fsize]] = result[fpos]
                 result[fpos] = np.nan
+                instrument.count("compress_without_fragmentation.moves")
                 break
+    instrument.count("compress_without_fragmentation.scans", len(file_idx))
     return result
 
 
@@ -91,15 +112,12 @@ def _consecutive_groups(
         yield map(itemgetter(1), g)
 
 
-def checksum(compressed: NDArray[np.float32]) -> int:
-    """Calculate the checksum of the compressed data."""
-    total_checksum = 0
-    for k, file_id in enumerate(compressed):
-        if not np.isnan(file_id):
-            total_checksum += k * int(file_id)
-    return total_checksum
+def part2(data: NDArray[np.int8]) -> int:
+    """Solve part 2."""
+    return checksum(compress_without_fragmentation(data))
 
 
-compressed = compress(data)
-total = checksum(compressed)
-print(f"The total checksum is: {total}.")
+if __name__ == "__main__":
+    data = parse(Path(__file__).parent / "input.txt")
+    print(f"The total checksum is: {part1(data)}.")
+    print(f"The total checksum is: {part2(data)}.")
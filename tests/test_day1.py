@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from day1.main import parse, part1, part2, solve_out_of_core
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("left", "right"),
+    [
+        ((10_000, 100_000), (10_000, 100_000)),
+        ((10_000, 20_000), (90_000, 100_000)),  # disjoint ranges
+        ((90_000, 100_000), (10_000, 20_000)),
+    ],
+)
+def test_solve_out_of_core(
+    tmp_path: Path, left: tuple[int, int], right: tuple[int, int]
+) -> None:
+    """Test the out-of-core mode against the in-memory solvers and its memory."""
+    rng = np.random.default_rng(0)
+    columns = np.stack(
+        (rng.integers(*left, 200_000), rng.integers(*right, 200_000)), axis=1
+    )
+    fname = tmp_path / "input.txt"
+    np.savetxt(fname, columns, fmt="%d", delimiter="   ")
+    data = parse(fname)
+    memory_limit = 1 << 20
+    solve_out_of_core(fname, memory_limit=memory_limit)  # warm-up the lazy imports
+    tracemalloc.start()
+    try:
+        result = solve_out_of_core(fname, memory_limit=memory_limit)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert result == (part1(data), part2(data))
+    assert peak < 2 * memory_limit
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from aoc.days import input_file
+from day5.main import OrderCache, parse, part2, reorder_updates
+
+
+def test_order_cache_unseen_pages() -> None:
+    """Test the order of updates holding pages without rules."""
+    rules, _, _ = parse(input_file(5, "example.txt"))
+    n_pages = rules.shape[0] - 1
+    cache = OrderCache(rules)
+    assert cache.order([53, 47]) == (47, 53)
+    # a page beyond the matrix, and a page indexing the padding row and column
+    for page in (500, n_pages):
+        order = cache.order([53, page, 47])
+        assert order.index(47) < order.index(53)
+        assert sorted(order) == sorted([53, page, 47])
+    cache.add_rule(n_pages, 47)
+    order = cache.order([53, n_pages, 47])
+    assert order == (n_pages, 47, 53)
+    with pytest.raises(ValueError, match="non-negative"):
+        cache.order([47, -2])
+
+
+def test_order_cache_reorder() -> None:
+    """Test the cached orders against the direct reordering."""
+    data = parse(input_file(5, "example.txt"))
+    rules, updates, lengths = data
+    cache = OrderCache(rules, maxsize=2)
+    expected = reorder_updates(updates, rules)
+    for _ in range(2):
+        np.testing.assert_array_equal(cache.reorder(updates), expected)
+    assert part2(data) == 123